@@ -0,0 +1,222 @@
+import time
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu
+from ordering import SparseLUSolver
+
+
+class BatchResult:
+    """
+    Outcome of a batched Newton-Raphson solve, one row per scenario.
+    """
+
+    __slots__ = ('vpu', 'delta', 'iterations', 'converged', 'factorizations', 'solve_time')
+
+    def __init__(self, vpu, delta, iterations, converged, factorizations: int, solve_time: float):
+        """
+        :param vpu: (K, N) voltage magnitudes in pu, the last iterate where not converged
+        :param delta: (K, N) voltage angles in degrees
+        :param iterations: (K,) iterations to convergence counted as PowerFlow does, max_iter where not converged
+        :param converged: (K,) True where the scenario converged
+        :param factorizations: stacked Jacobian factorizations over the whole batch
+        :param solve_time: wall time of the batch in seconds
+        """
+        self.vpu = vpu
+        self.delta = delta
+        self.iterations = iterations
+        self.converged = converged
+        self.factorizations = factorizations
+        self.solve_time = solve_time
+
+    def __str__(self):
+        return (f"BatchResult(scenarios={len(self.converged)}, converged={int(self.converged.sum())}, "
+                f"iterations={int(self.iterations.max(initial=0))} max, factorizations={self.factorizations}, "
+                f"time={self.solve_time * 1e3:.1f} ms)")
+
+
+class BatchPowerFlow:
+    """
+    The BatchPowerFlow class solves many injection scenarios of one CompiledNetwork together with
+    Newton-Raphson. Voltages and mismatches are (scenarios x buses) arrays; each iteration computes
+    all mismatches with one sparse product, stacks the Jacobians of the scenarios still iterating
+    into one block-diagonal matrix and factorizes it once. Converged scenarios leave the active set.
+    The fill-reducing ordering of one scenario's Jacobian is computed once and applied to every
+    block, so a shrinking active set never triggers a new symbolic analysis.
+
+    Every scenario shares the network's bus types, Ybus and slack voltage; only the P and Q
+    injections (and, optionally, the starting point) differ. The network must be a single island.
+    """
+
+    def __init__(self, network, tol: float = 1e-6, max_iter: int = 30):
+        """
+        :param network: CompiledNetwork
+        :param tol: mismatch tolerance in pu, per scenario
+        :param max_iter: maximum Newton-Raphson iterations
+        """
+        if len(network.slack) != 1:
+            raise ValueError(f"Batched power flow needs exactly one slack bus, the network has {len(network.slack)}.")
+        self.network = network
+        self.tol = tol
+        self.max_iter = max_iter
+        self.ybus = network.get_ybus('positive').tocsr()
+        self.pv_pq = np.asarray(network.pv_pq)
+        self.pq = np.asarray(network.pq)
+        self._jacobian_pattern()
+
+        # MMD ordering of one block; position[i] is where unknown i lands within its block
+        V = network.vpu * np.exp(1j * np.radians(network.delta))
+        analysis = SparseLUSolver()
+        analysis.analyze(self._stacked_jacobian(V[None, :], (self.ybus @ V)[None, :]))
+        self.analysis_time = analysis.analysis_time + analysis.factor_time # MMD is chosen while factorizing
+        self.position = np.argsort(analysis.perm)
+
+    @classmethod
+    def from_circuit(cls, circuit, tol: float = 1e-6, max_iter: int = 30):
+        """
+        Compile a Circuit whose buses form one energized island.
+        """
+        if not circuit.find_islands().is_trivial:
+            raise ValueError("Batched power flow needs a single island. Use PowerFlow.calc_newton_raphson per scenario.")
+        return cls(circuit.compile(), tol, max_iter)
+
+    def _jacobian_pattern(self):
+        """
+        Positions of the reduced Jacobian entries of one scenario. Entries are listed on the Ybus
+        pattern plus the diagonal, as in jacobian.calc_power_derivatives, and each of the four blocks
+        keeps those whose row and column are unknowns.
+        """
+        n = self.network.num_buses
+        ybus = self.ybus.tocoo()
+        diagonal = np.arange(n)
+        self._rows = np.concatenate((ybus.row, diagonal))
+        self._cols = np.concatenate((ybus.col, diagonal))
+        self._ydata = ybus.data
+        self._ybus_rows, self._ybus_cols = ybus.row, ybus.col
+
+        # Local row/column of every bus among the angle and magnitude unknowns, -1 if known
+        npvpq = len(self.pv_pq)
+        angle = np.full(n, -1, dtype=np.int64)
+        angle[self.pv_pq] = np.arange(npvpq)
+        magnitude = np.full(n, -1, dtype=np.int64)
+        magnitude[self.pq] = npvpq + np.arange(len(self.pq))
+        self.size = npvpq + len(self.pq)
+
+        # (entry mask, row map, column map) for J11 dP/dδ, J12 dP/d|V|, J21 dQ/dδ, J22 dQ/d|V|
+        blocks = []
+        for row_map, col_map in ((angle, angle), (angle, magnitude), (magnitude, angle), (magnitude, magnitude)):
+            keep = (row_map[self._rows] >= 0) & (col_map[self._cols] >= 0)
+            blocks.append((keep, row_map[self._rows[keep]], col_map[self._cols[keep]]))
+        self._blocks = blocks
+
+    def _stacked_jacobian(self, V, I, position=None):
+        """
+        Block-diagonal Jacobian of the active scenarios.
+
+        :param V: (K, N) complex bus voltages
+        :param I: (K, N) complex bus current injections Ybus V
+        :param position: (M,) ordering of the unknowns within every block, natural if None
+        :return: sparse CSC matrix of size K * (npvpq + npq) square
+        """
+        rows, cols = self._ybus_rows, self._ybus_cols
+        V_norm = V / np.abs(V)
+        dS_ddelta = np.concatenate((-1j * V[:, rows] * np.conj(self._ydata * V[:, cols]), 1j * V * np.conj(I)), axis=1)
+        dS_dvpu = np.concatenate((V[:, rows] * np.conj(self._ydata * V_norm[:, cols]), np.conj(I) * V_norm), axis=1)
+
+        (k11, r11, c11), (k12, r12, c12), (k21, r21, c21), (k22, r22, c22) = self._blocks
+        data = np.concatenate((dS_ddelta[:, k11].real, dS_dvpu[:, k12].real,
+                               dS_ddelta[:, k21].imag, dS_dvpu[:, k22].imag), axis=1)
+        local_rows = np.concatenate((r11, r12, r21, r22))
+        local_cols = np.concatenate((c11, c12, c21, c22))
+        if position is not None:
+            local_rows, local_cols = position[local_rows], position[local_cols]
+
+        # Scenario k occupies rows and columns k*M .. (k+1)*M - 1
+        count = len(V)
+        offsets = (np.arange(count, dtype=np.int64) * self.size)[:, None]
+        shape = (count * self.size, count * self.size)
+        return sparse.coo_matrix((data.ravel(), ((local_rows + offsets).ravel(), (local_cols + offsets).ravel())),
+                                 shape=shape).tocsc()
+
+    def solve(self, p_injections=None, q_injections=None, vpu=None, delta=None):
+        """
+        Solve every scenario.
+
+        :param p_injections: (K, N) net real power injections in pu; the network's compiled injections
+                             (one scenario) if None. Entries of the slack bus are ignored.
+        :param q_injections: (K, N) net reactive power injections in pu; the compiled ones for every
+                             scenario if None. Entries of the slack and PV buses are ignored.
+        :param vpu: (N,) or (K, N) initial voltage magnitudes in pu, the compiled ones if None.
+                    Only PQ buses take them; the slack and PV buses keep the compiled setpoints.
+        :param delta: (N,) or (K, N) initial angles in degrees, the compiled ones if None
+        :return: BatchResult
+        """
+        start = time.perf_counter()
+        network = self.network
+        p = network.sbus.real[None, :] if p_injections is None else np.atleast_2d(np.asarray(p_injections, dtype=float))
+        q = np.broadcast_to(network.sbus.imag, p.shape) if q_injections is None else \
+            np.atleast_2d(np.asarray(q_injections, dtype=float))
+        if p.shape != q.shape or p.shape[1] != network.num_buses:
+            raise ValueError(f"Injections must be (scenarios, {network.num_buses}) arrays of the same shape.")
+        count = len(p)
+
+        magnitudes = np.tile(network.vpu, (count, 1))
+        if vpu is not None:
+            magnitudes[:, self.pq] = np.broadcast_to(vpu, (count, network.num_buses))[:, self.pq]
+        angles = np.radians(np.tile(network.delta, (count, 1)) if delta is None else
+                            np.array(np.broadcast_to(delta, (count, network.num_buses)), dtype=float))
+        angles[:, network.slack] = np.radians(network.delta[network.slack])
+
+        iterations = np.full(count, self.max_iter, dtype=np.int64)
+        converged = np.zeros(count, dtype=bool)
+        active = np.arange(count)
+        npvpq = len(self.pv_pq)
+        factorizations = 0
+
+        for iteration in range(self.max_iter):
+            # Mismatch of every active scenario in one sparse product, (N, K) layout for Ybus @ V
+            V = magnitudes[active] * np.exp(1j * angles[active])
+            I = (self.ybus @ V.T).T
+            S = V * np.conj(I)
+            mismatch = np.concatenate((p[active][:, self.pv_pq] - S.real[:, self.pv_pq],
+                                       q[active][:, self.pq] - S.imag[:, self.pq]), axis=1)
+
+            # Converged scenarios drop out of the active set
+            done = np.max(np.abs(mismatch), axis=1, initial=0.0) < self.tol
+            converged[active[done]] = True
+            iterations[active[done]] = iteration + 1
+            keep = ~done
+            active, V, I, mismatch = active[keep], V[keep], I[keep], mismatch[keep]
+            if len(active) == 0:
+                break
+
+            # One factorization of the stacked Jacobians in the block ordering, one solve for every active scenario
+            lu = splu(self._stacked_jacobian(V, I, self.position), permc_spec='NATURAL', diag_pivot_thresh=0.1,
+                      options=dict(SymmetricMode=True))
+            factorizations += 1
+            rhs = np.empty_like(mismatch)
+            rhs[:, self.position] = mismatch
+            delta_x = lu.solve(rhs.ravel()).reshape(len(active), self.size)[:, self.position]
+
+            angles[np.ix_(active, self.pv_pq)] += delta_x[:, :npvpq]
+            magnitudes[np.ix_(active, self.pq)] += delta_x[:, npvpq:]
+
+        return BatchResult(magnitudes, np.degrees(angles), iterations, converged, factorizations,
+                           time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    from sample_networks import build_seven_bus_circuit
+
+    circuit1 = build_seven_bus_circuit()
+    batch = BatchPowerFlow.from_circuit(circuit1)
+    network = batch.network
+
+    # Loads scaled from 0.8x to 1.2x; generator setpoints unchanged
+    scales = np.linspace(0.8, 1.2, 9)
+    load = network.sbus.real < 0
+    p = np.where(load, network.sbus.real * scales[:, None], network.sbus.real)
+    q = network.sbus.imag * np.where(load, scales[:, None], 1.0)
+    result = batch.solve(p, q)
+    print(result)
+    for scale, vpu, iterations in zip(scales, result.vpu, result.iterations):
+        print(f"Load x{scale:.2f} | {iterations} iterations | min V = {vpu.min():.5f} pu")
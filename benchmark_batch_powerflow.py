@@ -0,0 +1,52 @@
+import time
+
+import numpy as np
+
+from batch_powerflow import BatchPowerFlow
+from powerflow import PowerFlow
+from sample_networks import build_seven_bus_circuit, build_mesh_circuit
+from solution import Solution
+
+# Many load scenarios of one network: one PowerFlow per scenario with the Bus objects rewritten in
+# between, versus one BatchPowerFlow call on the stacked (scenarios x buses) injections.
+
+CASES = [("7 bus", build_seven_bus_circuit), ("10x10 mesh", lambda: build_mesh_circuit(10, 10)),
+         ("20x20 mesh", lambda: build_mesh_circuit(20, 20))]
+SCENARIOS = [10, 100, 500]
+
+
+def scenario_injections(network, count):
+    # Every load scaled independently by 0.8-1.2, generator setpoints unchanged
+    scales = np.random.default_rng(0).uniform(0.8, 1.2, (count, network.num_buses))
+    load = network.sbus.real < 0
+    p = np.where(load, network.sbus.real * scales, network.sbus.real)
+    q = np.where(load, network.sbus.imag * scales, network.sbus.imag)
+    return p, q
+
+
+def sequential(circuit, p, q):
+    solution = Solution(buses=[], ybus=None, voltages=[])
+    solution.initialize_system(circuit)
+    powerflow = PowerFlow(solution, tol=1e-6, max_iter=30, verbose=False)
+    converged = 0
+    start = time.perf_counter()
+    for p_row, q_row in zip(p, q):
+        for bus, p_bus, q_bus in zip(solution.buses, p_row, q_row):
+            bus.vpu, bus.delta = 1.0, 0.0
+            bus.P_spec, bus.Q_spec = p_bus, q_bus
+        solution.voltages = [bus.vpu for bus in solution.buses]
+        converged += bool(powerflow.calc_newton_raphson())
+    return converged, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    print(f"{'Case':>12}{'Scenarios':>11}{'Sequential ms':>15}{'Batch ms':>10}{'Speedup':>9}{'Converged':>11}")
+    for label, build in CASES:
+        circuit = build()
+        batch = BatchPowerFlow.from_circuit(circuit)
+        for count in SCENARIOS:
+            p, q = scenario_injections(batch.network, count)
+            converged, t_sequential = sequential(circuit, p, q)
+            result = batch.solve(p, q)
+            print(f"{label:>12}{count:>11}{t_sequential * 1e3:>15.1f}{result.solve_time * 1e3:>10.1f}"
+                  f"{t_sequential / result.solve_time:>9.1f}{f'{int(result.converged.sum())}/{converged}':>11}")
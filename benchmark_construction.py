@@ -0,0 +1,23 @@
+import time
+
+from circuit import Circuit
+from sample_networks import mesh_columns, populate_mesh_circuit
+
+# Model construction benchmark: one add_* call per element versus the column builders
+# (add_buses, add_transmission_lines, add_generators, add_loads), then the first Ybus build.
+
+GRIDS = [(30, 30), (100, 100), (224, 224)]
+
+
+if __name__ == '__main__':
+    print(f"{'Buses':>7}{'Lines':>8}{'Builder':>10}{'Build s':>10}{'Ybus s':>10}")
+    for rows, cols in GRIDS:
+        columns = mesh_columns(rows, cols)
+        for bulk in (False, True):
+            start = time.perf_counter()
+            circuit = populate_mesh_circuit(Circuit("Mesh"), columns, bulk)
+            built = time.perf_counter()
+            circuit.get_ybus_sparse('positive')
+            assembled = time.perf_counter()
+            print(f"{len(circuit.buses):>7}{len(circuit.transmission_lines):>8}{'bulk' if bulk else 'add_*':>10}"
+                  f"{built - start:>10.3f}{assembled - built:>10.3f}")
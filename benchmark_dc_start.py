@@ -0,0 +1,52 @@
+import contextlib
+import io
+import time
+
+import numpy as np
+
+from dc_powerflow import DCPowerFlow
+from powerflow import PowerFlow
+from sample_networks import build_seven_bus_circuit, build_mesh_circuit
+from solution import Solution
+
+# Newton-Raphson iterations from a flat start versus a DC-angle start, on cases stressed by scaling
+# every load (P and Q), followed by DC power flow throughput for many injection vectors.
+
+LOAD_SCALES = [1.0, 1.2, 1.4, 1.6]
+CASES = [("7 bus", build_seven_bus_circuit), ("10x10 mesh", lambda: build_mesh_circuit(10, 10)),
+         ("20x20 mesh", lambda: build_mesh_circuit(20, 20))]
+
+
+def newton_iterations(build, scale, dc_start):
+    circuit = build()
+    solution = Solution(buses=[], ybus=None, voltages=[])
+    solution.initialize_system(circuit)
+    for bus in solution.buses:
+        if bus.P_spec < 0:
+            bus.P_spec *= scale
+        bus.Q_spec *= scale
+    powerflow = PowerFlow(solution, tol=1e-6, max_iter=30)
+    with contextlib.redirect_stdout(io.StringIO()):
+        powerflow.calc_newton_raphson(dc_start=dc_start)
+    return powerflow.iterations
+
+
+if __name__ == '__main__':
+    print(f"{'Case':>12}{'Load x':>8}{'Flat':>6}{'DC':>6}{'Saved':>7}")
+    for label, build in CASES:
+        for scale in LOAD_SCALES:
+            flat = newton_iterations(build, scale, False)
+            dc = newton_iterations(build, scale, True)
+            saved = flat - dc if flat is not None and dc is not None else "-"
+            print(f"{label:>12}{scale:>8.1f}{str(flat):>6}{str(dc):>6}{saved:>7}")
+
+    # DC screening: one factorization, many market-interval injection vectors
+    circuit = build_mesh_circuit(100, 100)
+    dc = DCPowerFlow.from_circuit(circuit)
+    print(f"\nDC power flow, {dc.network.num_buses} buses, factorized once in {dc.factor_time * 1e3:.1f} ms")
+    for count in (1, 100, 1000):
+        injections = dc.network.sbus.real[:, None] * np.random.default_rng(0).uniform(0.8, 1.2, (1, count))
+        start = time.perf_counter()
+        dc.branch_flows(dc.solve(injections))
+        elapsed = time.perf_counter() - start
+        print(f"{count:>6} injection vectors: {elapsed * 1e3:.1f} ms")
@@ -0,0 +1,51 @@
+import contextlib
+import io
+import time
+
+import numpy as np
+
+from powerflow import PowerFlow
+from sample_networks import build_mesh_circuit
+from solution import Solution
+
+# Repeated screening solves on one network: Newton-Raphson versus the fast-decoupled XB and BX
+# variants. Every solve starts flat with the loads scaled at random; the fast-decoupled factors
+# are built on the first solve and reused by the rest.
+
+GRIDS = [(10, 10), (20, 20)]
+SOLVES = 20
+
+
+def repeated_solves(circuit, method, **options):
+    solution = Solution(buses=[], ybus=None, voltages=[])
+    solution.initialize_system(circuit)
+    powerflow = PowerFlow(solution, tol=1e-4, max_iter=50)
+    p_spec = np.array([bus.P_spec for bus in solution.buses])
+    q_spec = np.array([bus.Q_spec for bus in solution.buses])
+    rng = np.random.default_rng(0)
+
+    converged, elapsed = 0, 0.0
+    for _ in range(SOLVES):
+        scale = rng.uniform(0.9, 1.1)
+        for bus, p, q in zip(solution.buses, p_spec, q_spec):
+            bus.vpu, bus.delta = 1.0, 0.0
+            bus.P_spec = p * scale if p < 0 else p
+            bus.Q_spec = q * scale
+        solution.voltages = [bus.vpu for bus in solution.buses]
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            converged += bool(getattr(powerflow, method)(**options))
+        elapsed += time.perf_counter() - start
+    return converged, elapsed / SOLVES
+
+
+if __name__ == '__main__':
+    print(f"{'Buses':>7}{'Method':>10}{'Converged':>11}{'ms/solve':>10}")
+    for rows, cols in GRIDS:
+        circuit = build_mesh_circuit(rows, cols)
+        for label, method, options in (("NR", 'calc_newton_raphson', {}),
+                                       ("FDLF XB", 'calc_fast_decoupled', {'variant': 'XB'}),
+                                       ("FDLF BX", 'calc_fast_decoupled', {'variant': 'BX'})):
+            converged, per_solve = repeated_solves(circuit, method, **options)
+            print(f"{len(circuit.buses):>7}{label:>10}{f'{converged}/{SOLVES}':>11}{per_solve * 1e3:>10.2f}")
@@ -0,0 +1,39 @@
+import contextlib
+import io
+
+from jacobian import JacobianReusePolicy
+from powerflow import PowerFlow
+from sample_networks import build_seven_bus_circuit, build_mesh_circuit
+from solution import Solution
+
+# Full Newton-Raphson versus reusing the Jacobian factorization across iterations (chord Newton):
+# refactorize every k iterations, or only when the mismatch stops shrinking fast enough.
+
+CASES = [("7 bus", build_seven_bus_circuit), ("10x10 mesh", lambda: build_mesh_circuit(10, 10)),
+         ("20x20 mesh", lambda: build_mesh_circuit(20, 20))]
+POLICIES = [("full Newton", JacobianReusePolicy()),
+            ("every 2", JacobianReusePolicy(refactor_every=2)),
+            ("every 3", JacobianReusePolicy(refactor_every=3)),
+            ("ratio 0.1", JacobianReusePolicy(refactor_every=30, max_ratio=0.1)),
+            ("ratio 0.5", JacobianReusePolicy(refactor_every=30, max_ratio=0.5))]
+REPEATS = 5
+
+
+def solve(circuit, policy):
+    solution = Solution(buses=[], ybus=None, voltages=[])
+    solution.initialize_system(circuit)
+    powerflow = PowerFlow(solution, tol=1e-6, max_iter=50, reuse_policy=policy)
+    with contextlib.redirect_stdout(io.StringIO()):
+        powerflow.calc_newton_raphson()
+    return powerflow.solve_stats()
+
+
+if __name__ == '__main__':
+    print(f"{'Case':>12}{'Policy':>13}{'Iterations':>12}{'Factors':>9}{'ms/solve':>10}")
+    for label, build in CASES:
+        circuit = build()
+        for name, policy in POLICIES:
+            runs = [solve(circuit, policy) for _ in range(REPEATS)]
+            best = min(run['solve_time'] for run in runs)
+            stats = runs[-1]
+            print(f"{label:>12}{name:>13}{str(stats['iterations']):>12}{stats['factorizations']:>9}{best * 1e3:>10.2f}")
@@ -0,0 +1,67 @@
+import gc
+import tracemalloc
+
+from bus import Bus
+from load import Load
+from generator import Generator
+from transformer import Transformer
+from transmissionline import TransmissionLine
+from conductor import Conductor
+from bundle import Bundle
+from geometry import Geometry
+
+# Memory benchmark: average traced bytes per device object, right after construction and
+# after every per-sequence Yprim has been requested (the footprint once Ybus has been built).
+# Device classes use __slots__ and build their Yprim lazily so that very large models stay small.
+
+NUM_ELEMENTS = 20000
+SEQUENCES = ('positive', 'negative', 'zero')
+
+
+def measure(build, materialize=None):
+    """
+    Return (bytes per element after construction, bytes per element after materializing Yprim).
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    elements = build()
+    built = tracemalloc.get_traced_memory()[0]
+    if materialize is not None:
+        for element in elements:
+            materialize(element)
+    full = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (built - start) / len(elements), (full - start) / len(elements)
+
+
+def all_yprims(element):
+    for sequence in SEQUENCES:
+        element.get_yprim(sequence)
+
+
+if __name__ == '__main__':
+    # Shared objects are created outside the measured region
+    bus_a = Bus("Bus A", 230, "PQ Bus")
+    bus_b = Bus("Bus B", 230, "PQ Bus")
+    conductor1 = Conductor("Partridge", 0.642, 0.0217, 0.385, 460)
+    bundle1 = Bundle("Bundle A", 2, 1.5, conductor1)
+    geometry1 = Geometry("Geometry 1", 0, 0, 19.5, 0, 39, 0)
+    names = [f"Element {i}" for i in range(NUM_ELEMENTS)]
+
+    cases = [
+        ("Bus", lambda: [Bus(name, 230.0, "PQ Bus") for name in names], None),
+        ("Load", lambda: [Load(name, bus_a, 100, 50) for name in names], None),
+        ("Generator", lambda: [Generator(name, bus_a, 1.0, 100, 0.12, 0.14, 0.05, 125) for name in names],
+         all_yprims if hasattr(Generator, 'get_yprim') else None),
+        ("Transformer", lambda: [Transformer(name, bus_a, bus_b, 125, 8.5, 10, 100, "Delta-Y", None, 0.0019)
+                                 for name in names], all_yprims),
+        ("TransmissionLine", lambda: [TransmissionLine(name, bus_a, bus_b, bundle1, geometry1, 10)
+                                      for name in names], all_yprims),
+    ]
+
+    print(f"Per-element footprint over {NUM_ELEMENTS} objects (bytes)")
+    print(f"{'Element':<18}{'constructed':>14}{'with Yprim':>14}")
+    for label, build, materialize in cases:
+        constructed, with_yprim = measure(build, materialize)
+        print(f"{label:<18}{constructed:>14.0f}{with_yprim:>14.0f}")
@@ -0,0 +1,38 @@
+import time
+import numpy as np
+
+from ordering import ORDERINGS, OrderedLU
+from sample_networks import build_mesh_circuit
+
+# Fill-in benchmark: factorize the positive sequence Ybus of shuffled meshed networks under each
+# bus ordering and compare factor size, fill-in and time. Natural order is the insertion order.
+
+GRIDS = [(10, 10), (30, 30), (60, 60)]
+REPEATS = 5
+
+
+def time_factorization(ybus, ordering):
+    """
+    Return the OrderedLU of the fastest of REPEATS factorizations and its total time in seconds.
+    """
+    best, best_time = None, np.inf
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        lu = OrderedLU(ybus, ordering)
+        elapsed = time.perf_counter() - start
+        if elapsed < best_time:
+            best, best_time = lu, elapsed
+    return best, best_time
+
+
+if __name__ == '__main__':
+    print(f"{'Buses':>7}{'Ordering':>10}{'nnz(Y)':>10}{'nnz(L+U)':>11}{'Fill-in':>10}{'Order ms':>10}{'Total ms':>10}")
+    for rows, cols in GRIDS:
+        circuit = build_mesh_circuit(rows, cols)
+        ybus = circuit.get_ybus_sparse('positive')
+        rhs = np.ones(ybus.shape[0], dtype=complex)
+        for ordering in ORDERINGS:
+            lu, elapsed = time_factorization(ybus, ordering)
+            assert np.allclose(ybus @ lu.solve(rhs), rhs)
+            print(f"{ybus.shape[0]:>7}{ordering:>10}{lu.nnz:>10}{lu.factor_nnz:>11}{lu.fill_in:>10}"
+                  f"{lu.order_time * 1e3:>10.2f}{elapsed * 1e3:>10.2f}")
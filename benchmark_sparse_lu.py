@@ -0,0 +1,67 @@
+import contextlib
+import io
+import time
+
+import numpy as np
+from scipy.sparse.linalg import spsolve
+
+from jacobian import Jacobian
+from ordering import SparseLUSolver
+from powerflow import PowerFlow
+from sample_networks import build_mesh_circuit
+from solution import Solution
+
+# Newton-Raphson linear solves: spsolve (ordering recomputed on every call) versus SparseLUSolver
+# (ordering and symbolic analysis once per topology, numeric refactorization per iteration),
+# over several operating points that share one topology.
+
+GRIDS = [(30, 30), (70, 70), (100, 100)]
+SCENARIOS = 5
+
+
+def jacobians(circuit, count):
+    # Jacobians at random operating points of one topology, all sharing one sparsity pattern
+    solution = Solution(buses=[], ybus=None, voltages=[])
+    solution.initialize_system(circuit)
+    network = solution.network
+    rng = np.random.default_rng(0)
+    matrices = []
+    for _ in range(count):
+        vpu = rng.uniform(0.95, 1.05, network.num_buses)
+        delta = rng.uniform(-5, 5, network.num_buses)
+        jacobian = Jacobian(buses=solution.buses, ybus=network.get_ybus(), angles=delta, voltages=vpu)
+        matrices.append(jacobian.calc_jacobian_sparse(network.pv_pq, network.pq).tocsc())
+    return matrices
+
+
+if __name__ == '__main__':
+    print(f"{'Buses':>7}{'spsolve s':>11}{'reuse s':>10}{'analysis s':>12}{'factor s':>10}{'solve s':>10}")
+    for rows, cols in GRIDS:
+        circuit = build_mesh_circuit(rows, cols)
+        matrices = jacobians(circuit, SCENARIOS * 4)
+        rhs = np.ones(matrices[0].shape[0])
+
+        start = time.perf_counter()
+        for matrix in matrices:
+            spsolve(matrix, rhs)
+        baseline = time.perf_counter() - start
+
+        solver = SparseLUSolver()
+        start = time.perf_counter()
+        for matrix in matrices:
+            solver.factor(matrix)
+            solver.solve(rhs)
+        reuse = time.perf_counter() - start
+        timings = solver.timings
+        print(f"{len(circuit.buses):>7}{baseline:>11.3f}{reuse:>10.3f}{timings['analysis']:>12.3f}"
+              f"{timings['factor']:>10.3f}{timings['solve']:>10.3f}")
+
+    # One solver shared by consecutive power flows on the same network analyzes only once
+    circuit = build_mesh_circuit(20, 20)
+    solver = SparseLUSolver()
+    for _ in range(SCENARIOS):
+        solution = Solution(buses=[], ybus=None, voltages=[])
+        solution.initialize_system(circuit)
+        with contextlib.redirect_stdout(io.StringIO()):
+            PowerFlow(solution, tol=1e-6, max_iter=20, linear_solver=solver).calc_newton_raphson()
+    print(f"\n{SCENARIOS} power flows on {len(circuit.buses)} buses: {solver}")
@@ -0,0 +1,66 @@
+import contextlib
+import io
+
+import numpy as np
+
+from powerflow import PowerFlow
+from sample_networks import build_seven_bus_circuit, build_mesh_circuit
+from solution import Solution
+from step_control import StepControl
+
+# Newton-Raphson with full steps versus the Iwamoto optimal multiplier and a backtracking line search.
+# First on cases stressed by scaling every load (P and Q) up to and past the nose of the PV curve,
+# counting the iterations spent whether or not the solve converges; then from perturbed initial guesses.
+
+LOAD_SCALES = [1.0, 1.5, 2.0, 2.2, 2.5, 3.0]
+CASES = [("7 bus", build_seven_bus_circuit), ("10x10 mesh", lambda: build_mesh_circuit(10, 10)),
+         ("20x20 mesh", lambda: build_mesh_circuit(20, 20))]
+CONTROLS = [("Full", 'none'), ("Iwamoto", 'iwamoto'), ("Line search", 'line_search')]
+MAX_ITER = 30
+STARTS = 20
+
+
+def solve(circuit, method, scale=1.0, initial_state=None):
+    solution = Solution(buses=[], ybus=None, voltages=[])
+    solution.initialize_system(circuit)
+    for bus in solution.buses:
+        if bus.P_spec < 0:
+            bus.P_spec *= scale
+        bus.Q_spec *= scale
+    powerflow = PowerFlow(solution, tol=1e-6, max_iter=MAX_ITER, step_control=StepControl(method))
+    with contextlib.redirect_stdout(io.StringIO()):
+        powerflow.calc_newton_raphson(initial_state=initial_state)
+    return powerflow
+
+
+def outcome(powerflow):
+    # Iterations to convergence, or iterations spent before giving up marked with 'x'
+    if powerflow.iterations is not None:
+        return str(powerflow.iterations)
+    return f"x{len(powerflow.step_lengths)}"
+
+
+if __name__ == '__main__':
+    print(f"{'Case':>12}{'Load x':>8}" + "".join(f"{label:>13}" for label, _ in CONTROLS) + "   Iwamoto steps")
+    spent = {label: 0 for label, _ in CONTROLS}
+    for label, build in CASES:
+        circuit = build()
+        for scale in LOAD_SCALES:
+            results = [solve(circuit, method, scale) for _, method in CONTROLS]
+            for (name, _), powerflow in zip(CONTROLS, results):
+                spent[name] += len(powerflow.step_lengths) if powerflow.iterations is None else powerflow.iterations
+            steps = ", ".join(f"{step:.2f}" for step in results[1].step_lengths[:6])
+            print(f"{label:>12}{scale:>8.1f}" + "".join(f"{outcome(pf):>13}" for pf in results) + f"   {steps}")
+    print("\nTotal iterations spent: " + ", ".join(f"{name} {count}" for name, count in spent.items()))
+
+    # Perturbed initial guesses on the seven bus case
+    circuit = build_seven_bus_circuit()
+    num_buses = len(circuit.buses)
+    print(f"\n{'Angle spread':>12}" + "".join(f"{label:>13}" for label, _ in CONTROLS) + "   (converged starts)")
+    for spread in (20, 40, 60):
+        counts = []
+        for _, method in CONTROLS:
+            rng = np.random.default_rng(0)
+            starts = [(rng.uniform(0.8, 1.2, num_buses), rng.uniform(-spread, spread, num_buses)) for _ in range(STARTS)]
+            counts.append(sum(solve(circuit, method, initial_state=start).iterations is not None for start in starts))
+        print(f"{spread:>11}°" + "".join(f"{f'{count}/{STARTS}':>13}" for count in counts))
@@ -0,0 +1,50 @@
+import os
+import time
+
+import numpy as np
+
+from sample_networks import build_mesh_circuit
+from sweep import Scenario, SweepRunner, solve_scenario
+from solution import Solution
+
+# A nightly-style sweep on the 20x20 mesh: load levels, generator redispatch, solar output and
+# single line outages, solved serially in this process and on process pools of growing size.
+
+ROWS, COLS = 20, 20
+SCENARIOS = 200
+
+
+def build_scenarios(circuit, count):
+    rng = np.random.default_rng(0)
+    generators = list(circuit.generators)
+    lines = list(circuit.transmission_lines)
+    buses = [name for name, bus in circuit.buses.items() if bus.bus_type != "Slack Bus"]
+    scenarios = []
+    for k in range(count):
+        generator = generators[k % len(generators)]
+        scenarios.append(Scenario(f"case {k}", load_scale=rng.uniform(0.85, 1.15),
+                                  generators={generator: circuit.generators[generator].mw_setpoint * rng.uniform(0.8, 1.2)},
+                                  solar={buses[rng.integers(len(buses))]: rng.uniform(0, 50)},
+                                  outages=[lines[rng.integers(len(lines))]] if k % 4 == 0 else ()))
+    return scenarios
+
+
+if __name__ == '__main__':
+    base = build_mesh_circuit(ROWS, COLS)
+    scenarios = build_scenarios(base, SCENARIOS)
+
+    Solution(buses=[], ybus=None, voltages=[]).initialize_system(base)
+    start = time.perf_counter()
+    serial = [solve_scenario(base, scenario) for scenario in scenarios]
+    t_serial = time.perf_counter() - start
+    print(f"{len(base.buses)} buses, {SCENARIOS} scenarios, {os.cpu_count()} CPUs")
+    print(f"{'Workers':>8}{'Wall s':>9}{'Speedup':>9}{'Converged':>11}")
+    print(f"{'serial':>8}{t_serial:>9.2f}{1.0:>9.1f}{sum(its is not None for _, _, its, _ in serial):>11}")
+
+    for workers in sorted({1, 2, 4, os.cpu_count()}):
+        runner = SweepRunner(build_mesh_circuit, build_args=(ROWS, COLS), max_workers=workers)
+        start = time.perf_counter()
+        result = runner.run(scenarios)
+        elapsed = time.perf_counter() - start
+        assert np.allclose(result.vpu[result.converged], [v for v, _, its, _ in serial if its is not None])
+        print(f"{workers:>8}{elapsed:>9.2f}{t_serial / elapsed:>9.1f}{int(result.converged.sum()):>11}")
@@ -0,0 +1,60 @@
+import time
+
+import numpy as np
+
+from powerflow import PowerFlow
+from sample_networks import build_mesh_circuit
+from solution import Solution
+from state_library import SolvedStateLibrary
+
+# Back-to-back solves of a slowly changing load profile on one network. Each case is solved from a
+# flat start, from the previous converged state, and from the nearest state in a solved-state library
+# that already holds a coarse grid of load levels.
+
+SOLVES = 24
+LIBRARY_LEVELS = np.linspace(0.8, 1.2, 9)
+
+
+def solve(circuit, scale, p_base, q_base, **options):
+    solution = Solution(buses=[], ybus=None, voltages=[])
+    solution.initialize_system(circuit, warm_start=options.pop('warm_start', False))
+    for bus, p, q in zip(solution.buses, p_base, q_base):
+        bus.P_spec = p * scale if p < 0 else p
+        bus.Q_spec = q * scale
+    powerflow = PowerFlow(solution, tol=1e-6, max_iter=30, state_library=options.pop('state_library', None),
+                          verbose=False)
+    start = time.perf_counter()
+    powerflow.calc_newton_raphson(**options)
+    return powerflow, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    circuit = build_mesh_circuit(20, 20)
+    base = Solution(buses=[], ybus=None, voltages=[])
+    base.initialize_system(circuit)
+    p_base, q_base = base.get_injections()
+    profile = 1.0 + 0.15 * np.sin(np.linspace(0, 2 * np.pi, SOLVES))
+
+    # Library filled with a coarse grid of load levels
+    library = SolvedStateLibrary(maxsize=32)
+    for level in LIBRARY_LEVELS:
+        solve(circuit, level, p_base, q_base, state_library=library)
+
+    print(f"{'Hour':>5}{'Load x':>8}{'Flat':>6}{'Previous':>10}{'Library':>9}{'Saved':>7}")
+    totals = np.zeros(3)
+    times = np.zeros(3)
+    for hour, scale in enumerate(profile):
+        # Previous: the buses still hold the last hour's converged state
+        previous, t_previous = solve(circuit, scale, p_base, q_base, warm_start=hour > 0)
+        flat, t_flat = solve(circuit, scale, p_base, q_base)
+        warm, t_warm = solve(circuit, scale, p_base, q_base, state_library=library)
+        counts = [flat.iterations, previous.iterations, warm.iterations]
+        totals += counts
+        times += [t_flat, t_previous, t_warm]
+        # Library start against this hour's own flat start
+        print(f"{hour:>5}{scale:>8.3f}{counts[0]:>6}{counts[1]:>10}{counts[2]:>9}{counts[0] - counts[2]:>7}")
+
+    print(f"\nTotal iterations: flat {totals[0]:.0f}, previous {totals[1]:.0f}, library {totals[2]:.0f}")
+    print(f"Total solve time: flat {times[0] * 1e3:.1f} ms, previous {times[1] * 1e3:.1f} ms, "
+          f"library {times[2] * 1e3:.1f} ms")
+    print(f"Library: {library.stats()}")
@@ -0,0 +1,108 @@
+import numpy as np
+from scipy import sparse
+from tabulate import tabulate
+from ybus_assembly import SEQUENCES
+
+
+def branch_incidence(num_buses: int, from_idx, to_idx):
+    """
+    Build the branch-to-bus incidence matrices of a network.
+
+    :param num_buses: Number of buses N
+    :param from_idx: (B,) from-bus index of each branch
+    :param to_idx: (B,) to-bus index of each branch
+    :return: Cf, Ct sparse (B, N) CSR matrices with a single 1 per row at the from / to bus
+    """
+    from_idx = np.asarray(from_idx, dtype=np.int64)
+    to_idx = np.asarray(to_idx, dtype=np.int64)
+    rows = np.arange(len(from_idx))
+    ones = np.ones(len(from_idx))
+    Cf = sparse.csr_matrix((ones, (rows, from_idx)), shape=(len(from_idx), num_buses))
+    Ct = sparse.csr_matrix((ones, (rows, to_idx)), shape=(len(to_idx), num_buses))
+    return Cf, Ct
+
+
+def branch_admittance(Cf, Ct, branch_yprim):
+    """
+    Build the branch admittance matrices from stacked branch Yprim, so that the from-end and to-end
+    currents of every branch are If = Yf V and It = Yt V.
+
+    :param Cf: (B, N) from-bus incidence matrix
+    :param Ct: (B, N) to-bus incidence matrix
+    :param branch_yprim: (B, 2, 2) complex Yprim of each branch for one sequence network
+    :return: Yf, Yt sparse (B, N) CSR matrices
+    """
+    branch_yprim = np.asarray(branch_yprim, dtype=complex)
+    Yf = sparse.diags(branch_yprim[:, 0, 0]) @ Cf + sparse.diags(branch_yprim[:, 0, 1]) @ Ct
+    Yt = sparse.diags(branch_yprim[:, 1, 0]) @ Cf + sparse.diags(branch_yprim[:, 1, 1]) @ Ct
+    return Yf.tocsr(), Yt.tocsr()
+
+
+class BranchFlows:
+    """
+    The BranchFlows class holds the from-end and to-end power flows, current magnitudes and losses
+    of every branch for one bus voltage solution, as NumPy arrays in per unit on the system base.
+    Branch order is the CompiledNetwork order: transformers first, then transmission lines.
+    """
+
+    def __init__(self, network, vpu, delta, sequence: str = 'positive'):
+        """
+        :param network: CompiledNetwork the voltages belong to
+        :param vpu: (N,) bus voltage magnitudes in pu
+        :param delta: (N,) bus voltage angles in degrees
+        :param sequence: sequence network whose branch admittances carry the flow
+        """
+        self.names = network.branch_names
+        self.s_base = network.s_base
+        Yf, Yt = network.get_branch_admittance(sequence)
+        Cf, Ct = network.get_branch_incidence()
+
+        V = np.asarray(vpu, dtype=float) * np.exp(1j * np.radians(np.asarray(delta, dtype=float)))
+        V_from, V_to = Cf @ V, Ct @ V
+        I_from, I_to = Yf @ V, Yt @ V
+        S_from = V_from * np.conj(I_from)
+        S_to = V_to * np.conj(I_to)
+
+        self.p_from, self.q_from = S_from.real, S_from.imag
+        self.p_to, self.q_to = S_to.real, S_to.imag
+        self.i_from, self.i_to = np.abs(I_from), np.abs(I_to)
+
+        # Series element of each pi branch: y_series = -Y_ft, loss = |I_series|^2 R_series
+        y_series = -network.branch_yprim[SEQUENCES.index(sequence), :, 0, 1]
+        in_service = y_series != 0
+        r_series = np.zeros(len(y_series))
+        r_series[in_service] = (1 / y_series[in_service]).real
+        self.i_series = np.abs(y_series * (V_from - V_to))
+        self.i2r_loss = self.i_series ** 2 * r_series
+
+        # Total branch losses, including any shunt branches
+        self.p_loss = self.p_from + self.p_to
+        self.q_loss = self.q_from + self.q_to
+
+    def print_table(self):
+        # Branch flows in MW / Mvar on the system base
+        table = [
+            [name, f"{pf * self.s_base:.2f}", f"{qf * self.s_base:.2f}", f"{pt * self.s_base:.2f}",
+             f"{qt * self.s_base:.2f}", f"{i:.4f}", f"{loss * self.s_base:.3f}"]
+            for name, pf, qf, pt, qt, i, loss in zip(self.names, self.p_from, self.q_from, self.p_to, self.q_to,
+                                                    self.i_from, self.i2r_loss)
+        ]
+        print("\nBranch Flows:")
+        headers = ["Branch", "P from [MW]", "Q from [Mvar]", "P to [MW]", "Q to [Mvar]", "|I| [pu]", "I²R [MW]"]
+        print(tabulate(table, headers=headers, tablefmt="grid"))
+
+
+if __name__ == '__main__':
+    from sample_networks import build_seven_bus_circuit
+    from solution import Solution
+    from powerflow import PowerFlow
+
+    circuit1 = build_seven_bus_circuit()
+    solution = Solution(buses=[], ybus=None, voltages=[])
+    solution.initialize_system(circuit1)
+    powerflow = PowerFlow(solution=solution, tol=0.001, max_iter=5)
+    powerflow.calc_newton_raphson()
+
+    flows = powerflow.calc_branch_flows()
+    flows.print_table()
+    print(f"Total I²R losses: {flows.i2r_loss.sum() * flows.s_base:.3f} MW")
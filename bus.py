@@ -9,6 +9,8 @@ class Bus:
     bus_count = 0
     # Class variable to keep count of bus instances
 
+    __slots__ = ('name', 'base_kv', 'index', 'vpu', 'delta', 'bus_type', 'P_spec', 'Q_spec')
+
     def __init__(self, name, base_kv, bus_type, vpu = 1.0, delta = 0.0, P_spec = 0, Q_spec = 0):
         """
         Initialize the Bus object with the given parameters.
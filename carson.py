@@ -0,0 +1,211 @@
+import numpy as np
+from line_constants import MILES_TO_METERS, EPSILON_0
+
+# Phase-domain line constants from Carson's equations, evaluated for many towers at once.
+# Every function takes stacked arrays with a leading tower axis T; conductors are ordered with
+# the three phase conductors first, followed by any (grounded) shield wires.
+
+MU_0 = 4 * np.pi * 10 ** -7 # Permeability of free space (H/m)
+METERS_TO_FEET = 1 / 0.3048
+A_MATRIX = np.array([[1, 1, 1],
+                     [1, np.exp(1j * 4 * np.pi / 3), np.exp(1j * 2 * np.pi / 3)],
+                     [1, np.exp(1j * 2 * np.pi / 3), np.exp(1j * 4 * np.pi / 3)]]) # abc = A @ 012
+A_INVERSE = np.linalg.inv(A_MATRIX)
+
+
+def earth_return_depth(f=60, rho=100):
+    """
+    Depth of the equivalent earth-return conductor, De = 658.5 sqrt(rho / f) m, in feet.
+    """
+    return 658.5 * np.sqrt(rho / f) * METERS_TO_FEET
+
+
+def _distances(x, y):
+    # Conductor-to-conductor distances D and conductor-to-image distances S, shape (T, n, n)
+    dx = x[:, :, None] - x[:, None, :]
+    D = np.hypot(dx, y[:, :, None] - y[:, None, :])
+    S = np.hypot(dx, y[:, :, None] + y[:, None, :])
+    return D, S
+
+
+def carson_impedance_matrix(x, y, r, gmr, f=60, rho=100):
+    """
+    Primitive series impedance matrix per mile with the modified Carson earth-return correction.
+
+    z_ii = r_i + pi^2 f 1e-7 + j 4 pi f 1e-7 ln(De / GMR_i)  (ohm/m)
+    z_ij =       pi^2 f 1e-7 + j 4 pi f 1e-7 ln(De / D_ij)
+
+    :param x: (T, n) horizontal conductor positions (ft)
+    :param y: (T, n) conductor heights above ground (ft)
+    :param r: (T, n) conductor (or equivalent bundle) resistance (ohm/mi)
+    :param gmr: (T, n) conductor (or bundle) geometric mean radius (ft)
+    :param f: frequency (Hz)
+    :param rho: earth resistivity (ohm m)
+    :return: (T, n, n) complex impedance matrix (ohm/mi)
+    """
+    x, y, r, gmr = (np.atleast_2d(np.asarray(a, dtype=float)) for a in (x, y, r, gmr))
+    D, _ = _distances(x, y)
+    n = x.shape[1]
+    diagonal = np.arange(n)
+    D[:, diagonal, diagonal] = gmr
+
+    w = 2 * np.pi * f
+    Z = (w * MU_0 / 8 + 1j * w * MU_0 / (2 * np.pi) * np.log(earth_return_depth(f, rho) / D)) * MILES_TO_METERS
+    Z[:, diagonal, diagonal] += r
+    return Z
+
+
+def potential_coefficient_matrix(x, y, radius):
+    """
+    Maxwell potential coefficient matrix per mile, P_ij = ln(S_ij / D_ij) / (2 pi eps0), with
+    S the distance to the image conductor below ground and D_ii the conductor radius.
+
+    :param x: (T, n) horizontal conductor positions (ft)
+    :param y: (T, n) conductor heights above ground (ft)
+    :param radius: (T, n) conductor (or equivalent bundle) radius (ft)
+    :return: (T, n, n) potential coefficients (mi/F)
+    """
+    x, y, radius = (np.atleast_2d(np.asarray(a, dtype=float)) for a in (x, y, radius))
+    D, S = _distances(x, y)
+    n = x.shape[1]
+    diagonal = np.arange(n)
+    D[:, diagonal, diagonal] = radius
+    return np.log(S / D) / (2 * np.pi * EPSILON_0) / MILES_TO_METERS
+
+
+def kron_reduce(matrix, num_phases: int = 3):
+    """
+    Eliminate grounded conductors: M_red = M_pp - M_pg M_gg^-1 M_gp, batched over towers.
+
+    :param matrix: (T, n, n) primitive matrix, phase conductors first
+    :return: (T, num_phases, num_phases) reduced matrix
+    """
+    if matrix.shape[-1] == num_phases:
+        return matrix
+    pp = matrix[:, :num_phases, :num_phases]
+    pg = matrix[:, :num_phases, num_phases:]
+    gp = matrix[:, num_phases:, :num_phases]
+    gg = matrix[:, num_phases:, num_phases:]
+    return pp - pg @ np.linalg.solve(gg, gp)
+
+
+def phase_to_sequence(matrix_abc):
+    """
+    Transform (T, 3, 3) phase-domain matrices to sequence components, M_012 = A^-1 M_abc A.
+    """
+    return A_INVERSE @ matrix_abc @ A_MATRIX
+
+
+class PhaseLineConstants:
+    """
+    The PhaseLineConstants class holds per-mile phase and sequence constants for a stack of towers.
+    Series impedances use Carson's equations; shunt admittances use potential coefficients. Shield
+    wires are Kron-reduced and bundles enter as their equivalent conductor (GMR = DSL, radius = DSC).
+    """
+
+    def __init__(self, x, y, r, gmr, radius, f=60, rho=100):
+        """
+        :param x: (T, n) horizontal conductor positions (ft), phases a, b, c first, then shield wires
+        :param y: (T, n) conductor heights above ground (ft)
+        :param r: (T, n) resistance (ohm/mi)
+        :param gmr: (T, n) geometric mean radius (ft)
+        :param radius: (T, n) radius for capacitance (ft)
+        :param f: frequency (Hz)
+        :param rho: earth resistivity (ohm m)
+        """
+        self.f = f
+        self.rho = rho
+        self.z_primitive = carson_impedance_matrix(x, y, r, gmr, f, rho)
+        self.p_primitive = potential_coefficient_matrix(x, y, radius)
+
+        # Phase-domain 3x3 matrices per mile
+        self.z_abc = kron_reduce(self.z_primitive)
+        self.y_abc = 1j * 2 * np.pi * f * np.linalg.inv(kron_reduce(self.p_primitive))
+
+        # Sequence-domain matrices and their diagonals
+        self.z_012 = phase_to_sequence(self.z_abc)
+        self.y_012 = phase_to_sequence(self.y_abc)
+        self.z0, self.z1, self.z2 = (self.z_012[:, k, k] for k in range(3))
+        self.y0, self.y1, self.y2 = (self.y_012[:, k, k] for k in range(3))
+
+    @classmethod
+    def from_geometries(cls, bundles, geometries, height: float, shield_wires=None, f=60, rho=100):
+        """
+        Build tower data from the repo's Bundle and Geometry objects.
+
+        Geometry coordinates are taken relative to the lowest phase, which is placed at the given
+        height above ground. Shield wires are (x, y, resistance ohm/mi, GMR ft, radius ft) tuples
+        in the same coordinates, shared by every tower.
+
+        :param bundles: sequence of Bundle objects, one per tower
+        :param geometries: sequence of Geometry objects, one per tower
+        :param height: height of the lowest phase conductor above ground (ft)
+        """
+        count = len(bundles)
+        x = np.array([[g.xa, g.xb, g.xc] for g in geometries], dtype=float)
+        y = np.array([[g.ya, g.yb, g.yc] for g in geometries], dtype=float)
+        offset = height - y.min(axis=1, keepdims=True)
+        y = y + offset
+        r = np.repeat([[b.conductor.resistance / b.num_conductors] for b in bundles], 3, axis=1)
+        gmr = np.repeat([[b.DSL] for b in bundles], 3, axis=1)
+        radius = np.repeat([[b.DSC] for b in bundles], 3, axis=1)
+
+        if shield_wires:
+            wires = np.array(shield_wires, dtype=float)
+            x = np.hstack((x, np.broadcast_to(wires[:, 0], (count, len(wires)))))
+            y = np.hstack((y, wires[:, 1][None, :] + offset))
+            r = np.hstack((r, np.broadcast_to(wires[:, 2], (count, len(wires)))))
+            gmr = np.hstack((gmr, np.broadcast_to(wires[:, 3], (count, len(wires)))))
+            radius = np.hstack((radius, np.broadcast_to(wires[:, 4], (count, len(wires)))))
+        return cls(x, y, r, gmr, radius, f, rho)
+
+
+def carson_sequence_impedances_pu(tlines, height: float, shield_wires=None, rho=100):
+    """
+    Carson-based positive, negative and zero sequence series impedances of TransmissionLine
+    objects, in pu on the sending-end bus base. Each distinct bundle/geometry/frequency
+    combination is evaluated once and scaled by line length.
+
+    :return: (3, L) array of z1, z2, z0 in pu
+    """
+    combos = {} # (bundle id, geometry id, f) -> (position, first line using it)
+    combo_index = np.fromiter(
+        (combos.setdefault((id(t.bundle), id(t.geometry), t.f), (len(combos), t))[0] for t in tlines),
+        dtype=np.int64, count=len(tlines))
+    z_per_mile = np.zeros((3, len(combos)), dtype=complex)
+    for f in {t.f for _, t in combos.values()}:
+        members = [(k, t) for k, t in combos.values() if t.f == f]
+        tower = PhaseLineConstants.from_geometries([t.bundle for _, t in members], [t.geometry for _, t in members],
+                                                   height, shield_wires, f, rho)
+        z_per_mile[:, [k for k, _ in members]] = np.stack((tower.z1, tower.z2, tower.z0))
+
+    length = np.fromiter((t.length for t in tlines), dtype=float, count=len(tlines))
+    zbase = np.fromiter((t.bus1.base_kv ** 2 / t.S_Base for t in tlines), dtype=float, count=len(tlines))
+    return z_per_mile[:, combo_index] * length / zbase
+
+
+if __name__ == '__main__':
+    import time
+    from sample_networks import build_seven_bus_circuit
+
+    # 7-bus lines: lowest phase 50 ft above ground, one 3/8" EHS shield wire 20 ft above the centre phase
+    circuit1 = build_seven_bus_circuit()
+    tlines = list(circuit1.transmission_lines.values())
+    shield = [(19.5, 20.0, 6.5, 0.0005, 0.0156)]
+    z_carson = carson_sequence_impedances_pu(tlines, height=50.0, shield_wires=shield)
+    for tline, z1, z0 in zip(tlines, z_carson[0], z_carson[2]):
+        print(f"{tline.name}: z1 = {z1:.5f} pu (estimate {tline.z1_pu:.5f}), "
+              f"z0 = {z0:.5f} pu (estimate {tline.z0_pu:.5f})")
+
+    # Vectorized across many towers with random conductor heights
+    rng = np.random.default_rng(0)
+    towers = 100000
+    x = np.tile([-19.5, 0.0, 19.5, -10.0, 10.0], (towers, 1))
+    y = np.hstack((rng.uniform(40, 60, (towers, 3)), rng.uniform(70, 80, (towers, 2))))
+    r = np.tile([0.1925, 0.1925, 0.1925, 6.5, 6.5], (towers, 1))
+    gmr = np.tile([0.0434, 0.0434, 0.0434, 0.0005, 0.0005], (towers, 1))
+    radius = np.tile([0.0802, 0.0802, 0.0802, 0.0156, 0.0156], (towers, 1))
+    start = time.perf_counter()
+    batch = PhaseLineConstants(x, y, r, gmr, radius)
+    print(f"{towers} towers with 2 shield wires: {time.perf_counter() - start:.3f} s, "
+          f"mean z0/z1 = {np.mean(np.abs(batch.z0 / batch.z1)):.2f}")
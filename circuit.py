@@ -3,23 +3,64 @@ from transformer import Transformer
 from transmissionline import TransmissionLine
 from generator import Generator
 from load import Load
+import contextlib
+import copy
+import gc
+from collections import Counter
+from itertools import repeat
 import numpy as np
 from tabulate import tabulate
 from sym_components import seq_to_abc
+from compiled_network import CompiledNetwork
+from ordering import ORDERINGS, OrderedLU
+from topology import Topology
+from line_constants import LINE_MODELS, LineConstants
+from ybus_assembly import SEQUENCES, assemble_sequence_ybus, check_ybus_diagonal, patch_ybus, update_zbus, LowRankUpdatedLU
 
 # Circuits are Cool :)
 
+
+@contextlib.contextmanager
+def _gc_paused():
+    # Bulk builders allocate hundreds of thousands of acyclic objects; without the pause the
+    # cyclic collector rescans the growing heap over and over while they are created
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
 class Circuit:
+    # Device kinds whose changes each cached quantity depends on
+    CACHE_DEPENDENCIES = {
+        'admittances': ('bus', 'branch', 'generator'),
+        'compiled': ('bus', 'branch', 'generator', 'load', 'setpoint'),
+        'ybus_sparse': ('bus', 'branch', 'generator'),
+        'ybus_powerflow': ('bus', 'branch', 'generator'),
+        'ybus_dense': ('bus', 'branch', 'generator'),
+        'zbus': ('bus', 'branch', 'generator'),
+        'lu': ('bus', 'branch', 'generator'),
+        'topology': ('bus', 'branch', 'generator', 'setpoint'), # Slack promotion follows generator MW setpoints
+        'island_lu': ('bus', 'branch', 'generator'),
+    }
+    MAX_LOW_RANK_UPDATES = 16 # Refactorize once this many branch changes are stacked on one LU
+
     def __init__(self,name: str):
         # Initializing attributes thruough dictionaries
         self.name = name
         self.buses = {} # Dictionary of Bus objects
+        self.bus_indices = {} # Bus name to Ybus row/column index
         self.transformer = {} # Dictionary of Transformer objects
         self.transmission_lines = {} # Dictionary of T-Line objects
         self.generators = {} # Dictionary of generators
         self.loads = {} # Dictionary of loads
         self.ybus_powerflow = None # Ybus matrix placeholder
         self.ybus_faultstudy = None # Ybus matrix placeholder
+        self.ybus_sparse = None # Dictionary of sparse Ybus per sequence
+        self.ybus_faultstudy_sequence = None # Sequence network held by ybus_faultstudy
         self.zbus = None
         self.fault_current = None # Specific current at bus
         self.fault_currents = [] # List to store fault values
@@ -27,13 +68,123 @@ class Circuit:
         self.fault_bus_vs = [] # List to store voltage values
         self.V_f = 1.0 # Pre-fault voltage in p.u.
         self.ybus_sequences = {} # Dictionary to hold Ybus for each sequence
+        self.bus_ordering = 'mmd' # Fill-reducing bus ordering used by sparse factorizations
+        self.line_model = 'series' # Transmission line model used in Ybus assembly (see LINE_MODELS)
+        self.versions = {'bus': 0, 'branch': 0, 'generator': 0, 'load': 0, 'setpoint': 0} # Bumped on every device change
+        self.cache_stats = {'hits': 0, 'misses': 0} # Cache hit/miss counters
+        self._cache = {} # (quantity, key) -> (version stamp, value)
+        self._borrowed = set() # Cache keys whose values are shared with a fork, copied before patching
+        self._borrowed_branches = set() # (dictionary, name) of branch objects shared with a fork
+
 
+    def mark_modified(self, kind: str):
+        """
+        Record that a device of the given kind ('bus', 'branch', 'generator', 'load', 'setpoint') was
+        added or modified; 'setpoint' covers generator setpoints that do not change Ybus.
+        Cached matrices depending on it are recomputed on next use. Call this after editing
+        a device object in place.
+        """
+        if kind not in self.versions:
+            raise ValueError(f"Unknown device kind {kind}. Choose from {', '.join(self.versions)}.")
+        self.versions[kind] += 1
+
+    def _stamp(self, quantity):
+        return tuple(self.versions[kind] for kind in self.CACHE_DEPENDENCIES[quantity])
+
+    def _cached(self, quantity, key, compute):
+        # Return the cached value if no device it depends on changed since, otherwise recompute it
+        entry = self._cache.get((quantity, key))
+        stamp = self._stamp(quantity)
+        if entry is not None and entry[0] == stamp:
+            self.cache_stats['hits'] += 1
+            return entry[1]
+        self.cache_stats['misses'] += 1
+        value = compute()
+        self._cache[(quantity, key)] = (stamp, value)
+        self._borrowed.discard((quantity, key))
+        return value
+
+    def clear_cache(self):
+        # Drop every cached matrix and factorization
+        self._cache.clear()
+        self._borrowed.clear()
+
+    def __getstate__(self):
+        # Pickle without cached matrices and factorizations (SuperLU objects cannot be pickled);
+        # the receiving process rebuilds them on first use
+        state = dict(self.__dict__)
+        state['_cache'] = {}
+        state['_borrowed'] = set()
+        state['_borrowed_branches'] = set()
+        return state
+
+    def fork(self, name: str = None):
+        """
+        Create a copy-on-write variant of this circuit for scenario studies.
+
+        Transformers, transmission lines (with their line constants) and every cached matrix and
+        factorization are shared with the parent. Buses, loads and generators carry the solver state
+        and setpoints a variant changes, so they are copied (they are small slotted objects).
+        A shared branch is copied the first time either circuit switches it, and a shared Ybus is
+        copied before it is patched, so the parent's Ybus and LU become the starting point of the
+        variant's incremental update without either circuit seeing the other's changes.
+        """
+        child = Circuit(name if name is not None else f"{self.name} (fork)")
+        child.buses = {bus_name: copy.copy(bus) for bus_name, bus in self.buses.items()}
+        child.bus_indices = dict(self.bus_indices)
+        child.transformer = dict(self.transformer)
+        child.transmission_lines = dict(self.transmission_lines)
+        child.generators = {}
+        for gen_name, generator in self.generators.items():
+            child.generators[gen_name] = copy.copy(generator)
+            child.generators[gen_name].bus = child.buses[generator.bus.name]
+        child.loads = {}
+        for load_name, load in self.loads.items():
+            child.loads[load_name] = copy.copy(load)
+            child.loads[load_name].bus = child.buses[load.bus.name]
+        child.V_f = self.V_f
+        child.bus_ordering = self.bus_ordering
+        child.line_model = self.line_model
+
+        # Share versions and cache entries; both sides copy shared values before patching them
+        child.versions = dict(self.versions)
+        child._cache = dict(self._cache)
+        shared_keys = set(self._cache)
+        self._borrowed |= shared_keys
+        child._borrowed = set(shared_keys)
+        shared_branches = {('transformer', branch_name) for branch_name in self.transformer}
+        shared_branches |= {('transmission_lines', branch_name) for branch_name in self.transmission_lines}
+        self._borrowed_branches |= shared_branches
+        child._borrowed_branches = set(shared_branches)
+        return child
+
+    def set_load(self, name, real_power: float = None, reactive_power: float = None):
+        # Change a load's demand; only the compiled injections depend on it
+        if name not in self.loads:
+            raise ValueError(f"Load {name} does not exist in the circuit.")
+        if real_power is not None:
+            self.loads[name].real_power = real_power
+        if reactive_power is not None:
+            self.loads[name].reactive_power = reactive_power
+        self.mark_modified('load')
+
+    def set_generator_setpoint(self, name, mw_setpoint: float = None, voltage_setpoint: float = None):
+        # Change a generator's dispatch; Ybus and its factorizations stay valid
+        if name not in self.generators:
+            raise ValueError(f"Generator {name} does not exist in the circuit.")
+        if mw_setpoint is not None:
+            self.generators[name].mw_setpoint = mw_setpoint
+        if voltage_setpoint is not None:
+            self.generators[name].voltage_setpoint = voltage_setpoint
+        self.mark_modified('setpoint')
 
     def add_bus(self, name, base_kv, bus_type):
         # Adding bus into circuit
         if name in self.buses:
             raise ValueError(f"Bus {name} already exists in the circuit.")
+        self.bus_indices[name] = len(self.buses)
         self.buses[name] = Bus(name, float(base_kv), str(bus_type))
+        self.mark_modified('bus')
 
     def add_transformer(self, name, bus1, bus2, power_rating, impedance_percent, x_over_r_ratio, base_mva, connection_type, zg1, zg2):
         # Adding transformer into circuit
@@ -42,6 +193,7 @@ class Circuit:
         if bus1 not in self.buses or bus2 not in self.buses:
             raise ValueError("Both buses must be added to the circuit before adding a transformer.")
         self.transformer[name] = Transformer(name, self.buses[bus1], self.buses[bus2], power_rating, impedance_percent, x_over_r_ratio, base_mva, connection_type, zg1, zg2)
+        self._patch_branch(self.transformer[name], 1)
 
     def add_transmission_line(self, name, bus1, bus2, bundle, geometry, length):
         # Adding transmission line into circuit
@@ -50,6 +202,120 @@ class Circuit:
         if bus1 not in self.buses or bus2 not in self.buses:
             raise ValueError("Both buses must be added to the circuit before adding a transmission line.")
         self.transmission_lines[name] = TransmissionLine(name, self.buses[bus1], self.buses[bus2], bundle, geometry, length)
+        self._patch_branch(self.transmission_lines[name], 1)
+
+    def remove_transformer(self, name):
+        # Removing transformer from circuit, patching any built Ybus/Zbus instead of rebuilding
+        if name not in self.transformer:
+            raise ValueError(f"Transformer {name} does not exist in the circuit.")
+        transformer = self.transformer.pop(name)
+        if transformer.in_service:
+            self._patch_branch(transformer, -1)
+        else:
+            self.mark_modified('branch')
+
+    def remove_transmission_line(self, name):
+        # Removing transmission line from circuit, patching any built Ybus/Zbus instead of rebuilding
+        if name not in self.transmission_lines:
+            raise ValueError(f"Transmission line {name} does not exist in the circuit.")
+        tline = self.transmission_lines.pop(name)
+        if tline.in_service:
+            self._patch_branch(tline, -1)
+        else:
+            self.mark_modified('branch')
+
+    def switch_transformer(self, name, in_service: bool):
+        # Open (False) or close (True) a transformer
+        if name not in self.transformer:
+            raise ValueError(f"Transformer {name} does not exist in the circuit.")
+        self._switch_branch(self.transformer, 'transformer', name, in_service)
+
+    def switch_transmission_line(self, name, in_service: bool):
+        # Open (False) or close (True) a transmission line
+        if name not in self.transmission_lines:
+            raise ValueError(f"Transmission line {name} does not exist in the circuit.")
+        self._switch_branch(self.transmission_lines, 'transmission_lines', name, in_service)
+
+    def _switch_branch(self, devices, kind, name, in_service: bool):
+        branch = devices[name]
+        if branch.in_service == bool(in_service):
+            return
+        if (kind, name) in self._borrowed_branches:
+            # Branch is shared with a fork, switch a private copy
+            branch = copy.copy(branch)
+            devices[name] = branch
+            self._borrowed_branches.discard((kind, name))
+        branch.in_service = bool(in_service)
+        self._patch_branch(branch, 1 if branch.in_service else -1)
+
+    def _patch_branch(self, branch, sign: int):
+        """
+        Add (sign=+1) or subtract (sign=-1) the rank-2 Yprim contribution of a branch to every
+        up-to-date cached Ybus, for every sequence network, and carry Zbus and LU factorizations
+        along with low-rank updates. Stale or missing entries pick the change up when recomputed.
+        """
+        fresh = {k: entry[1] for k, entry in self._cache.items() if entry[0] == self._stamp(k[0])}
+        self.mark_modified('branch')
+        if not fresh:
+            return
+
+        idx = [self.bus_indices[branch.bus1.name], self.bus_indices[branch.bus2.name]]
+        rows, cols = np.repeat(idx, 2), np.tile(idx, 2)
+        branch_yprim = self._branch_yprim(branch)
+        delta_yprims = {sequence: sign * branch_yprim[s] for s, sequence in enumerate(SEQUENCES)}
+
+        for (quantity, key), value in fresh.items():
+            if quantity == 'ybus_sparse':
+                borrowed = (quantity, key) in self._borrowed
+                patched_dict = {} if borrowed else value
+                for sequence in SEQUENCES:
+                    ybus = value[sequence].copy() if borrowed else value[sequence]
+                    patched = patch_ybus(ybus, rows, cols, delta_yprims[sequence].ravel())
+                    if self.ybus_sequences.get(sequence) is value[sequence]:
+                        self.ybus_sequences[sequence] = patched
+                    patched_dict[sequence] = patched
+                if self.ybus_sparse is value:
+                    self.ybus_sparse = patched_dict
+                value = patched_dict
+            elif quantity in ('ybus_powerflow', 'ybus_dense'):
+                patched = value.copy() if (quantity, key) in self._borrowed else value
+                patch_ybus(patched, rows, cols, delta_yprims[key].ravel())
+                self._repoint(value, patched)
+                value = patched
+            elif quantity == 'zbus':
+                patched = update_zbus(value, idx, delta_yprims[key])
+                if patched is None:
+                    # Ill-conditioned update: drop the stale Zbus so it is not handed out as current
+                    if self.zbus is value:
+                        self.zbus = None
+                    del self._cache[(quantity, key)]
+                    self._borrowed.discard((quantity, key))
+                    continue
+                self._repoint(value, patched)
+                value = patched
+            elif quantity == 'lu':
+                if getattr(value, 'depth', 0) >= self.MAX_LOW_RANK_UPDATES:
+                    continue
+                try:
+                    value = LowRankUpdatedLU(value, idx, delta_yprims[key])
+                except np.linalg.LinAlgError:
+                    continue
+            else:
+                continue
+            self._cache[(quantity, key)] = (self._stamp(quantity), value)
+            self._borrowed.discard((quantity, key))
+
+    def _repoint(self, old, new):
+        # Keep the public matrix attributes on the patched copy of a cached matrix
+        if self.ybus_powerflow is old:
+            self.ybus_powerflow = new
+        if self.ybus_faultstudy is old:
+            self.ybus_faultstudy = new
+        if self.zbus is old:
+            self.zbus = new
+        for sequence, ybus in self.ybus_sequences.items():
+            if ybus is old:
+                self.ybus_sequences[sequence] = new
 
     def add_generator(self, name, bus_name, voltage_setpoint, mw_setpoint, x1_pu, x2_pu, x0_pu, base_mva, grounded, ground_r_pu):
         if name in self.generators:
@@ -60,6 +326,7 @@ class Circuit:
             name, self.buses[bus_name], voltage_setpoint, mw_setpoint,
             x1_pu, x2_pu, x0_pu, base_mva, grounded = grounded, grounding_r_pu = ground_r_pu
         )
+        self.mark_modified('generator')
 
     def add_load(self, name, bus_name, real_power, reactive_power):
         if name in self.loads:
@@ -67,137 +334,375 @@ class Circuit:
         if bus_name not in self.buses:
             raise ValueError(f"Bus {bus_name} must be added before attaching a load.")
         self.loads[name] = Load(name, self.buses[bus_name], real_power, reactive_power)
+        self.mark_modified('load')
+
+    @staticmethod
+    def _column(values, count: int, dtype, label: str):
+        # Broadcast a scalar or a column to count entries and check its length
+        column = np.asarray(values, dtype=dtype)
+        if column.ndim == 0:
+            column = np.full(count, column.item(), dtype=dtype)
+        if column.shape != (count,):
+            raise ValueError(f"Column {label} has {column.size} entries, expected {count}.")
+        return column
+
+    @staticmethod
+    def _check_positive(column, label: str):
+        bad = ~(np.isfinite(column) & (column > 0))
+        if np.any(bad):
+            raise ValueError(f"Column {label} must be finite and positive (first bad entry at row {np.flatnonzero(bad)[0]}).")
+
+    @staticmethod
+    def _check_new_names(names, existing, label: str):
+        """
+        Validate a name column with set operations: no repeats within the batch and none already in the circuit.
+        """
+        names = list(names)
+        unique = set(names)
+        if len(unique) != len(names):
+            counts = Counter(names)
+            raise ValueError(f"Duplicate {label} names in batch: {', '.join(str(n) for n, c in counts.items() if c > 1)}.")
+        clash = unique.intersection(existing)
+        if clash:
+            raise ValueError(f"{label.capitalize()} already exists in the circuit: {', '.join(sorted(map(str, clash))[:5])}.")
+        return names
+
+    def _lookup_buses(self, bus_names, count: int, label: str):
+        # Bus objects for a column of bus names, resolved in one C-level pass over the bus dictionary.
+        # A single name is broadcast to every row, as _column does for numeric columns.
+        if isinstance(bus_names, str):
+            bus_names = [bus_names] * count
+        try:
+            buses = list(map(self.buses.__getitem__, bus_names))
+        except KeyError:
+            missing = sorted(set(bus_names).difference(self.buses))
+            raise ValueError(f"Buses must be added to the circuit before adding {label}: {', '.join(missing[:5])}.") from None
+        if len(buses) != count:
+            raise ValueError(f"Bus column for {label} has {len(buses)} entries, expected {count}.")
+        return buses
+
+    def add_buses(self, names, base_kv, bus_types):
+        """
+        Add many buses at once from column arrays (scalars are broadcast to every row).
 
-    def calc_ybus_powerflow(self, sequence: str = 'positive'):
-        # Ybus matrix by summing the primitive admittance matrices.
+        :param names: (N,) bus names
+        :param base_kv: (N,) nominal voltages in kV
+        :param bus_types: (N,) "Slack Bus", "PV Bus" or "PQ Bus"
+        """
+        names = self._check_new_names(names, self.buses, 'bus')
+        count = len(names)
+        base_kv = self._column(base_kv, count, float, 'base_kv')
+        bus_types = self._column(bus_types, count, object, 'bus_types')
+        self._check_positive(base_kv, 'base_kv')
+        invalid = set(bus_types.tolist()).difference(("Slack Bus", "PV Bus", "PQ Bus"))
+        if invalid:
+            raise ValueError(f"Invalid bus type {invalid.pop()}. Choose from PQ Bus, PV Bus or Slack Bus.")
+
+        start = len(self.buses)
+        self.bus_indices.update(zip(names, range(start, start + count)))
+        with _gc_paused():
+            self.buses.update(zip(names, map(Bus, names, base_kv.tolist(), bus_types.tolist())))
+        self.mark_modified('bus')
+
+    def add_transformers(self, names, bus1, bus2, power_rating, impedance_percent, x_over_r_ratio, base_mva,
+                         connection_type="Y-Y", zg1=None, zg2=None):
+        """
+        Add many transformers at once from column arrays (scalars are broadcast to every row).
+        Cached matrices are rebuilt on next use rather than patched branch by branch.
+        """
+        names = self._check_new_names(names, self.transformer, 'transformer')
+        count = len(names)
+        from_buses = self._lookup_buses(bus1, count, 'transformers')
+        to_buses = self._lookup_buses(bus2, count, 'transformers')
+        power_rating = self._column(power_rating, count, float, 'power_rating')
+        impedance_percent = self._column(impedance_percent, count, float, 'impedance_percent')
+        x_over_r_ratio = self._column(x_over_r_ratio, count, float, 'x_over_r_ratio')
+        base_mva = self._column(base_mva, count, float, 'base_mva')
+        connection_type = self._column(connection_type, count, object, 'connection_type')
+        zg1 = self._column(zg1, count, object, 'zg1')
+        zg2 = self._column(zg2, count, object, 'zg2')
+        self._check_positive(power_rating, 'power_rating')
+        self._check_positive(base_mva, 'base_mva')
+
+        transformers = map(Transformer, names, from_buses, to_buses, power_rating.tolist(), impedance_percent.tolist(),
+                           x_over_r_ratio.tolist(), base_mva.tolist(), connection_type.tolist(), zg1.tolist(), zg2.tolist())
+        with _gc_paused():
+            self.transformer.update(zip(names, transformers))
+        self.mark_modified('branch')
+
+    def add_transmission_lines(self, names, bus1, bus2, bundle, geometry, length):
+        """
+        Add many transmission lines at once from column arrays. bundle and geometry may be a single
+        object shared by every line or one per line; length is in miles.
+        Cached matrices are rebuilt on next use rather than patched branch by branch.
+        """
+        names = self._check_new_names(names, self.transmission_lines, 'transmission line')
+        count = len(names)
+        from_buses = self._lookup_buses(bus1, count, 'transmission lines')
+        to_buses = self._lookup_buses(bus2, count, 'transmission lines')
+        length = self._column(length, count, float, 'length')
+        self._check_positive(length, 'length')
+        bundles = list(bundle) if isinstance(bundle, (list, tuple, np.ndarray)) else [bundle] * count
+        geometries = list(geometry) if isinstance(geometry, (list, tuple, np.ndarray)) else [geometry] * count
+        if len(bundles) != count or len(geometries) != count:
+            raise ValueError(f"Columns bundle and geometry must have one entry or {count} entries.")
+
+        tlines = map(TransmissionLine, names, from_buses, to_buses, bundles, geometries, length.tolist())
+        with _gc_paused():
+            self.transmission_lines.update(zip(names, tlines))
+        self.mark_modified('branch')
+
+    def add_generators(self, names, bus_names, voltage_setpoint, mw_setpoint, x1_pu, x2_pu, x0_pu, base_mva,
+                       grounded=True, ground_r_pu=0.0):
+        """
+        Add many generators at once from column arrays (scalars are broadcast to every row).
+        """
+        names = self._check_new_names(names, self.generators, 'generator')
+        count = len(names)
+        buses = self._lookup_buses(bus_names, count, 'generators')
+        voltage_setpoint = self._column(voltage_setpoint, count, float, 'voltage_setpoint')
+        mw_setpoint = self._column(mw_setpoint, count, float, 'mw_setpoint')
+        x1_pu = self._column(x1_pu, count, float, 'x1_pu')
+        x2_pu = self._column(x2_pu, count, float, 'x2_pu')
+        x0_pu = self._column(x0_pu, count, float, 'x0_pu')
+        base_mva = self._column(base_mva, count, float, 'base_mva')
+        grounded = self._column(grounded, count, bool, 'grounded')
+        ground_r_pu = self._column(ground_r_pu, count, float, 'ground_r_pu')
+        self._check_positive(base_mva, 'base_mva')
+        self._check_positive(voltage_setpoint, 'voltage_setpoint')
+
+        # Positional Generator arguments: no separate subtransient values, no grounding reactance
+        generators = map(Generator, names, buses, voltage_setpoint.tolist(), mw_setpoint.tolist(), x1_pu.tolist(),
+                         x2_pu.tolist(), x0_pu.tolist(), base_mva.tolist(), repeat(None), repeat(None), repeat(None),
+                         ground_r_pu.tolist(), repeat(0.0), grounded.tolist())
+        with _gc_paused():
+            self.generators.update(zip(names, generators))
+        self.mark_modified('generator')
+
+    def add_loads(self, names, bus_names, real_power, reactive_power):
+        """
+        Add many loads at once from column arrays (scalars are broadcast to every row).
+        """
+        names = self._check_new_names(names, self.loads, 'load')
+        count = len(names)
+        buses = self._lookup_buses(bus_names, count, 'loads')
+        real_power = self._column(real_power, count, float, 'real_power')
+        reactive_power = self._column(reactive_power, count, float, 'reactive_power')
+        if not np.all(np.isfinite(real_power) & np.isfinite(reactive_power)):
+            raise ValueError("Load powers must be finite.")
+
+        with _gc_paused():
+            self.loads.update(zip(names, map(Load, names, buses, real_power.tolist(), reactive_power.tolist())))
+        self.mark_modified('load')
+
+    def stack_branch_admittances(self):
+        """
+        Stack the Yprim of every transformer and transmission line into arrays for vectorized assembly.
+        The arrays are cached until a bus, branch or generator changes.
 
-        # Initialize Ybus matrix (N x N zero matrix)
+        :return: from_idx (B,), to_idx (B,), branch_yprim (3, B, 2, 2),
+                 gen_idx (G,), gen_y (3, G) generator shunt admittances per sequence
+        """
+        return self._cached('admittances', None, self._stack_branch_admittances)
+
+    def _stack_branch_admittances(self):
+        # Bus names to indices for Ybus
+        bus_indices = self.bus_indices
+        transformers = list(self.transformer.values())
+        tlines = list(self.transmission_lines.values())
+        branches = transformers + tlines
+        num_branches = len(branches)
+
+        from_idx = np.fromiter((bus_indices[branch.bus1.name] for branch in branches), dtype=np.int64, count=num_branches)
+        to_idx = np.fromiter((bus_indices[branch.bus2.name] for branch in branches), dtype=np.int64, count=num_branches)
+        branch_yprim = np.zeros((len(SEQUENCES), num_branches, 2, 2), dtype=complex)
+        for s, sequence in enumerate(SEQUENCES):
+            if transformers:
+                branch_yprim[s, :len(transformers)] = [transformer.get_yprim(sequence) for transformer in transformers]
+
+        # Line constants for every line in one vectorized pass, leaving the per-line Yprim cache empty
+        if tlines:
+            branch_yprim[:, len(transformers):] = LineConstants.from_lines(tlines).yprim_pu(self.line_model)
+
+        # Out-of-service branches keep their place in the sparsity pattern with zero admittance
+        in_service = np.fromiter((branch.in_service for branch in branches), dtype=bool, count=num_branches)
+        branch_yprim[:, ~in_service] = 0
+
+        # Generator subtransient admittance per sequence (zero where the generator has no path)
+        generators = list(self.generators.values())
+        gen_idx = np.fromiter((bus_indices[gen.bus.name] for gen in generators), dtype=np.int64, count=len(generators))
+        gen_y = np.zeros((len(SEQUENCES), len(generators)), dtype=complex)
+        for g, generator in enumerate(generators):
+            if generator.x1_pu > 0:
+                gen_y[0, g] = 1 / (1j * generator.x1_pu)
+            if generator.x2_pu > 0:
+                gen_y[1, g] = 1 / (1j * generator.x2_pu)
+            if generator.grounded:
+                gen_y[2, g] = 1 / generator.get_subtransient_reactance('zero')
+
+        return from_idx, to_idx, branch_yprim, gen_idx, gen_y
+
+    def compile(self, s_base: float = 100):
+        """
+        Freeze the circuit into a CompiledNetwork: integer bus type codes, PQ/PV/slack index arrays,
+        branch from/to indices, stacked per-sequence branch admittances and Sbus injections.
+        The snapshot is cached until any device changes.
+        """
+        return self._cached('compiled', s_base, lambda: CompiledNetwork.from_circuit(self, s_base))
+
+    def calc_ybus_sparse(self):
+        """
+        Build sparse (CSR) positive, negative and zero sequence Ybus matrices in one vectorized pass.
+        Generator subtransient admittances are included, as in the fault study Ybus.
+        The result is cached until a bus, branch or generator changes.
+        """
         N = len(self.buses)
         if N == 0:
             raise ValueError("No buses in the circuit to compute Ybus.")
 
-        self.ybus_powerflow = np.zeros((N, N), dtype=complex)  # Initialize as complex numbers
+        def assemble():
+            from_idx, to_idx, branch_yprim, gen_idx, gen_y = self.stack_branch_admittances()
+            ybus_list = assemble_sequence_ybus(N, from_idx, to_idx, branch_yprim, gen_idx, gen_y)
+            return dict(zip(SEQUENCES, ybus_list))
 
-        # Bus names to indices for Ybus
-        bus_indices = {bus_name: idx for idx, bus_name in enumerate(self.buses.keys())}
+        self.ybus_sparse = self._cached('ybus_sparse', None, assemble)
+        return self.ybus_sparse
 
-        # Retrieve info from transformer
-        for transformer in self.transformer.values():
-            bus1, bus2 = transformer.bus1.name, transformer.bus2.name
-            idx1, idx2 = bus_indices[bus1], bus_indices[bus2]
-            Yprim = transformer.get_yprim(sequence)  # Get primitive admittance matrix
-
-            # Add self-admittance (diagonal elements)
-            self.ybus_powerflow[idx1, idx1] += Yprim[0, 0]
-            self.ybus_powerflow[idx2, idx2] += Yprim[1, 1]
-
-            # Add mutual admittance (off-diagonal elements, negative values)
-            self.ybus_powerflow[idx1, idx2] += Yprim[0, 1]
-            self.ybus_powerflow[idx2, idx1] += Yprim[1, 0]
-        # Retrieve info from transmission line
-        for tline in self.transmission_lines.values():
-            bus1, bus2 = tline.bus1.name, tline.bus2.name
-            idx1, idx2 = bus_indices[bus1], bus_indices[bus2]
-            Yprim = tline.get_yprim(sequence)  # Get primitive admittance matrix
-
-            # Add self-admittance (diagonal elements)
-            self.ybus_powerflow[idx1, idx1] += Yprim[0, 0]
-            self.ybus_powerflow[idx2, idx2] += Yprim[1, 1]
-
-            # Add mutual admittance (off-diagonal elements, negative values)
-            self.ybus_powerflow[idx1, idx2] += Yprim[0, 1]
-            self.ybus_powerflow[idx2, idx1] += Yprim[1, 0]
-
-        # Numerical stability
-        if np.any(np.diag(self.ybus_powerflow) == 0):
-            raise ValueError("Singular Ybus detected. Ensure all buses have self-admittance.")
-
-        # Add generator subtransient admittance (for power flow study)
-        for generator in self.generators.values():
-            bus_name = generator.bus.name
-            idx = bus_indices[bus_name]
-            if generator.x1_pu > 0:
-                y_gen = 1 / (1j * generator.x1_pu)  # Subtransient admittance
-                self.ybus_powerflow[idx, idx] += y_gen
-
-    def calc_ybus_faultstudy(self, sequence: str = 'positive'):
-        # Ybus matrix by summing the primitive admittance matrices.
+    def get_ybus_sparse(self, sequence: str = 'positive'):
+        # Returns the sparse Ybus for a sequence network, assembling all sequences if needed
+        if sequence not in SEQUENCES:
+            raise ValueError("Unknown sequence. Choose from 'positive', 'negative', 'zero'.")
+        ybus = self.calc_ybus_sparse()[sequence]
+        check_ybus_diagonal(ybus, self.find_islands().energized_buses)
+        return ybus
 
-        # Initialize Ybus matrix (N x N zero matrix)
+    def calc_ybus_powerflow(self, sequence: str = 'positive'):
+        # Dense Ybus view for power flow; generators always enter through their positive sequence reactance
         N = len(self.buses)
         if N == 0:
             raise ValueError("No buses in the circuit to compute Ybus.")
+        if sequence not in SEQUENCES:
+            raise ValueError("Unknown sequence. Choose from 'positive', 'negative', 'zero'.")
 
-        self.ybus_faultstudy = np.zeros((N, N), dtype=complex)  # Initialize as complex numbers
+        def assemble():
+            if sequence == 'positive':
+                ybus = self.calc_ybus_sparse()['positive']
+            else:
+                s = SEQUENCES.index(sequence)
+                from_idx, to_idx, branch_yprim, gen_idx, gen_y = self.stack_branch_admittances()
+                ybus = assemble_sequence_ybus(N, from_idx, to_idx, branch_yprim[s:s + 1], gen_idx, gen_y[0:1])[0]
+            # Numerical stability, de-energized islands are never solved
+            check_ybus_diagonal(ybus, self.find_islands().energized_buses)
+            return ybus.toarray()
 
-        # Bus names to indices for Ybus
-        bus_indices = {bus_name: idx for idx, bus_name in enumerate(self.buses.keys())}
+        self.ybus_powerflow = self._cached('ybus_powerflow', sequence, assemble)
 
-        # Retrieve info from transformer and transmission line
-        for transformer in self.transformer.values():
-            bus1, bus2 = transformer.bus1.name, transformer.bus2.name
-            idx1, idx2 = bus_indices[bus1], bus_indices[bus2]
-            Yprim = transformer.get_yprim(sequence)  # Get primitive admittance matrix
+    def _dense_ybus(self, sequence):
+        return self._cached('ybus_dense', sequence, lambda: self.get_ybus_sparse(sequence).toarray())
 
-            # Add self-admittance (diagonal elements)
-            self.ybus_faultstudy[idx1, idx1] += Yprim[0, 0]
-            self.ybus_faultstudy[idx2, idx2] += Yprim[1, 1]
+    def calc_ybus_faultstudy(self, sequence: str = 'positive'):
+        # Dense Ybus view of the sparse sequence network, opt-in for small cases and table printing
+        self.ybus_faultstudy = self._dense_ybus(sequence)
+        self.ybus_faultstudy_sequence = sequence
+        return self.ybus_faultstudy
 
-            # Add mutual admittance (off-diagonal elements, negative values)
-            self.ybus_faultstudy[idx1, idx2] += Yprim[0, 1]
-            self.ybus_faultstudy[idx2, idx1] += Yprim[1, 0]
+    def calc_all_sequence_ybus(self, dense: bool = True):
+        """
+        Calculates and stores Ybus matrices for positive, negative, and zero sequence networks.
+        All three are assembled in a single sparse pass; dense copies are stored only if requested.
+        """
+        for seq in SEQUENCES:
+            self.ybus_sequences[seq] = self._dense_ybus(seq) if dense else self.get_ybus_sparse(seq)
 
-        for tline in self.transmission_lines.values():
-            bus1, bus2 = tline.bus1.name, tline.bus2.name
-            idx1, idx2 = bus_indices[bus1], bus_indices[bus2]
-            Yprim = tline.get_yprim(sequence)  # Get primitive admittance matrix
+    def _branch_yprim(self, branch):
+        # (3, 2, 2) Yprim of one branch per sequence, lines under the circuit's line model
+        if isinstance(branch, TransmissionLine):
+            return LineConstants.from_lines([branch]).yprim_pu(self.line_model)[:, 0]
+        return np.stack([branch.get_yprim(sequence) for sequence in SEQUENCES])
 
-            # Add self-admittance (diagonal elements)
-            self.ybus_faultstudy[idx1, idx1] += Yprim[0, 0]
-            self.ybus_faultstudy[idx2, idx2] += Yprim[1, 1]
+    def set_line_model(self, model: str):
+        """
+        Choose how transmission lines enter Ybus: 'series' (series impedance only, the default),
+        'nominal_pi' (half the line charging at each end) or 'long_line' (exact equivalent pi from
+        the propagation constant). Every cached matrix is rebuilt on next use.
+        """
+        if model not in LINE_MODELS:
+            raise ValueError(f"Unknown line model {model}. Choose from {', '.join(LINE_MODELS)}.")
+        if model != self.line_model:
+            self.line_model = model
+            self.mark_modified('branch')
 
-            # Add mutual admittance (off-diagonal elements, negative values)
-            self.ybus_faultstudy[idx1, idx2] += Yprim[0, 1]
-            self.ybus_faultstudy[idx2, idx1] += Yprim[1, 0]
+    def set_bus_ordering(self, ordering: str):
+        """
+        Choose the fill-reducing bus ordering ('natural', 'rcm', 'mmd', 'colamd') for sparse
+        factorizations. Buses keep their names and external numbering; only the internal
+        elimination order changes, so cached factorizations are dropped.
+        """
+        if ordering not in ORDERINGS:
+            raise ValueError(f"Unknown ordering {ordering}. Choose from {', '.join(ORDERINGS)}.")
+        self.bus_ordering = ordering
+        for key in [key for key in self._cache if key[0] in ('lu', 'island_lu')]:
+            del self._cache[key]
 
-        for generator in self.generators.values():
-            bus_name = generator.bus.name
-            idx = bus_indices[bus_name]
+    def get_lu(self, sequence: str = 'positive'):
+        """
+        Return the cached sparse LU factorization of a sequence Ybus, factorizing only when a bus,
+        branch or generator changed. Branch switching keeps it current through low-rank updates.
+        The factorization uses the circuit's fill-reducing bus ordering internally.
+        """
+        return self._cached('lu', sequence, lambda: OrderedLU(self.get_ybus_sparse(sequence), self.bus_ordering))
 
-            if sequence == 'positive':
-                x = generator.x1_pu
-                if x > 0:
-                    y_gen = 1 / (1j * x)
-                    self.ybus_faultstudy[idx, idx] += y_gen
-
-            elif sequence == 'negative':
-                x = generator.x2_pu
-                if x > 0:
-                    y_gen = 1 / (1j * x)
-                    self.ybus_faultstudy[idx, idx] += y_gen
-
-            elif sequence == 'zero':
-                if generator.grounded:
-                    z0 = generator.get_subtransient_reactance('zero')
-                    y_gen = 1 / (z0)
-                    self.ybus_faultstudy[idx, idx] += y_gen
-
-            # Numerical stability
-        if np.any(np.diag(self.ybus_faultstudy) == 0):
-            raise ValueError("Singular Ybus detected. Ensure all buses have self-admittance.")
-        return self.ybus_faultstudy
+    def find_islands(self):
+        """
+        Run the topology processor over the transformer and transmission line dictionaries.
+        Returns a Topology with one Island per connected component, each with its slack bus
+        (promoted from the largest PV generator where needed) or marked de-energized.
+        The result is cached until a bus, branch or generator changes.
+        """
+        return self._cached('topology', None, lambda: Topology.from_circuit(self))
+
+    def get_island_lu(self, sequence: str, island_number: int):
+        # Sparse LU of one island's block of the sequence Ybus, in the island's local bus order
+        def factorize():
+            buses = self.find_islands().islands[island_number].buses
+            ybus = self.get_ybus_sparse(sequence)
+            return OrderedLU(ybus[buses][:, buses], self.bus_ordering)
+
+        return self._cached('island_lu', (sequence, island_number), factorize)
 
-    def calc_all_sequence_ybus(self):
+    def get_zbus(self, sequence: str = 'positive'):
+        # Returns the cached dense Zbus (inverse of the sequence Ybus)
+        return self._cached('zbus', sequence, lambda: np.linalg.inv(self._dense_ybus(sequence)))
+
+    def get_zbus_column(self, sequence: str, bus_idx: int):
         """
-        Calculates and stores Ybus matrices for positive, negative, and zero sequence networks.
+        Return one Zbus column from the cached LU factorization without forming the full inverse.
+        Ybus is symmetric, so the column also equals the Zbus row of that bus.
+
+        When the network is split into islands only the island of bus_idx is factorized; buses in
+        other islands are not coupled to it and get zero entries.
         """
-        sequences = ['positive', 'negative', 'zero']
-        for seq in sequences:
-            self.ybus_sequences[seq] = self.calc_ybus_faultstudy(seq)
+        topology = self.find_islands()
+        island = topology.island_of(bus_idx)
+        if not island.energized:
+            raise ValueError(f"{island.bus_names[island.local_index(bus_idx)]} is in a de-energized island.")
+
+        if topology.num_islands == 1:
+            unit = np.zeros(len(self.buses), dtype=complex)
+            unit[bus_idx] = 1
+            return self.get_lu(sequence).solve(unit)
+
+        unit = np.zeros(len(island.buses), dtype=complex)
+        unit[island.local_index(bus_idx)] = 1
+        column = np.zeros(len(self.buses), dtype=complex)
+        column[island.buses] = self.get_island_lu(sequence, island.number).solve(unit)
+        return column
 
     def calc_zbus(self):
         #calculate z bus
-        self.zbus = np.linalg.inv(self.ybus_faultstudy)
+        if self.ybus_faultstudy is None:
+            raise ValueError("Ybus has not been computed. Run calc_ybus_faultstudy() first.")
+        self.zbus = self.get_zbus(self.ybus_faultstudy_sequence)
 
     def calc_fault_current(self, Zbus, faulted_bus_num: int):
         """
@@ -229,6 +734,20 @@ class Circuit:
     def print_fault_bus_voltage(self, observed_bus_num: int):
         print(f"Voltage at Bus {observed_bus_num} during fault is {self.fault_bus_v:.4f} pu")
 
+    def _print_bus_outside_fault(self, topology, faulted_island, bus_idx: int):
+        """
+        Print a bus that is not in the faulted bus's island and return True; return False for a bus in it.
+        Zbus columns are zero outside the faulted island, so Vf - Z If would show such buses at 1.0 pu.
+        """
+        island = topology.island_of(bus_idx)
+        if island is faulted_island:
+            return False
+        if island.energized:
+            print(f"Bus {bus_idx + 1}: island {island.number}, not connected to the faulted bus (skipped)")
+        else:
+            print(f"Bus {bus_idx + 1}: de-energized, Va = Vb = Vc = 0 pu")
+        return True
+
     def get_zbus_with_generators(self):
         if self.zbus is None:
             raise ValueError("Zbus not yet calculated. Run calc_zbus() first.")
@@ -244,10 +763,9 @@ class Circuit:
         idx = faulted_bus_idx - 1  # Convert to 0-based index
         Zf = fault_impedance
 
-        # Step 1: Get positive-sequence Zbus matrix
-        self.calc_ybus_faultstudy('positive')
-        Z1 = np.linalg.inv(self.ybus_faultstudy)
-        Z1kk = Z1[idx, idx]
+        # Step 1: Get positive-sequence Zbus column of the faulted bus (cached LU, no full inverse)
+        Z1 = self.get_zbus_column('positive', idx)
+        Z1kk = Z1[idx]
 
         Vf = self.V_f  # Pre-fault voltage, assumed 1.0 pu
 
@@ -273,10 +791,14 @@ class Circuit:
         print(f"  Phase B: {mag_b:.3f} ∠ {ang_b:.2f}° pu")
         print(f"  Phase C: {mag_c:.3f} ∠ {ang_c:.2f}° pu")
 
-        # Step 3: Calculate fault voltages at all buses
+        # Step 3: Calculate fault voltages at all buses of the faulted island
+        topology = self.find_islands()
+        faulted_island = topology.island_of(idx)
         print("\nBus Voltages During Fault:")
         for i in range(len(self.buses)):
-            V1 = Vf - Z1[idx, i] * If1
+            if self._print_bus_outside_fault(topology, faulted_island, i):
+                continue
+            V1 = Vf - Z1[i] * If1
             V2 = 0
             V0 = 0
             va, vb, vc = seq_to_abc(V0, V1, V2)
@@ -350,20 +872,15 @@ class Circuit:
             Zf = fault_impedance  # Fault impedance in pu
             idx = faulted_bus_idx - 1  # Convert to 0-based index
 
-            # Step 1: Calculate positive-, negative-, and zero-sequence Zbus matrices
-            ybus_positive = self.calc_ybus_faultstudy('positive')
-            Z1 = np.linalg.inv(ybus_positive)
-
-            ybus_negative = self.calc_ybus_faultstudy('negative')
-            Z2 = np.linalg.inv(ybus_negative)
-
-            ybus_zero = self.calc_ybus_faultstudy('zero')
-            Z0 = np.linalg.inv(ybus_zero)
+            # Step 1: Positive-, negative-, and zero-sequence Zbus columns of the faulted bus (cached LU)
+            Z1 = self.get_zbus_column('positive', idx)
+            Z2 = self.get_zbus_column('negative', idx)
+            Z0 = self.get_zbus_column('zero', idx)
 
             # Extract diagonal elements at faulted bus
-            Z1kk = Z1[idx, idx]
-            Z2kk = Z2[idx, idx]
-            Z0kk = Z0[idx, idx]
+            Z1kk = Z1[idx]
+            Z2kk = Z2[idx]
+            Z0kk = Z0[idx]
 
             Vf = self.V_f  # Prefault voltage (assumed 1.0 pu)
 
@@ -491,11 +1008,15 @@ class Circuit:
                 #print(f"Pre-Fault Voltages at Bus {faulted_bus_idx}: A = {Va:.4f}, B = {Vb:.4f}, C = {Vc:.4f}")
 
                 # Step 3: Calculate and print post-fault voltages and sequence voltages at each bus
+                topology = self.find_islands()
+                faulted_island = topology.island_of(idx)
                 print("\nBus Voltages During Fault:")
                 for i in range(len(self.buses)):
-                    V1 = Vf - Z1[idx, i] * If1  # Positive-sequence voltage
-                    V2 = -Z2[idx, i] * If2  # Negative-sequence voltage
-                    V0 = -Z0[idx, i] * If0  # Zero-sequence voltage
+                    if self._print_bus_outside_fault(topology, faulted_island, i):
+                        continue
+                    V1 = Vf - Z1[i] * If1  # Positive-sequence voltage
+                    V2 = -Z2[i] * If2  # Negative-sequence voltage
+                    V0 = -Z0[i] * If0  # Zero-sequence voltage
                     va, vb, vc = seq_to_abc(V0, V1, V2)  # Convert to phase voltages
 
                     mag_a, ang_a = abs(va), np.angle(va, deg=True)
@@ -0,0 +1,178 @@
+import numpy as np
+from branch_flows import branch_incidence, branch_admittance
+from ordering import OrderedLU
+from ybus_assembly import SEQUENCES, assemble_sequence_ybus
+
+# Integer bus type codes used by the compiled model
+SLACK, PV, PQ = 0, 1, 2
+BUS_TYPE_CODES = {"Slack Bus": SLACK, "PV Bus": PV, "PQ Bus": PQ}
+
+
+class CompiledNetwork:
+    """
+    The CompiledNetwork class is a frozen struct-of-arrays snapshot of a Circuit.
+    Solvers read bus types, index sets, branch connectivity, admittances and injections
+    from NumPy arrays instead of walking Bus and branch objects on every iteration.
+    """
+
+    def __init__(self, bus_names, base_kv, bus_type, vpu, delta, branch_names, branch_from, branch_to,
+                 branch_yprim, branch_in_service, gen_bus, gen_y, sbus, s_base: float = 100):
+        """
+        :param bus_names: list of bus names in Ybus order
+        :param base_kv: (N,) nominal voltage of each bus
+        :param bus_type: (N,) integer bus type codes (SLACK, PV, PQ)
+        :param vpu: (N,) voltage magnitudes in pu at compile time
+        :param delta: (N,) voltage angles in degrees at compile time
+        :param branch_names: list of transformer then transmission line names
+        :param branch_from: (B,) from-bus index of each branch
+        :param branch_to: (B,) to-bus index of each branch
+        :param branch_yprim: (3, B, 2, 2) branch Yprim per sequence (zero when out of service)
+        :param branch_in_service: (B,) branch switching status
+        :param gen_bus: (G,) bus index of each generator
+        :param gen_y: (3, G) generator subtransient admittance per sequence
+        :param sbus: (N,) complex net power injection in pu (generation minus load)
+        :param s_base: system base MVA used for sbus
+        """
+        self.bus_names = list(bus_names)
+        self.bus_index = {name: idx for idx, name in enumerate(self.bus_names)}
+        self.num_buses = len(self.bus_names)
+        self.base_kv = self._freeze(base_kv, float)
+        self.bus_type = self._freeze(bus_type, np.int8)
+        self.vpu = self._freeze(vpu, float)
+        self.delta = self._freeze(delta, float)
+
+        # Precomputed index sets, in Ybus order
+        self.slack = self._freeze(np.flatnonzero(self.bus_type == SLACK), np.int64)
+        self.pv = self._freeze(np.flatnonzero(self.bus_type == PV), np.int64)
+        self.pq = self._freeze(np.flatnonzero(self.bus_type == PQ), np.int64)
+        self.pv_pq = self._freeze(np.flatnonzero(self.bus_type != SLACK), np.int64)
+
+        self.branch_names = list(branch_names)
+        self.num_branches = len(self.branch_names)
+        self.branch_from = self._freeze(branch_from, np.int64)
+        self.branch_to = self._freeze(branch_to, np.int64)
+        self.branch_yprim = self._freeze(branch_yprim, complex)
+        self.branch_in_service = self._freeze(branch_in_service, bool)
+
+        self.gen_bus = self._freeze(gen_bus, np.int64)
+        self.gen_y = self._freeze(gen_y, complex)
+
+        self.sbus = self._freeze(sbus, complex)
+        self.s_base = s_base
+
+        self._ybus = None
+        self._factorizations = {}
+        self._incidence = None
+        self._branch_admittance = {}
+
+    @staticmethod
+    def _freeze(values, dtype):
+        array = np.array(values, dtype=dtype)
+        array.setflags(write=False)
+        return array
+
+    @classmethod
+    def from_circuit(cls, circuit, s_base: float = 100):
+        """
+        Snapshot a Circuit into arrays. Bus order follows circuit.buses, branch order lists
+        transformers first, then transmission lines, as in Circuit.stack_branch_admittances.
+        """
+        buses = list(circuit.buses.values())
+        codes = []
+        for bus in buses:
+            if bus.bus_type not in BUS_TYPE_CODES:
+                raise ValueError(f"Bus {bus.name} has invalid bus type {bus.bus_type}.")
+            codes.append(BUS_TYPE_CODES[bus.bus_type])
+
+        from_idx, to_idx, branch_yprim, gen_idx, gen_y = circuit.stack_branch_admittances()
+        branches = list(circuit.transformer.values()) + list(circuit.transmission_lines.values())
+
+        # Net injections: generator setpoints minus loads, in pu on the system base
+        sbus = np.zeros(len(buses), dtype=complex)
+        generators = list(circuit.generators.values())
+        loads = list(circuit.loads.values())
+        load_idx = np.fromiter((circuit.bus_indices[load.bus.name] for load in loads), dtype=np.int64, count=len(loads))
+        np.add.at(sbus, load_idx, [-complex(load.real_power, load.reactive_power) / s_base for load in loads])
+        np.add.at(sbus, gen_idx, [gen.mw_setpoint / s_base for gen in generators])
+
+        return cls(
+            bus_names=[bus.name for bus in buses],
+            base_kv=[bus.base_kv for bus in buses],
+            bus_type=codes,
+            vpu=[bus.vpu for bus in buses],
+            delta=[bus.delta for bus in buses],
+            branch_names=[branch.name for branch in branches],
+            branch_from=from_idx,
+            branch_to=to_idx,
+            branch_yprim=branch_yprim,
+            branch_in_service=[branch.in_service for branch in branches],
+            gen_bus=gen_idx,
+            gen_y=gen_y,
+            sbus=sbus,
+            s_base=s_base,
+        )
+
+    def get_ybus(self, sequence: str = 'positive'):
+        # Sparse Ybus of the snapshot, assembled for all sequences on first use
+        if self._ybus is None:
+            ybus_list = assemble_sequence_ybus(self.num_buses, self.branch_from, self.branch_to,
+                                               self.branch_yprim, self.gen_bus, self.gen_y)
+            self._ybus = dict(zip(SEQUENCES, ybus_list))
+        return self._ybus[sequence]
+
+    def get_branch_incidence(self):
+        # Branch-to-bus incidence matrices Cf, Ct (B x N), built on first use
+        if self._incidence is None:
+            self._incidence = branch_incidence(self.num_buses, self.branch_from, self.branch_to)
+        return self._incidence
+
+    def get_branch_admittance(self, sequence: str = 'positive'):
+        """
+        Branch admittance matrices Yf, Yt (B x N) of a sequence network, from the stacked branch Yprim.
+        Out-of-service branches have zero rows.
+        """
+        if sequence not in SEQUENCES:
+            raise ValueError("Unknown sequence. Choose from 'positive', 'negative', 'zero'.")
+        if sequence not in self._branch_admittance:
+            Cf, Ct = self.get_branch_incidence()
+            self._branch_admittance[sequence] = branch_admittance(Cf, Ct, self.branch_yprim[SEQUENCES.index(sequence)])
+        return self._branch_admittance[sequence]
+
+    def factorize(self, sequence: str = 'positive', ordering: str = 'mmd'):
+        """
+        Sparse LU of the snapshot Ybus under a fill-reducing bus ordering, computed once per
+        (sequence, ordering). Solves take and return vectors in the snapshot's bus order.
+        """
+        key = (sequence, ordering)
+        if key not in self._factorizations:
+            self._factorizations[key] = OrderedLU(self.get_ybus(sequence), ordering)
+        return self._factorizations[key]
+
+    def __str__(self):
+        return (f"CompiledNetwork(buses={self.num_buses}, branches={self.num_branches}, "
+                f"slack={len(self.slack)}, pv={len(self.pv)}, pq={len(self.pq)})")
+
+
+if __name__ == '__main__':
+    from circuit import Circuit
+    from conductor import Conductor
+    from bundle import Bundle
+    from geometry import Geometry
+
+    circuit1 = Circuit("Circuit")
+    circuit1.add_bus("Bus 1", 20, "Slack Bus")
+    circuit1.add_bus("Bus 2", 230, "PQ Bus")
+    circuit1.add_bus("Bus 3", 18, "PV Bus")
+    circuit1.add_transformer("T1", "Bus 1", "Bus 2", 125, 8.5, 10, 100, connection_type="Delta-Y", zg1=None, zg2=0.0019)
+    conductor1 = Conductor("Partridge", 0.642, 0.0217, 0.385, 460)
+    bundle1 = Bundle("Bundle A", 2, 1.5, conductor1)
+    geometry1 = Geometry("Geometry 1", 0, 0, 19.5, 0, 39, 0)
+    circuit1.add_transmission_line("Line 1", "Bus 2", "Bus 3", bundle1, geometry1, 10)
+    circuit1.add_load("Load 2", "Bus 2", 110, 50)
+    circuit1.add_generator("G1", "Bus 1", 1.0, 100, 0.12, 0.14, 0.05, 125, grounded=True, ground_r_pu=0)
+
+    network = circuit1.compile()
+    print(network)
+    print(f"Bus types: {network.bus_type}, PQ: {network.pq}, PV: {network.pv}, Slack: {network.slack}")
+    print(f"Branches: {network.branch_names}, from {network.branch_from} to {network.branch_to}")
+    print(f"Sbus [pu]: {network.sbus}")
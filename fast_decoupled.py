@@ -0,0 +1,95 @@
+import time
+import numpy as np
+from scipy import sparse
+from ordering import OrderedLU
+from ybus_assembly import series_reactance
+
+# Fast-decoupled load flow variants
+#   XB: B' from series reactances only (R neglected), B'' from the full series admittances
+#   BX: B' from the full series admittances, B'' from series reactances only
+# B' never includes shunts; B'' includes every shunt element of Ybus (generator admittances, line charging).
+FAST_DECOUPLED_VARIANTS = ('XB', 'BX')
+
+
+def decoupled_b_matrices(ybus, variant: str = 'XB'):
+    """
+    Build the constant B' and B'' matrices of the fast-decoupled load flow from a power flow Ybus.
+
+    Series admittances are recovered from the off-diagonal entries (y_ij = -Y_ij) and shunt
+    admittances from the row sums of Ybus, so the matrices follow whatever Ybus holds.
+
+    :param ybus: (N, N) sparse or dense Ybus
+    :param variant: 'XB' or 'BX'
+    :return: B_p, B_pp sparse CSR (N, N) matrices, B = -Im(Y) convention
+    """
+    if variant not in FAST_DECOUPLED_VARIANTS:
+        raise ValueError(f"Unknown fast-decoupled variant {variant}. Choose from {', '.join(FAST_DECOUPLED_VARIANTS)}.")
+    ybus = sparse.coo_matrix(ybus)
+    n = ybus.shape[0]
+    off = ybus.row != ybus.col
+    rows, cols = ybus.row[off], ybus.col[off]
+    y_series = -ybus.data[off]
+
+    # Series susceptance with resistance kept, and with resistance neglected (b = -1 / x)
+    b_full = y_series.imag
+    x = series_reactance(y_series)
+    b_reactance = np.zeros(len(y_series))
+    b_reactance[x != 0] = -1 / x[x != 0]
+
+    # Shunt susceptance at every bus, what is left of Ybus once the series elements are removed
+    b_shunt = np.asarray(ybus.sum(axis=1)).ravel().imag
+
+    def assemble(b_series, shunt):
+        diagonal = -np.bincount(rows, weights=b_series, minlength=n) - shunt
+        return sparse.coo_matrix((np.concatenate((b_series, diagonal)),
+                                  (np.concatenate((rows, np.arange(n))), np.concatenate((cols, np.arange(n))))),
+                                 shape=(n, n)).tocsr()
+
+    b_p_series, b_pp_series = (b_reactance, b_full) if variant == 'XB' else (b_full, b_reactance)
+    return assemble(b_p_series, np.zeros(n)), assemble(b_pp_series, b_shunt)
+
+
+class FastDecoupledFactors:
+    """
+    The FastDecoupledFactors class holds the sparse LU factors of the reduced B' (PV and PQ
+    angle rows) and B'' (PQ magnitude rows). They are computed once and reused by every
+    fast-decoupled iteration and every solve on the same network and bus types.
+    """
+
+    def __init__(self, ybus, pv_pq_indices, pq_indices, variant: str = 'XB', ordering: str = 'mmd'):
+        """
+        :param ybus: power flow Ybus, sparse or dense
+        :param pv_pq_indices: buses whose angle is unknown
+        :param pq_indices: buses whose magnitude is unknown
+        :param variant: 'XB' or 'BX'
+        :param ordering: fill-reducing ordering for both factorizations
+        """
+        start = time.perf_counter()
+        b_p, b_pp = decoupled_b_matrices(ybus, variant)
+        pv_pq_indices = np.asarray(pv_pq_indices, dtype=np.int64)
+        pq_indices = np.asarray(pq_indices, dtype=np.int64)
+        self.variant = variant
+        self.lu_p = OrderedLU(b_p[pv_pq_indices][:, pv_pq_indices], ordering)
+        self.lu_pp = OrderedLU(b_pp[pq_indices][:, pq_indices], ordering) if len(pq_indices) else None
+        self.factor_time = time.perf_counter() - start
+
+    def solve_angles(self, delta_P_over_V):
+        # B' Δδ = ΔP / |V|, Δδ in radians
+        return self.lu_p.solve(delta_P_over_V)
+
+    def solve_magnitudes(self, delta_Q_over_V):
+        # B'' Δ|V| = ΔQ / |V|
+        if self.lu_pp is None:
+            return np.zeros(0)
+        return self.lu_pp.solve(delta_Q_over_V)
+
+
+if __name__ == '__main__':
+    from sample_networks import build_seven_bus_circuit
+
+    circuit1 = build_seven_bus_circuit()
+    ybus = circuit1.get_ybus_sparse()
+    for variant in FAST_DECOUPLED_VARIANTS:
+        b_p, b_pp = decoupled_b_matrices(ybus, variant)
+        np.set_printoptions(precision=3, suppress=True, linewidth=120)
+        print(f"{variant} B':\n{b_p.toarray()}\n{variant} B'':\n{b_pp.toarray()}")
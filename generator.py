@@ -6,6 +6,10 @@ class Generator:
     The generator class models power injections.
     It includes base conversion to system base MVA.
     """
+
+    __slots__ = ('name', 'bus', 'voltage_setpoint', 'mw_setpoint', 'base_mva', 'system_base_mva', 'grounded',
+                 'x1_pu', 'x2_pu', 'x0_pu', 'x1pp_pu', 'x2pp_pu', 'x0pp_pu', 'grounding_z_pu', '_yprim')
+
     def __init__(self, name: str, bus: Bus, voltage_setpoint: float, mw_setpoint: float,
                  x1_pu: float, x2_pu: float, x0_pu: float, base_mva: float,
                  x1pp_pu: float = None, x2pp_pu: float = None, x0pp_pu: float = None,
@@ -36,6 +40,9 @@ class Generator:
         # Grounding impedance p.u.
         self.grounding_z_pu = complex(grounding_r_pu, grounding_x_pu) * 1.5
 
+        # Per-sequence Yprim, computed on first request
+        self._yprim = None
+
     def get_subtransient_reactance(self, sequence: str) -> complex:
         """
         Returns subtransient reactance for the given sequence.
@@ -62,4 +69,14 @@ class Generator:
             raise ZeroDivisionError(f"Reactance for {sequence} sequence is zero for generator {self.name}.")
 
         y = 1 / (x)
-        return np.array([[y, -y], [-y, y]])
\ No newline at end of file
+        return np.array([[y, -y], [-y, y]])
+
+    def get_yprim(self, sequence='positive'):
+        """
+        Returns the cached Yprim for the given sequence, computing it on first use.
+        """
+        if self._yprim is None:
+            self._yprim = {}
+        if sequence not in self._yprim:
+            self._yprim[sequence] = self.calc_yprim(sequence)
+        return self._yprim[sequence]
\ No newline at end of file
@@ -1,6 +1,97 @@
 import numpy as np
+from scipy import sparse
 from tabulate import tabulate
 
+
+def calc_power_derivatives(ybus, vpu, delta):
+    """
+    Derivatives of the bus power injections S = V * conj(Ybus V) in matrix form.
+
+    dS/dδ = j diag(V) conj(diag(I) - Ybus diag(V))
+    dS/d|V| = diag(V) conj(Ybus diag(V / |V|)) + conj(diag(I)) diag(V / |V|)
+
+    Entries are evaluated on the stored pattern of Ybus plus the diagonal, keeping explicit
+    zeros, so the sparsity pattern only changes with the Ybus pattern.
+
+    :param ybus: (N, N) sparse or dense Ybus
+    :param vpu: (N,) voltage magnitudes in pu
+    :param delta: (N,) voltage angles in degrees (derivatives are per radian)
+    :return: dS_ddelta, dS_dvpu as sparse CSR matrices
+    """
+    ybus = sparse.coo_matrix(ybus)
+    n = ybus.shape[0]
+    vpu = np.asarray(vpu, dtype=float)
+    V = vpu * np.exp(1j * np.radians(np.asarray(delta, dtype=float)))
+    V_norm = V / vpu
+    I = ybus @ V
+    rows, cols = ybus.row, ybus.col
+    diagonal = np.arange(n)
+
+    # Ybus-pattern terms followed by the diagonal terms; duplicates are summed by tocsr
+    pattern = (np.concatenate((rows, diagonal)), np.concatenate((cols, diagonal)))
+    dS_ddelta = np.concatenate((-1j * V[rows] * np.conj(ybus.data * V[cols]), 1j * V * np.conj(I)))
+    dS_dvpu = np.concatenate((V[rows] * np.conj(ybus.data * V_norm[cols]), np.conj(I) * V_norm))
+    return (sparse.coo_matrix((dS_ddelta, pattern), shape=(n, n)).tocsr(),
+            sparse.coo_matrix((dS_dvpu, pattern), shape=(n, n)).tocsr())
+
+
+def calc_jacobian_sparse(ybus, vpu, delta, pv_pq_indices, pq_indices):
+    """
+    Reduced power flow Jacobian [dP/dδ dP/dV; dQ/dδ dQ/dV] for the PV/PQ unknowns,
+    assembled directly as a sparse matrix.
+
+    :param pv_pq_indices: buses whose angle is unknown (P rows, δ columns)
+    :param pq_indices: buses whose magnitude is unknown (Q rows, |V| columns)
+    :return: sparse CSR matrix of size (npvpq + npq) square
+    """
+    dS_ddelta, dS_dvpu = calc_power_derivatives(ybus, vpu, delta)
+    pv_pq_indices = np.asarray(pv_pq_indices, dtype=np.int64)
+    pq_indices = np.asarray(pq_indices, dtype=np.int64)
+
+    # Row slices first, then columns, so only the kept rows are touched
+    dS_ddelta_p, dS_dvpu_p = dS_ddelta[pv_pq_indices], dS_dvpu[pv_pq_indices]
+    dS_ddelta_q, dS_dvpu_q = dS_ddelta[pq_indices], dS_dvpu[pq_indices]
+    J11 = dS_ddelta_p[:, pv_pq_indices].real
+    J12 = dS_dvpu_p[:, pq_indices].real
+    J21 = dS_ddelta_q[:, pv_pq_indices].imag
+    J22 = dS_dvpu_q[:, pq_indices].imag
+    return sparse.bmat([[J11, J12], [J21, J22]], format='csr')
+
+
+class JacobianReusePolicy:
+    """
+    When Newton-Raphson rebuilds and refactorizes the Jacobian. Between refactorizations the
+    last factorization is reused (chord or "dishonest" Newton), trading more iterations for much
+    cheaper ones. The default refactorizes every iteration, which is full Newton-Raphson.
+    """
+
+    def __init__(self, refactor_every: int = 1, max_ratio: float = None):
+        """
+        :param refactor_every: refactorize at least every k iterations
+        :param max_ratio: also refactorize when the mismatch norm shrinks by less than this
+                          factor per iteration, ||F_k|| / ||F_k-1|| > max_ratio (None to disable)
+        """
+        if refactor_every < 1:
+            raise ValueError("refactor_every must be at least 1.")
+        self.refactor_every = refactor_every
+        self.max_ratio = max_ratio
+
+    def refactor(self, steps_since_factor, ratio):
+        """
+        :param steps_since_factor: Newton steps taken with the current factorization, None if there is none
+        :param ratio: mismatch norm ratio of the last step, None on the first iteration
+        :return: True to rebuild and refactorize the Jacobian now
+        """
+        if steps_since_factor is None or steps_since_factor >= self.refactor_every:
+            return True
+        return self.max_ratio is not None and ratio is not None and ratio > self.max_ratio
+
+    @property
+    def full_newton(self):
+        # Every step is solved with the Jacobian at the current iterate
+        return self.refactor_every == 1
+
+
 class Jacobian:
 
     def __init__(self, buses, ybus, angles, voltages):
@@ -9,7 +100,33 @@ class Jacobian:
         self.angles = angles
         self.voltages = voltages
 
-    def calc_jacobian(self):
+    def _index_sets(self, pq_pv_indices, pq_indices):
+        # Slack excluded from both rows/columns, PV excluded from Q rows and |V| columns
+        if pq_pv_indices is None:
+            pq_pv_indices = [i for i, bus in enumerate(self.buses) if bus.bus_type in ("PQ Bus", "PV Bus")]
+        if pq_indices is None:
+            pq_indices = [i for i, bus in enumerate(self.buses) if bus.bus_type == "PQ Bus"]
+        return pq_pv_indices, pq_indices
+
+    def calc_jacobian_sparse(self, pq_pv_indices=None, pq_indices=None):
+        """
+        Build the reduced Jacobian [dP/dδ dP/dV; dQ/dδ dQ/dV] for the PV/PQ unknowns as a sparse matrix.
+        Precomputed index arrays (e.g. from a CompiledNetwork) skip the bus type scan.
+        """
+        pq_pv_indices, pq_indices = self._index_sets(pq_pv_indices, pq_indices)
+        return calc_jacobian_sparse(self.ybus, self.voltages, self.angles, pq_pv_indices, pq_indices)
+
+    def calc_jacobian(self, pq_pv_indices=None, pq_indices=None):
+        """
+        Dense reduced Jacobian for small cases and print_jacobian, from the sparse builder.
+        """
+        return self.calc_jacobian_sparse(pq_pv_indices, pq_indices).toarray()
+
+    def calc_jacobian_reference(self, pq_pv_indices=None, pq_indices=None):
+        """
+        Build the reduced Jacobian [dP/dδ dP/dV; dQ/dδ dQ/dV] element by element.
+        Reference for calc_jacobian_sparse, checked against it in tests/test_numerics.py.
+        """
 
         n = len(self.buses)
         angles = [bus.delta for bus in self.buses]
@@ -65,8 +182,7 @@ class Jacobian:
                     J22[i, j] = V_i * (G_ij * np.sin(theta_ij) - B_ij * np.cos(theta_ij))
 
         # Filter buses: exclude slack from both rows/columns. PV exclude from Q rows/cols
-        pq_pv_indices = [i for i, bus in enumerate(self.buses) if bus.bus_type in ("PQ Bus", "PV Bus")]
-        pq_indices = [i for i, bus in enumerate(self.buses) if bus.bus_type == "PQ Bus"]
+        pq_pv_indices, pq_indices = self._index_sets(pq_pv_indices, pq_indices)
 
         J11_red = J11[np.ix_(pq_pv_indices, pq_pv_indices)]
         J12_red = J12[np.ix_(pq_pv_indices, pq_indices)]
@@ -81,6 +197,8 @@ class Jacobian:
         return J_full
 
     def print_jacobian(self, J):
+        if sparse.issparse(J):
+            J = J.toarray()
         num_rows, num_cols = J.shape
         row_labels = [f"Row {i + 1}" for i in range(num_rows)]
         col_labels = [f"Column {i + 1}" for i in range(num_cols)]
@@ -96,49 +214,9 @@ class Jacobian:
 
 if __name__ == '__main__':
     from solution import Solution
-    from circuit import Circuit
-    from conductor import Conductor
-    from bundle import Bundle
-    from geometry import Geometry
-
-
-    # Create circuit
-    circuit1 = Circuit("Circuit")
-
-    # Add Buses
-    circuit1.add_bus("Bus 1", 20, "Slack Bus")
-    circuit1.add_bus("Bus 2", 230, "PQ Bus")
-    circuit1.add_bus("Bus 3", 230, "PQ Bus")
-    circuit1.add_bus("Bus 4", 230, "PQ Bus")
-    circuit1.add_bus("Bus 5", 230, "PQ Bus")
-    circuit1.add_bus("Bus 6", 230, "PQ Bus")
-    circuit1.add_bus("Bus 7", 18, "PV Bus")
-
-    # Add Transformers
-    circuit1.add_transformer("T1", "Bus 1", "Bus 2", 125, 8.5, 10, 100)
-    circuit1.add_transformer("T2", "Bus 6", "Bus 7", 200, 10.5, 12, 100)
-
-    # Add Transmission Line Parameters
-    conductor1 = Conductor("Partridge", 0.642, 0.0217, 0.385, 460)
-    bundle1 = Bundle("Bundle A", 2, 1.5, conductor1)
-    geometry1 = Geometry("Geometry 1", 0, 0, 19.5, 0, 39, 0)
-
-    # Add Transmission Lines
-    circuit1.add_transmission_line("Line 1", "Bus 2", "Bus 4", bundle1, geometry1, 10)
-    circuit1.add_transmission_line("Line 2", "Bus 2", "Bus 3", bundle1, geometry1, 25)
-    circuit1.add_transmission_line("Line 3", "Bus 3", "Bus 5", bundle1, geometry1, 20)
-    circuit1.add_transmission_line("Line 4", "Bus 4", "Bus 6", bundle1, geometry1, 20)
-    circuit1.add_transmission_line("Line 5", "Bus 5", "Bus 6", bundle1, geometry1, 10)
-    circuit1.add_transmission_line("Line 6", "Bus 4", "Bus 5", bundle1, geometry1, 35)
-
-    # Add Load
-    circuit1.add_load("Load 3", "Bus 3", 110, 50)
-    circuit1.add_load("Load 4", "Bus 4", 100, 70)
-    circuit1.add_load("Load 5", "Bus 5", 100, 65)
-
-    # Add Generator
-    circuit1.add_generator("G1", "Bus 1", 1.0, 100)
-    circuit1.add_generator("G2", "Bus 7", 1.0, 200)
+    from sample_networks import build_seven_bus_circuit
+
+    circuit1 = build_seven_bus_circuit()
 
     # Create and initialize solution
     solution = Solution(buses=[], ybus=None, voltages=[])
@@ -155,10 +233,8 @@ if __name__ == '__main__':
     # Create and compute Jacobian
     jacobian = Jacobian(buses=buses, ybus=ybus, angles = angles, voltages = voltages)
     J = jacobian.calc_jacobian()
+    assert np.allclose(J, jacobian.calc_jacobian_reference())
 
     # Print Jacobian Matrix
-    # After calculating the Jacobian matrix
     np.set_printoptions(precision=4, suppress=True)
-    J = jacobian.calc_jacobian()
-
-    jacobian.print_jacobian(J)
\ No newline at end of file
+    jacobian.print_jacobian(jacobian.calc_jacobian_sparse())
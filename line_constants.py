@@ -0,0 +1,375 @@
+from collections import OrderedDict
+import numpy as np
+
+# Physical constants shared by every line-constant calculation
+MILES_TO_METERS = 1609.34 # Used for both series reactance and shunt admittance
+EPSILON_0 = 8.854 * 10 ** -12 # Permittivity of free space (F/m)
+ZERO_SEQUENCE_FACTOR = 2.5 # Zero sequence impedance estimated as 2.5 * (R + jX)
+
+# Line models for Ybus assembly
+#   series:     series impedance only (default, line charging neglected)
+#   nominal_pi: lumped series impedance with half the total shunt admittance at each end
+#   long_line:  exact equivalent pi of the distributed-parameter line (hyperbolic correction)
+LINE_MODELS = ('series', 'nominal_pi', 'long_line')
+
+
+def series_impedance_per_mile(r_per_mile, dsl, deq, f=60):
+    """
+    Series impedance of a transposed line per mile (ohm/mi). Works on scalars and arrays.
+
+    :param r_per_mile: bundle resistance, conductor resistance / number of conductors (ohm/mi)
+    :param dsl: bundle geometric mean radius for inductance (ft)
+    :param deq: geometric mean phase spacing (ft)
+    :param f: frequency (Hz)
+    """
+    x_per_mile = (2 * np.pi * f) * (2 * 10 ** (-7)) * np.log(deq / dsl) * MILES_TO_METERS
+    return r_per_mile + 1j * x_per_mile
+
+
+def shunt_admittance_per_mile(dsc, deq, f=60):
+    """
+    Shunt (charging) admittance of a transposed line per mile (S/mi). Works on scalars and arrays.
+
+    :param dsc: bundle equivalent radius for capacitance (ft)
+    :param deq: geometric mean phase spacing (ft)
+    :param f: frequency (Hz)
+    """
+    return (1j * 2 * np.pi * f) * ((2 * np.pi * EPSILON_0) / np.log(deq / dsc)) * MILES_TO_METERS
+
+
+def bundle_equivalent_radius(radius, num_conductors, spacing):
+    """
+    Equivalent radius of a symmetric bundle, with the same formulas as Bundle.calc_DSL / calc_DSC.
+    Pass the conductor GMR to get DSL, or the conductor radius to get DSC. Works on broadcast arrays.
+
+    :param radius: conductor GMR or radius (ft)
+    :param num_conductors: sub-conductors per bundle, 1 to 4
+    :param spacing: distance between sub-conductors (ft)
+    """
+    n = np.asarray(num_conductors)
+    if np.any((n < 1) | (n > 4)):
+        raise ValueError("Bundles support 1 to 4 sub-conductors.")
+    # 4-conductor bundles carry the 1.091 square-bundle factor
+    factor = np.where(n == 4, 1.091, 1.0)
+    return factor * (radius * spacing ** (n - 1)) ** (1 / n)
+
+
+def geometry_deq(xa, ya, xb, yb, xc, yc):
+    """
+    Geometric mean phase spacing Deq = (Dab Dbc Dca)^(1/3), as Geometry.calc_deq, for arrays of towers.
+    """
+    dab = np.hypot(np.subtract(xb, xa), np.subtract(yb, ya))
+    dbc = np.hypot(np.subtract(xc, xb), np.subtract(yc, yb))
+    dca = np.hypot(np.subtract(xa, xc), np.subtract(ya, yc))
+    return np.cbrt(dab * dbc * dca)
+
+
+def equivalent_pi(z_per_mile, y_per_mile, length):
+    """
+    Exact equivalent-pi of a distributed-parameter line, broadcast over any array shape
+    (e.g. frequencies x lines).
+
+    With gamma l = sqrt(z y) l, the nominal series impedance Z = z l and shunt admittance Y = y l
+    are corrected to Z' = Z sinh(gamma l) / (gamma l) and Y' = Y tanh(gamma l / 2) / (gamma l / 2),
+    which equals Zc sinh(gamma l) and 2 tanh(gamma l / 2) / Zc.
+
+    :param z_per_mile: series impedance per mile (ohm/mi)
+    :param y_per_mile: shunt admittance per mile (S/mi)
+    :param length: line length (mi)
+    :return: Z' (ohm) and Y' (S, total; Y'/2 sits at each end)
+    """
+    z = np.asarray(z_per_mile, dtype=complex) * length
+    y = np.asarray(y_per_mile, dtype=complex) * length
+    gamma_l = np.sqrt(z * y)
+
+    # Both correction factors tend to 1 for short lines or lines without charging
+    short = np.abs(gamma_l) < 1e-9
+    safe = np.where(short, 1.0, gamma_l)
+    series_factor = np.where(short, 1.0, np.sinh(safe) / safe)
+    shunt_factor = np.where(short, 1.0, np.tanh(safe / 2) / (safe / 2))
+    return z * series_factor, y * shunt_factor
+
+
+def bundle_geometry_arrays(bundles, geometries):
+    """
+    Gather per-line bundle and geometry parameters into arrays. Lines usually share a handful of
+    Bundle and Geometry objects, so each distinct object is read once and broadcast by index.
+    DSL, DSC and Deq are computed from the current conductor, spacing and tower coordinates.
+
+    :param bundles: sequence of Bundle objects, one per line
+    :param geometries: sequence of Geometry objects, one per line
+    :return: r_per_mile, dsl, dsc, deq arrays
+    """
+    def distinct(objects):
+        # Index of each object among the distinct objects, and the distinct objects themselves
+        ids = np.fromiter(map(id, objects), dtype=np.int64, count=len(objects))
+        _, first, index = np.unique(ids, return_index=True, return_inverse=True)
+        return index, [objects[i] for i in first]
+
+    b_index, b_unique = distinct(bundles)
+    g_index, g_unique = distinct(geometries)
+    diam, gmr, resistance, n, spacing = (
+        np.array(column, dtype=float) for column in
+        zip(*[(b.conductor.diam, b.conductor.GMR, b.conductor.resistance, b.num_conductors, b.spacing) for b in b_unique]))
+    coordinates = np.array([[g.xa, g.ya, g.xb, g.yb, g.xc, g.yc] for g in g_unique], dtype=float)
+    r_per_mile = (resistance / n)[b_index]
+    dsl = bundle_equivalent_radius(gmr, n, spacing)[b_index]
+    dsc = bundle_equivalent_radius(diam / 24, n, spacing)[b_index]
+    deq = geometry_deq(*coordinates.T)[g_index]
+    return r_per_mile, dsl, dsc, deq
+
+
+class PerMileConstants:
+    """
+    Per-mile constants of one conductor/bundle/geometry/frequency combination. DSL, DSC and Deq are
+    derived from the same parameters as LineConstantCache.key, not read from the Bundle and Geometry
+    attributes set when those were created.
+    """
+
+    __slots__ = ('r', 'x', 'b', 'z1', 'z2', 'z0', 'y_shunt')
+
+    def __init__(self, bundle, geometry, f=60):
+        conductor = bundle.conductor
+        r_per_mile = conductor.resistance / bundle.num_conductors
+        dsl = bundle_equivalent_radius(conductor.GMR, bundle.num_conductors, bundle.spacing)
+        dsc = bundle_equivalent_radius(conductor.diam / 24, bundle.num_conductors, bundle.spacing)
+        deq = geometry_deq(geometry.xa, geometry.ya, geometry.xb, geometry.yb, geometry.xc, geometry.yc)
+        z_series = complex(series_impedance_per_mile(r_per_mile, dsl, deq, f))
+        self.y_shunt = complex(shunt_admittance_per_mile(dsc, deq, f))
+        self.r = z_series.real # ohm/mi
+        self.x = z_series.imag # ohm/mi
+        self.b = self.y_shunt.imag # S/mi
+        self.z1 = z_series
+        self.z2 = z_series
+        self.z0 = ZERO_SEQUENCE_FACTOR * z_series
+
+
+class LineConstantCache:
+    """
+    Least-recently-used cache of PerMileConstants keyed by (conductor, bundle, geometry, frequency).
+
+    Keys are built from the defining parameters rather than object identity, so equal conductors,
+    bundles and geometries created separately share an entry and a modified object is never served
+    stale values. Lines then only scale the per-mile values by their length and base.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        """
+        :param maxsize: number of combinations kept; the least recently used is evicted beyond it
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(bundle, geometry, f=60):
+        conductor = bundle.conductor
+        return ((conductor.diam, conductor.GMR, conductor.resistance),
+                (bundle.num_conductors, bundle.spacing),
+                (geometry.xa, geometry.ya, geometry.xb, geometry.yb, geometry.xc, geometry.yc),
+                float(f))
+
+    def get(self, bundle, geometry, f=60):
+        """
+        Return the PerMileConstants of a combination, computing and storing them on a miss.
+        """
+        key = self.key(bundle, geometry, f)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        entry = PerMileConstants(bundle, geometry, f)
+        self._entries[key] = entry
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return {'size': len(self._entries), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'hit_rate': self.hit_rate}
+
+
+# Process-wide cache used by TransmissionLine and LineConstants.from_lines
+LINE_CONSTANT_CACHE = LineConstantCache()
+
+
+class LineConstants:
+    """
+    The LineConstants class evaluates the electrical constants of many transmission lines in one
+    vectorized pass. All attributes are arrays with one entry per line; ohmic values are for the
+    full line length and per unit values are on the base of the sending-end bus.
+    """
+
+    def __init__(self, z_per_mile, y_per_mile, length, base_kv, s_base=100, f=60):
+        """
+        :param z_per_mile: (L,) series impedance per mile (ohm/mi)
+        :param y_per_mile: (L,) shunt admittance per mile (S/mi)
+        :param length: (L,) line length (mi)
+        :param base_kv: (L,) nominal voltage of the sending-end bus (kV)
+        :param s_base: system base (MVA), scalar or (L,)
+        :param f: frequency the per-mile values were computed at (Hz), scalar or (L,)
+        """
+        length = np.asarray(length, dtype=float)
+        self.length = length
+        self.f = np.asarray(f, dtype=float)
+        self.z_per_mile = np.asarray(z_per_mile, dtype=complex)
+        self.y_per_mile = np.asarray(y_per_mile, dtype=complex)
+        self.zbase = np.asarray(base_kv, dtype=float) ** 2 / s_base
+
+        # Series impedance and shunt admittance of the whole line
+        self.zseries = np.asarray(z_per_mile, dtype=complex) * length
+        self.yshunt = np.asarray(y_per_mile, dtype=complex) * length
+        self.zseries_pu = self.zseries / self.zbase
+        self.yshunt_pu = self.yshunt * self.zbase
+
+        # Sequence impedances, positive and negative identical for a transposed line
+        self.z1 = self.zseries
+        self.z2 = self.zseries
+        self.z0 = ZERO_SEQUENCE_FACTOR * self.zseries
+        self.z1_pu = self.z1 / self.zbase
+        self.z2_pu = self.z2 / self.zbase
+        self.z0_pu = self.z0 / self.zbase
+
+        # Series admittances per sequence (zero for zero-length lines)
+        self.yseries = self._invert(self.zseries)
+        self.y1_pu = self._invert(self.z1_pu)
+        self.y2_pu = self._invert(self.z2_pu)
+        self.y0_pu = self._invert(self.z0_pu)
+
+    @staticmethod
+    def _invert(z):
+        z = np.atleast_1d(z)
+        y = np.zeros_like(z)
+        nonzero = z != 0
+        y[nonzero] = 1 / z[nonzero]
+        return y
+
+    @property
+    def sequence_admittances_pu(self):
+        # (3, L) series admittance per sequence, stacked in SEQUENCES order
+        return np.stack((self.y1_pu, self.y2_pu, self.y0_pu))
+
+    def equivalent_pi_pu(self, frequencies=None):
+        """
+        Exact equivalent-pi series impedance and total shunt admittance of every line, per sequence,
+        in pu. The zero sequence uses Z0 with the same per-mile shunt admittance.
+
+        :param frequencies: optional (F,) frequencies (Hz). Per-mile X and B scale linearly with
+                            frequency from the values the constants were built at.
+        :return: Z', Y' of shape (3, L), or (3, F, L) with frequencies
+        """
+        z_per_mile = self.z_per_mile
+        y_per_mile = self.y_per_mile
+        if frequencies is not None:
+            scale = np.asarray(frequencies, dtype=float)[:, None] / self.f
+            z_per_mile = z_per_mile.real + 1j * z_per_mile.imag * scale
+            y_per_mile = y_per_mile * scale
+        z_sequences = np.stack((z_per_mile, z_per_mile, ZERO_SEQUENCE_FACTOR * z_per_mile))
+        z_pi, y_pi = equivalent_pi(z_sequences, y_per_mile, self.length)
+        return z_pi / self.zbase, y_pi * self.zbase
+
+    def yprim_pu(self, model: str = 'series'):
+        """
+        Stacked 2x2 line Yprim per sequence for Ybus assembly under one of LINE_MODELS.
+
+        :return: (3, L, 2, 2) complex array in pu
+        """
+        if model not in LINE_MODELS:
+            raise ValueError(f"Unknown line model {model}. Choose from {', '.join(LINE_MODELS)}.")
+        if model == 'long_line':
+            z_pi, y_pi = self.equivalent_pi_pu()
+            y_series = self._invert(z_pi.ravel()).reshape(z_pi.shape)
+            y_end = y_pi / 2
+        else:
+            y_series = self.sequence_admittances_pu
+            y_end = np.zeros_like(y_series) if model == 'series' else np.broadcast_to(self.yshunt_pu / 2, y_series.shape)
+        return (y_series[:, :, None, None] * np.array([[1, -1], [-1, 1]])
+                + y_end[:, :, None, None] * np.eye(2))
+
+    @classmethod
+    def from_parameters(cls, r_per_mile, dsl, dsc, deq, length, base_kv, f=60, s_base=100):
+        """
+        Evaluate the constants from raw bundle and geometry arrays (see bundle_geometry_arrays).
+        """
+        z_per_mile = series_impedance_per_mile(np.asarray(r_per_mile, dtype=float), dsl, deq, f)
+        y_per_mile = shunt_admittance_per_mile(dsc, deq, f)
+        return cls(z_per_mile, y_per_mile, length, base_kv, s_base, f)
+
+    @classmethod
+    def from_lines(cls, tlines, cache: LineConstantCache = None):
+        """
+        Evaluate the constants of TransmissionLine objects in one call. Each distinct
+        bundle/geometry/frequency combination is looked up once in the line-constant cache.
+        """
+        cache = LINE_CONSTANT_CACHE if cache is None else cache
+        count = len(tlines)
+        combos = {} # (bundle id, geometry id, f) -> (position, first line using it)
+        combo_index = np.fromiter(
+            (combos.setdefault((id(t.bundle), id(t.geometry), t.f), (len(combos), t))[0] for t in tlines),
+            dtype=np.int64, count=count)
+        per_mile = [cache.get(t.bundle, t.geometry, t.f) for _, t in combos.values()]
+
+        z_per_mile = np.array([c.z1 for c in per_mile], dtype=complex)[combo_index]
+        y_per_mile = np.array([c.y_shunt for c in per_mile], dtype=complex)[combo_index]
+        length = np.fromiter((t.length for t in tlines), dtype=float, count=count)
+        base_kv = np.fromiter((t.bus1.base_kv for t in tlines), dtype=float, count=count)
+        s_base = np.fromiter((t.S_Base for t in tlines), dtype=float, count=count)
+        f = np.fromiter((t.f for t in tlines), dtype=float, count=count)
+        return cls(z_per_mile, y_per_mile, length, base_kv, s_base, f)
+
+
+if __name__ == '__main__':
+    import time
+    from conductor import Conductor
+    from bundle import Bundle
+    from geometry import Geometry
+    from bus import Bus
+    from transmissionline import TransmissionLine
+    # Same module object as TransmissionLine uses, not this script's copy
+    from line_constants import LineConstants, LINE_CONSTANT_CACHE
+
+    conductor1 = Conductor("Partridge", 0.642, 0.0217, 0.385, 460)
+    bundle1 = Bundle("Bundle A", 2, 1.5, conductor1)
+    geometry1 = Geometry("Geometry 1", 0, 0, 19.5, 0, 39, 0)
+    bus_a = Bus("Bus A", 230, "PQ Bus")
+    bus_b = Bus("Bus B", 230, "PQ Bus")
+    lengths = np.random.default_rng(0).uniform(5, 50, 20000)
+    tlines = [TransmissionLine(f"Line {i}", bus_a, bus_b, bundle1, geometry1, length) for i, length in enumerate(lengths)]
+
+    start = time.perf_counter()
+    scalar = np.array([tline.calc_sequence_admittances() for tline in tlines])
+    middle = time.perf_counter()
+    batch = LineConstants.from_lines(tlines).sequence_admittances_pu.T
+    end = time.perf_counter()
+
+    assert np.allclose(scalar, batch)
+    print(f"{len(tlines)} lines: per-line {middle - start:.3f} s, batch {end - middle:.3f} s")
+    print(f"Line-constant cache: {LINE_CONSTANT_CACHE.stats()}")
+
+    # Exact equivalent pi for every line at a sweep of frequencies, one broadcast call
+    frequencies = np.linspace(50, 1000, 96)
+    start = time.perf_counter()
+    z_pi, y_pi = LineConstants.from_lines(tlines).equivalent_pi_pu(frequencies)
+    print(f"Equivalent pi for {len(tlines)} lines x {len(frequencies)} frequencies: "
+          f"{time.perf_counter() - start:.3f} s, shape {z_pi.shape}")
+
+    # Long-line correction of a 300 mi line at 60 Hz
+    long_line = LineConstants.from_lines([TransmissionLine("Line L", bus_a, bus_b, bundle1, geometry1, 300)])
+    z_exact, y_exact = long_line.equivalent_pi_pu()
+    print(f"300 mi line: nominal Z = {long_line.z1_pu[0]:.4f}, exact Z' = {z_exact[0, 0]:.4f} pu; "
+          f"nominal Y = {long_line.yshunt_pu[0]:.4f}, exact Y' = {y_exact[0, 0]:.4f} pu")
@@ -0,0 +1,119 @@
+import numpy as np
+from line_constants import (series_impedance_per_mile, shunt_admittance_per_mile, bundle_equivalent_radius,
+                            geometry_deq)
+
+# Line design-space sweep: every catalog conductor x bundle size x sub-conductor spacing x tower
+# geometry is evaluated with array broadcasting, without building Bundle or Geometry objects.
+# Result arrays have shape (conductors, bundle sizes, spacings, geometries).
+
+BUNDLE_SIZES = (1, 2, 3, 4)
+
+
+class LineDesignSweep:
+    """
+    The LineDesignSweep class evaluates the Cartesian product of conductors, bundle sizes, bundle
+    spacings and tower geometries in array form. Every result attribute has shape
+    (conductors, bundle sizes, spacings, geometries) and is per mile unless stated otherwise.
+    """
+
+    def __init__(self, conductors, geometries, base_kv: float, bundle_sizes=BUNDLE_SIZES,
+                 spacings=(1.5,), f=60):
+        """
+        :param conductors: sequence of catalog Conductor objects
+        :param geometries: sequence of Geometry objects (tower options)
+        :param base_kv: line-to-line voltage (kV) used for charging, SIL and MVA ratings
+        :param bundle_sizes: sub-conductors per bundle to try, 1 to 4
+        :param spacings: sub-conductor spacings to try (ft); single conductors ignore spacing
+        :param f: frequency (Hz)
+        """
+        self.conductors = list(conductors)
+        self.geometries = list(geometries)
+        self.bundle_sizes = np.asarray(bundle_sizes, dtype=np.int64)
+        self.spacings = np.asarray(spacings, dtype=float)
+        self.base_kv = base_kv
+        self.f = f
+
+        # Conductor columns on axis 0, bundle sizes on axis 1, spacings on axis 2, geometries on axis 3
+        diam, gmr, resistance, ampacity = (
+            np.array([getattr(c, attr) for c in self.conductors], dtype=float)[:, None, None, None]
+            for attr in ('diam', 'GMR', 'resistance', 'ampacity'))
+        n = self.bundle_sizes[None, :, None, None]
+        spacing = self.spacings[None, None, :, None]
+        coordinates = np.array([[g.xa, g.ya, g.xb, g.yb, g.xc, g.yc] for g in self.geometries], dtype=float)
+        deq = geometry_deq(*coordinates.T)[None, None, None, :]
+
+        dsl = bundle_equivalent_radius(gmr, n, spacing)
+        dsc = bundle_equivalent_radius(diam / 24, n, spacing)
+        self.shape = np.broadcast_shapes(dsl.shape, deq.shape)
+
+        # Series impedance and charging per mile
+        self.z_per_mile = np.broadcast_to(series_impedance_per_mile(resistance / n, dsl, deq, f), self.shape)
+        self.y_per_mile = np.broadcast_to(shunt_admittance_per_mile(dsc, deq, f), self.shape)
+        self.r_per_mile = self.z_per_mile.real
+        self.x_per_mile = self.z_per_mile.imag
+        self.b_per_mile = self.y_per_mile.imag
+        self.charging_mvar_per_mile = base_kv ** 2 * self.b_per_mile
+
+        # Lossless surge impedance and surge impedance loading
+        self.surge_impedance = np.sqrt(self.x_per_mile / self.b_per_mile) # ohm
+        self.sil_mw = base_kv ** 2 / self.surge_impedance
+
+        # Thermal limit of the bundle
+        self.ampacity = np.broadcast_to(n * ampacity, self.shape) # A per phase
+        self.mva_rating = np.sqrt(3) * base_kv * self.ampacity / 1000
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    def combination(self, flat_index: int):
+        """
+        Describe one candidate by its position in the flattened result arrays.
+
+        :return: (conductor name, bundle size, spacing ft, geometry name)
+        """
+        c, n, s, g = np.unravel_index(flat_index, self.shape)
+        return (self.conductors[c].name, int(self.bundle_sizes[n]), float(self.spacings[s]), self.geometries[g].name)
+
+    def select(self, min_mva: float = 0.0, min_sil_mw: float = 0.0, max_r_per_mile: float = np.inf):
+        """
+        Flat indices of candidates meeting the limits, lowest resistance first.
+        """
+        feasible = (self.mva_rating >= min_mva) & (self.sil_mw >= min_sil_mw) & (self.r_per_mile <= max_r_per_mile)
+        candidates = np.flatnonzero(feasible)
+        return candidates[np.argsort(self.r_per_mile.ravel()[candidates], kind='stable')]
+
+
+if __name__ == '__main__':
+    import time
+    from conductor import Conductor
+    from bundle import Bundle
+    from geometry import Geometry
+    from line_constants import PerMileConstants
+
+    # Spot check one combination against the object model
+    conductor1 = Conductor("Partridge", 0.642, 0.0217, 0.385, 460)
+    geometry1 = Geometry("Geometry 1", 0, 0, 19.5, 0, 39, 0)
+    sweep = LineDesignSweep([conductor1], [geometry1], base_kv=230, spacings=(1.5,))
+    for k, n in enumerate(BUNDLE_SIZES):
+        reference = PerMileConstants(Bundle("Bundle", n, 1.5, conductor1), geometry1)
+        assert np.isclose(sweep.z_per_mile[0, k, 0, 0], reference.z1)
+        assert np.isclose(sweep.y_per_mile[0, k, 0, 0], reference.y_shunt)
+        print(f"{n} x Partridge: z = {sweep.z_per_mile[0, k, 0, 0]:.4f} ohm/mi, "
+              f"SIL = {sweep.sil_mw[0, k, 0, 0]:.1f} MW, rating = {sweep.mva_rating[0, k, 0, 0]:.1f} MVA")
+
+    # Synthetic catalog: 100 conductors x 4 bundle sizes x 10 spacings x 25 towers = 100,000 candidates
+    rng = np.random.default_rng(0)
+    diam = rng.uniform(0.5, 1.8, 100)
+    catalog = [Conductor(f"C{i}", d, 0.0375 * d, 0.6 / d ** 2, 600 * d) for i, d in enumerate(diam)]
+    towers = [Geometry(f"Tower {i}", 0, 0, w, h, 2 * w, 0)
+              for i, (w, h) in enumerate(zip(rng.uniform(15, 35, 25), rng.uniform(0, 10, 25)))]
+    start = time.perf_counter()
+    sweep = LineDesignSweep(catalog, towers, base_kv=345, spacings=np.linspace(0.75, 2.0, 10))
+    elapsed = time.perf_counter() - start
+    print(f"{sweep.size} candidates in {elapsed:.3f} s")
+
+    best = sweep.select(min_mva=1000, min_sil_mw=400)
+    if len(best):
+        name, n, spacing, tower = sweep.combination(best[0])
+        print(f"{len(best)} candidates meet 1000 MVA and 400 MW SIL; lowest R: {n} x {name} at {spacing:.2f} ft on {tower}")
@@ -7,6 +7,8 @@ class Load:
     It has attributes name, bus, real_power, reactive_power.
     """
 
+    __slots__ = ('name', 'bus', 'real_power', 'reactive_power')
+
     def __init__(self, name: str, bus: Bus, real_power: float, reactive_power: float):
         self.name = name
         self.bus = bus
@@ -97,7 +97,7 @@ print("\n--- Sequence Impedance Matrices ---")
 circuit1.calc_ybus_faultstudy('positive')
 print("\nY1 (Positive Sequence Ybus):")
 circuit1.print_ybus_faultstudy_table()
-Z1 = np.linalg.inv(circuit1.get_ybus_faultstudy())
+Z1 = circuit1.get_zbus('positive')
 print("\nZ1 (Positive Sequence Zbus):")
 circuit1.zbus = Z1
 circuit1.print_zbus_table()
@@ -106,7 +106,7 @@ circuit1.print_zbus_table()
 circuit1.calc_ybus_faultstudy('negative')
 print("\nY2 (Negative Sequence Ybus):")
 circuit1.print_ybus_faultstudy_table()
-Z2 = np.linalg.inv(circuit1.get_ybus_faultstudy())
+Z2 = circuit1.get_zbus('negative')
 print("\nZ2 (Negative Sequence Zbus):")
 circuit1.zbus = Z2
 circuit1.print_zbus_table()
@@ -115,7 +115,7 @@ circuit1.print_zbus_table()
 circuit1.calc_ybus_faultstudy('zero')
 print("\nY0 (Zero Sequence Ybus):")
 circuit1.print_ybus_faultstudy_table()
-Z0 = np.linalg.inv(circuit1.get_ybus_faultstudy())
+Z0 = circuit1.get_zbus('zero')
 print("\nZ0 (Zero Sequence Zbus):")
 circuit1.zbus = Z0
 circuit1.print_zbus_table()
@@ -130,4 +130,7 @@ circuit1.run_asym_fault("SLG", 4)  # Applies SLG fault at Bus 4
 circuit1.run_asym_fault("LL", 4)  # Applies LL fault at Bus 4
 
 # Run a Double Line-to-Ground (DLG) Fault at Bus 4
-circuit1.run_asym_fault("DLG", 4)  # Applies DLG fault at Bus 4
\ No newline at end of file
+circuit1.run_asym_fault("DLG", 4)  # Applies DLG fault at Bus 4
+
+# Cache hits show matrices reused instead of rebuilt
+print(f"\nCircuit cache: {circuit1.cache_stats['hits']} hits, {circuit1.cache_stats['misses']} misses")
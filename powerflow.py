@@ -1,19 +1,82 @@
+import time
 import numpy as np
+from scipy import sparse
 from tabulate import tabulate
-from solution import Solution
-from jacobian import Jacobian
+from solution import Solution, calc_power_injections
+from jacobian import Jacobian, JacobianReusePolicy
+from step_control import StepControl
+from ordering import SparseLUSolver
+from state_library import SolvedStateLibrary
+from fast_decoupled import FastDecoupledFactors
+from dc_powerflow import DCPowerFlow
+from branch_flows import BranchFlows
 
 class PowerFlow:
 
     # Initializes th
-    def __init__(self, solution: Solution, tol, max_iter):
+    def __init__(self, solution: Solution, tol, max_iter, linear_solver: SparseLUSolver = None,
+                 state_library: SolvedStateLibrary = None, reuse_policy: JacobianReusePolicy = None,
+                 step_control: StepControl = None, verbose: bool = True):
+        """
+        :param linear_solver: sparse LU backend for the Newton steps. Its ordering and symbolic
+                              analysis are reused while the Jacobian pattern (the topology) stays
+                              the same, so pass one solver to several PowerFlows of the same
+                              network to share it. A new one is created if None. The islands
+                              of a split network each get their own solver, kept across solves
+                              in self.island_solvers.
+        :param state_library: optional library of converged states; Newton-Raphson starts from the
+                              stored state nearest to the current injections and adds its result
+        :param reuse_policy: when to refactorize the Jacobian, full Newton-Raphson if None
+        :param step_control: damping of the Newton step (optimal multiplier or line search), full steps if None.
+                             The optimal multiplier needs full Newton-Raphson, not a reused Jacobian.
+        :param verbose: print the outcome and the converged bus voltages of every solve
+        """
         self.solution = solution
         self.buses = solution.buses
         self.ybus = solution.ybus
         self.tol = tol
         self.max_iter = max_iter
+        self.verbose = verbose
+        self.linear_solver = linear_solver if linear_solver is not None else SparseLUSolver()
+        self.island_solvers = {} # Island number -> SparseLUSolver for its Newton steps
+        self._fast_decoupled = {} # (variant, index sets) -> FastDecoupledFactors, factorized once
+        self._dc_powerflow = None # DCPowerFlow of the compiled network, factorized on the first DC start
+        self._ybus_csr = None # Sparse copy of self.ybus
+        self.iterations = None # Iterations of the last solve, None if it did not converge
+        self.state_library = state_library
+        self.last_state = None # (vpu, delta) of the last converged Newton-Raphson solve
+        self.iterations_saved = None # Iterations the last warm start saved over a flat start, None if not known
+        self._last_injections = None # Injection key of last_state
+        self._flat_iterations = None # Flat-start iterations for the injections of last_state, None if not known
+        self.reuse_policy = reuse_policy if reuse_policy is not None else JacobianReusePolicy()
+        self.factorizations = 0 # Jacobian factorizations of the last Newton-Raphson solve
+        self.solve_time = 0.0 # Wall time of the last Newton-Raphson solve (s)
+        self.step_control = step_control if step_control is not None else StepControl()
+        if self.step_control.method == 'iwamoto' and not self.reuse_policy.full_newton:
+            raise ValueError("The Iwamoto multiplier assumes an exact Newton step. Use refactor_every=1 or 'line_search'.")
+        self.step_lengths = [] # Step length of every Newton-Raphson iteration of the last solve
+
+    def calc_newton_raphson(self, dc_start: bool = False, initial_state=None):
+        """
+        Solve the power flow with Newton-Raphson. A network split into islands (or one whose only
+        island lacks a slack bus) is solved island by island, see calc_newton_raphson_islands.
+
+        :param dc_start: replace the initial PV and PQ bus angles with the DC power flow angles
+                         (B θ = P from the branch reactances, see set_dc_angles) before the first iteration
+        :param initial_state: warm start, either a (vpu, delta) pair of full-length arrays or
+                              'previous' for the last converged solve of this PowerFlow. Angles
+                              seed the PV and PQ buses, magnitudes the PQ buses. Without it the
+                              state library is searched, if there is one. A warm start replaces dc_start.
+
+        Iterations, Jacobian factorizations and wall time are kept in self.iterations,
+        self.factorizations and self.solve_time, see solve_stats().
+        """
+        start = time.perf_counter()
+        seed = self._warm_start(initial_state)
+        flat_start = seed is None and not dc_start
+        if dc_start and seed is None:
+            self.set_dc_angles()
 
-    def calc_newton_raphson(self):
         #print("\n--- Iteration 0 ---")
         #print("Initial Bus Voltages and Angles")
 
@@ -21,11 +84,154 @@ class PowerFlow:
         #for bus in self.buses:
             #print(f"{bus.name:.6s} | V = {bus.vpu:.5f} pu | δ = {bus.delta:.5f}°")
 
+        topology = getattr(self.solution, 'topology', None)
+        if topology is not None and not topology.is_trivial:
+            converged = self.calc_newton_raphson_islands()
+            self.solve_time = time.perf_counter() - start
+        else:
+            pv_pq_indices, pq_indices = self._index_sets()
+            iterations = self._iterate(pv_pq_indices, pq_indices)
+            self.solve_time = time.perf_counter() - start
+            converged = self._report(iterations)
+        self._store_state(seed, flat_start)
+        return converged
+
+    def calc_fast_decoupled(self, variant: str = 'XB'):
+        """
+        Solve the power flow with the fast-decoupled method. Constant B' and B'' matrices are built
+        from Ybus and factorized once (and kept for later solves on this PowerFlow), then every
+        iteration is a P-δ half step followed by a Q-|V| half step using those factors.
+        Bus voltages and angles are updated in place as with calc_newton_raphson.
+
+        :param variant: 'XB' or 'BX', see fast_decoupled.FAST_DECOUPLED_VARIANTS
+        :return: True if converged
+        """
+        topology = getattr(self.solution, 'topology', None)
+        if topology is not None and not topology.is_trivial:
+            return self.calc_newton_raphson_islands(method='_iterate_fast_decoupled', variant=variant)
+
+        pv_pq_indices, pq_indices = self._index_sets()
+        return self._report(self._iterate_fast_decoupled(pv_pq_indices, pq_indices, variant))
+
+    def _warm_start(self, initial_state):
+        """
+        Write the initial guess onto the buses.
+        :return: None for a cold start, otherwise (source, injection distance to the seed's case,
+                 flat-start iterations of the seed's case). The distance is None for a supplied state.
+        """
+        distance, flat = None, None
+        if isinstance(initial_state, str):
+            if initial_state != 'previous':
+                raise ValueError("Unknown initial state. Pass a (vpu, delta) pair or 'previous'.")
+            if self.last_state is None:
+                raise ValueError("No converged state to start from. Run calc_newton_raphson() first.")
+            source, (vpu, delta), flat = 'previous', self.last_state, self._flat_iterations
+            injections = SolvedStateLibrary.injection_key(*self.solution.get_injections())
+            distance = float(np.linalg.norm(injections - self._last_injections))
+        elif initial_state is not None:
+            source, (vpu, delta) = 'supplied', initial_state
+        elif self.state_library is not None:
+            match = self.state_library.nearest(SolvedStateLibrary.injection_key(*self.solution.get_injections()))
+            if match is None:
+                return None
+            state, distance = match
+            source, vpu, delta, flat = 'library', state.vpu, state.delta, state.flat_iterations
+        else:
+            return None
+
+        # Only the unknowns take the seed: slack buses keep their angle, PV buses their magnitude
+        pv_pq_indices, pq_indices = self._index_sets()
+        for i in pv_pq_indices:
+            self.buses[i].delta = float(delta[i])
+        for i in pq_indices:
+            self.buses[i].vpu = float(vpu[i])
+        self.solution.voltages = [bus.vpu for bus in self.buses]
+        return source, distance, flat
+
+    def _store_state(self, seed, flat_start: bool):
+        """
+        Keep a converged state for 'previous' and the state library, and count the iterations a warm
+        start saved. The saving is only known when the seed was solved for the same injections and
+        its flat-start iteration count was recorded; a seed from other injections gives no count.
+        """
+        source, distance, flat = seed if seed is not None else (None, None, None)
+        if seed is not None and distance != 0:
+            flat = None
+        if flat_start:
+            flat = self.iterations
+
+        self.iterations_saved = None
+        if seed is not None:
+            if flat is not None and self.iterations is not None:
+                self.iterations_saved = flat - self.iterations
+            if self.verbose:
+                saved = "unknown" if self.iterations_saved is None else self.iterations_saved
+                print(f"\nWarm start ({source}): {saved} iterations saved")
+        if self.state_library is not None:
+            self.state_library.record(distance, self.iterations, self.iterations_saved)
+
+        if self.iterations is None:
+            return
+        self.last_state = self.solution.get_state()
+        self._last_injections = SolvedStateLibrary.injection_key(*self.solution.get_injections())
+        self._flat_iterations = flat
+        if self.state_library is not None:
+            self.state_library.add(self._last_injections, *self.last_state, flat)
+
+    def _index_sets(self):
+        # Index sets come from the compiled network when available, otherwise scan the buses once
+        network = getattr(self.solution, 'network', None)
+        if network is not None:
+            pq_indices = network.pq # PQ buses need both P and Q updated
+            pv_pq_indices = network.pv_pq # PV buses need P updated
+        else:
+            pq_indices = np.array([i for i, bus in enumerate(self.buses) if bus.bus_type == "PQ Bus"], dtype=int)
+            pv_pq_indices = np.array([i for i, bus in enumerate(self.buses) if bus.bus_type != "Slack Bus"], dtype=int)
+        return pv_pq_indices, pq_indices
+
+    def _report(self, iterations):
+        # Print the outcome of a single-island solve
+        self.iterations = iterations
+        if iterations is None:
+            if self.verbose:
+                print("\nDid not converge within the max number of iterations")
+            return False
+
+        if self.verbose:
+            print(f"\nConverged in {iterations} iterations")
+            self._print_voltages()
+        return True
+
+    def _print_voltages(self):
+        print("\n--- Final Converged Bus Voltage and Angles ---")
+        for bus in self.buses:
+            print(f"{bus.name:6s} | V = {bus.vpu:.5f} pu | δ = {bus.delta:.5f}°")
+
+    def solve_stats(self):
+        # Cost of the last Newton-Raphson solve
+        return {'iterations': self.iterations, 'factorizations': self.factorizations,
+                'solve_time': self.solve_time, 'step_lengths': list(self.step_lengths)}
+
+    def _iterate(self, pv_pq_indices, pq_indices):
+        """
+        Newton-Raphson iterations on self.buses for the given unknowns.
+        :return: number of iterations to convergence, None if max_iter was reached or the step control stalled
+        """
+        # Sparse copy of Ybus for the Jacobian
+        ybus = self._sparse_ybus()
+        self.factorizations = 0
+        self.step_lengths = []
+        steps_since_factor, previous_norm = None, None
+        if self.step_control.enabled:
+            P_spec = np.array([bus.P_spec for bus in self.buses])[pv_pq_indices]
+            Q_spec = np.array([bus.Q_spec for bus in self.buses])[pq_indices]
+
+            def evaluate(vpu, delta):
+                P, Q = calc_power_injections(ybus, vpu, np.degrees(delta))
+                return np.concatenate((P_spec - P[pv_pq_indices], Q_spec - Q[pq_indices]))
+
         # Runs the newton raphson iteration
         for iteration in range(self.max_iter):
-            pq_indices = [i for i, bus in enumerate(self.buses) if bus.bus_type == "PQ Bus"] # PQ buses need both P and Q updated
-            pv_pq_indices = [i for i, bus in enumerate(self.buses) if bus.bus_type != "Slack Bus"] # PV buses need P updated
-
             # Compute power mismatch
             delta_P, delta_Q = self.solution.compute_power_mismatch_vector()
             delta_P_vector = delta_P[pv_pq_indices]
@@ -34,41 +240,54 @@ class PowerFlow:
 
             # Check for convergence
             if np.all(np.abs(mismatch_vector) < self.tol):
-                print(f"\nConverged in {iteration + 1} iterations")
-                print("\n--- Final Converged Bus Voltage and Angles ---")
-                for bus in self.buses:
-                    print(f"{bus.name:6s} | V = {bus.vpu:.5f} pu | δ = {bus.delta:.5f}°")
-                return True
-
-            # Build jacobian matrix
-            angles = [bus.delta for bus in self.buses]
-            voltages = [bus.vpu for bus in self.buses]
-            jacobian = Jacobian(buses = self.buses, ybus = self.ybus, angles = angles, voltages = voltages)
-            J = jacobian.calc_jacobian()
+                return iteration + 1
+
+            # Build and factorize the sparse jacobian matrix, unless the reuse policy keeps the last one
+            norm = np.max(np.abs(mismatch_vector))
+            ratio = norm / previous_norm if previous_norm else None
+            if self.reuse_policy.refactor(steps_since_factor, ratio):
+                angles = [bus.delta for bus in self.buses]
+                voltages = [bus.vpu for bus in self.buses]
+                jacobian = Jacobian(buses = self.buses, ybus = ybus, angles = angles, voltages = voltages)
+                J = jacobian.calc_jacobian_sparse(pv_pq_indices, pq_indices)
+                #self.print_matrix(J.toarray(), "Jacobian Matrix J")
+                self.linear_solver.factor(J)
+                self.factorizations += 1
+                steps_since_factor = 0
 
             # Solves delta(x) = (J^-1) * mismatch_vector
             #self.print_vector(mismatch_vector, "Mismatch Vector [ΔP | ΔQ]")
-            #self.print_matrix(J, "Jacobian Matrix J")
-            delta_x = np.linalg.solve(J, mismatch_vector)
+            delta_x = self.linear_solver.solve(mismatch_vector)
+            steps_since_factor += 1
+            previous_norm = norm
             #self.print_vector(delta_x, "Update Vector Δx")
 
             # Split update vectors
             delta_delta = delta_x[0:len(pv_pq_indices)]
             delta_v = delta_x[len(pv_pq_indices):]
 
-            # Iterates through buses to update voltage pu and angle
-            idx = 0
-            for i, bus in enumerate(self.buses):
-                if bus.bus_type == "Slack Bus":
-                    continue
-                bus.delta += np.degrees(delta_delta[idx])
-                idx += 1
+            # Scales the step by the step control's length
+            step = 1.0
+            if self.step_control.enabled:
+                vpu = np.array([bus.vpu for bus in self.buses])
+                delta = np.radians([bus.delta for bus in self.buses])
+                delta_theta = np.zeros(len(self.buses))
+                delta_theta[pv_pq_indices] = delta_delta
+                delta_vpu = np.zeros(len(self.buses))
+                delta_vpu[pq_indices] = delta_v
+                step = self.step_control.step_length(vpu, delta, delta_vpu, delta_theta, mismatch_vector, evaluate)
+                delta_delta = step * delta_delta
+                delta_v = step * delta_v
+            self.step_lengths.append(step)
+            if self.step_control.stalled(self.step_lengths):
+                return None
+
+            # Iterates through the unknowns to update voltage pu and angle
+            for idx, i in enumerate(pv_pq_indices):
+                self.buses[i].delta += np.degrees(delta_delta[idx])
 
-            idx = 0
-            for i, bus in enumerate(self.buses):
-                if bus.bus_type == "PQ Bus":
-                    bus.vpu += delta_v[idx]
-                    idx += 1
+            for idx, i in enumerate(pq_indices):
+                self.buses[i].vpu += delta_v[idx]
 
             # Saves the update votage pu
             self.solution.voltages = [bus.vpu for bus in self.buses]
@@ -84,8 +303,146 @@ class PowerFlow:
             print("Updated Voltage Magnitudes (p.u.):", [round(float(bus.vpu), 4) for bus in self.buses])
             """
 
-        print("\nDid not converge within the max number of iterations")
-        return False
+        return None
+
+    def set_dc_angles(self):
+        """
+        Set the bus angles of every energized island to the DC power flow solution B θ = P_spec,
+        relative to the island's slack bus (a promoted PV bus where the topology assigned one).
+        B comes from the branch reactances of the compiled network and is factorized once per PowerFlow.
+        """
+        network = getattr(self.solution, 'network', None)
+        if network is None:
+            raise ValueError("A DC start needs a compiled network. Run initialize_system() with a Circuit first.")
+        if self._dc_powerflow is None:
+            self._dc_powerflow = DCPowerFlow(network, getattr(self.solution, 'topology', None))
+        dc = self._dc_powerflow
+        p_spec = np.fromiter((bus.P_spec for bus in self.buses), dtype=float, count=len(self.buses))
+        angles = dc.solve(p_spec, [self.buses[i].delta for i in dc.reference])
+        for i in dc.unknown.tolist():
+            self.buses[i].delta = float(angles[i])
+
+    def get_fast_decoupled_factors(self, pv_pq_indices, pq_indices, variant: str = 'XB'):
+        """
+        B' and B'' factors for the given unknowns, built on first use and kept on this PowerFlow.
+        """
+        key = (variant, np.asarray(pv_pq_indices).tobytes(), np.asarray(pq_indices).tobytes())
+        if key not in self._fast_decoupled:
+            self._fast_decoupled[key] = FastDecoupledFactors(self.ybus, pv_pq_indices, pq_indices, variant)
+        return self._fast_decoupled[key]
+
+    def _iterate_fast_decoupled(self, pv_pq_indices, pq_indices, variant: str = 'XB'):
+        """
+        Fast-decoupled iterations for the given unknowns. The iterations run on arrays and the
+        bus voltages and angles are written back once at the end.
+        :return: number of iterations to convergence, None if max_iter was reached
+        """
+        factors = self.get_fast_decoupled_factors(pv_pq_indices, pq_indices, variant)
+        ybus = self._sparse_ybus()
+        count = len(self.buses)
+        p_spec = np.fromiter((bus.P_spec for bus in self.buses), dtype=float, count=count)
+        q_spec = np.fromiter((bus.Q_spec for bus in self.buses), dtype=float, count=count)
+        vpu = np.array(self.solution.voltages, dtype=float)
+        delta = np.fromiter((bus.delta for bus in self.buses), dtype=float, count=count)
+
+        iterations = None
+        for iteration in range(self.max_iter):
+            # Check both mismatches before the half steps
+            P, Q = calc_power_injections(ybus, vpu, delta)
+            delta_P = p_spec[pv_pq_indices] - P[pv_pq_indices]
+            delta_Q = q_spec[pq_indices] - Q[pq_indices]
+            if np.all(np.abs(delta_P) < self.tol) and np.all(np.abs(delta_Q) < self.tol):
+                iterations = iteration + 1
+                break
+
+            # P-δ half step: B' Δδ = ΔP / |V|
+            delta[pv_pq_indices] += np.degrees(factors.solve_angles(delta_P / vpu[pv_pq_indices]))
+
+            # Q-|V| half step at the new angles: B'' Δ|V| = ΔQ / |V|
+            if len(pq_indices):
+                _, Q = calc_power_injections(ybus, vpu, delta)
+                vpu[pq_indices] += factors.solve_magnitudes((q_spec[pq_indices] - Q[pq_indices]) / vpu[pq_indices])
+
+        for bus, v, d in zip(self.buses, vpu.tolist(), delta.tolist()):
+            bus.vpu, bus.delta = v, d
+        self.solution.voltages = vpu.tolist()
+        return iterations
+
+    def _sparse_ybus(self):
+        # CSR copy of the power flow Ybus, converted once per PowerFlow
+        if self._ybus_csr is None:
+            self._ybus_csr = self.ybus if sparse.issparse(self.ybus) else sparse.csr_matrix(self.ybus)
+        return self._ybus_csr
+
+    def calc_newton_raphson_islands(self, method: str = '_iterate', **options):
+        """
+        Solve each energized island as an independent power flow on its own block of Ybus.
+        The island's slack bus (possibly a promoted PV bus) holds its voltage and angle;
+        de-energized islands are set to 0 pu. Islands are solved one after another: the iterations
+        are Python code holding the GIL, so threads would not run them in parallel.
+
+        :param method: iteration method run per island, '_iterate' (Newton-Raphson) or
+                       '_iterate_fast_decoupled'
+        :param options: extra keyword arguments for the iteration method
+        :return: True if every energized island converged
+        """
+        topology = self.solution.topology
+        ybus = np.asarray(self.ybus)
+        jobs = []
+        for island in topology.islands:
+            if not island.energized:
+                for i in island.buses:
+                    self.buses[i].vpu = 0.0
+                    self.buses[i].delta = 0.0
+                continue
+
+            buses = [self.buses[i] for i in island.buses]
+            island_solution = Solution(buses=buses, ybus=ybus[np.ix_(island.buses, island.buses)],
+                                       voltages=[bus.vpu for bus in buses])
+            local = np.arange(len(buses))
+            is_pq = np.array([bus.bus_type == "PQ Bus" for bus in buses], dtype=bool)
+            unknown = local != island.local_index(island.slack)
+            if island.number not in self.island_solvers:
+                self.island_solvers[island.number] = SparseLUSolver()
+            island_powerflow = PowerFlow(island_solution, self.tol, self.max_iter,
+                                         linear_solver=self.island_solvers[island.number],
+                                         reuse_policy=self.reuse_policy, step_control=self.step_control)
+            jobs.append((island, island_powerflow, local[unknown], local[unknown & is_pq]))
+
+        results = [getattr(island_powerflow, method)(unknown, pq, **options)
+                   for _, island_powerflow, unknown, pq in jobs]
+        self.solution.voltages = [bus.vpu for bus in self.buses]
+
+        # Iterations per island number, None where an island did not converge
+        self.island_iterations = {job[0].number: iterations for job, iterations in zip(jobs, results)}
+        converged = all(iterations is not None for iterations in results)
+        self.iterations = max(results, default=0) if converged else None
+        self.factorizations = sum(job[1].factorizations for job in jobs)
+        self.island_step_lengths = {job[0].number: job[1].step_lengths for job in jobs}
+        if not self.verbose:
+            return converged
+        for island in topology.islands:
+            if not island.energized:
+                print(f"\nIsland {island.number}: de-energized ({', '.join(island.bus_names)})")
+            elif self.island_iterations[island.number] is None:
+                print(f"\nIsland {island.number}: did not converge within the max number of iterations")
+            else:
+                print(f"\nIsland {island.number}: converged in {self.island_iterations[island.number]} iterations")
+        self._print_voltages()
+        return converged
+
+    def calc_branch_flows(self):
+        """
+        From-end and to-end P, Q, current magnitude and I²R loss of every transformer and
+        transmission line at the current bus voltages (call after calc_newton_raphson).
+        :return: BranchFlows with NumPy arrays in pu on the system base
+        """
+        network = getattr(self.solution, 'network', None)
+        if network is None:
+            raise ValueError("Branch flows need a compiled network. Run initialize_system() with a Circuit first.")
+        vpu = np.array([bus.vpu for bus in self.buses])
+        delta = np.array([bus.delta for bus in self.buses])
+        return BranchFlows(network, vpu, delta)
 
     def print_matrix(self, matrix, title="Matrix"):
         print(f"\n--- {title} ---")
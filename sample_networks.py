@@ -0,0 +1,148 @@
+import numpy as np
+from circuit import Circuit
+from conductor import Conductor
+from bundle import Bundle
+from geometry import Geometry
+
+
+def build_seven_bus_circuit(name: str = "Circuit"):
+    """
+    Build the 7 bus power system used throughout main.py.
+    """
+    circuit = Circuit(name)
+
+    circuit.add_bus("Bus 1", 20, "Slack Bus")
+    circuit.add_bus("Bus 2", 230, "PQ Bus")
+    circuit.add_bus("Bus 3", 230, "PQ Bus")
+    circuit.add_bus("Bus 4", 230, "PQ Bus")
+    circuit.add_bus("Bus 5", 230, "PQ Bus")
+    circuit.add_bus("Bus 6", 230, "PQ Bus")
+    circuit.add_bus("Bus 7", 18, "PV Bus")
+
+    circuit.add_transformer("T1", "Bus 1", "Bus 2", 125, 8.5, 10, 100, connection_type="Delta-Y", zg1=None, zg2=0.0019)
+    circuit.add_transformer("T2", "Bus 6", "Bus 7", 200, 10.5, 12, 100, connection_type="Y-Delta", zg1=None, zg2=None)
+
+    conductor1 = Conductor("Partridge", 0.642, 0.0217, 0.385, 460)
+    bundle1 = Bundle("Bundle A", 2, 1.5, conductor1)
+    geometry1 = Geometry("Geometry 1", 0, 0, 19.5, 0, 39, 0)
+
+    circuit.add_transmission_line("Line 1", "Bus 2", "Bus 4", bundle1, geometry1, 10)
+    circuit.add_transmission_line("Line 2", "Bus 2", "Bus 3", bundle1, geometry1, 25)
+    circuit.add_transmission_line("Line 3", "Bus 3", "Bus 5", bundle1, geometry1, 20)
+    circuit.add_transmission_line("Line 4", "Bus 4", "Bus 6", bundle1, geometry1, 20)
+    circuit.add_transmission_line("Line 5", "Bus 5", "Bus 6", bundle1, geometry1, 10)
+    circuit.add_transmission_line("Line 6", "Bus 4", "Bus 5", bundle1, geometry1, 35)
+
+    circuit.add_load("Load 3", "Bus 3", 110, 50)
+    circuit.add_load("Load 4", "Bus 4", 100, 70)
+    circuit.add_load("Load 5", "Bus 5", 100, 65)
+
+    circuit.add_generator("G1", "Bus 1", 1.0, 100, 0.12, 0.14, 0.05, 125, grounded=True, ground_r_pu=0)
+    circuit.add_generator("G2", "Bus 7", 1.0, 200, 0.12, 0.14, 0.05, 200, grounded=True, ground_r_pu=0.30860)
+
+    return circuit
+
+
+def build_mesh_circuit(rows: int, cols: int, gen_every: int = 10, chord_fraction: float = 0.1,
+                       shuffle: bool = True, seed: int = 0, name: str = "Mesh", bulk: bool = True):
+    """
+    Build a synthetic meshed 230 kV network on a rows x cols grid for benchmarks.
+    With bulk, the elements are added through the column builders, otherwise one add_* call per element.
+
+    :return: Circuit
+    """
+    columns = mesh_columns(rows, cols, gen_every, chord_fraction, shuffle, seed)
+    return populate_mesh_circuit(Circuit(name), columns, bulk)
+
+
+def mesh_columns(rows: int, cols: int, gen_every: int = 10, chord_fraction: float = 0.1,
+                 shuffle: bool = True, seed: int = 0):
+    """
+    Column data of the synthetic mesh: element names, terminals and parameters as lists.
+
+    Neighbouring grid buses are joined by transmission lines, a fraction of the squares get a
+    diagonal chord, every gen_every-th bus is a PV bus with a generator, the first bus is the slack
+    and every other bus carries a load. With shuffle, buses are listed in random order, which is
+    what a model imported from a database usually looks like.
+
+    :return: dict of columns
+    """
+    rng = np.random.default_rng(seed)
+    conductor1 = Conductor("Partridge", 0.642, 0.0217, 0.385, 460)
+    bundle1 = Bundle("Bundle A", 2, 1.5, conductor1)
+    geometry1 = Geometry("Geometry 1", 0, 0, 19.5, 0, 39, 0)
+
+    num_buses = rows * cols
+    order = rng.permutation(num_buses) if shuffle else np.arange(num_buses)
+    gen_buses = set(range(0, num_buses, gen_every)) - {0}
+    bus_names = [f"Bus {k}" for k in order]
+    bus_types = ["Slack Bus" if k == 0 else ("PV Bus" if k in gen_buses else "PQ Bus") for k in order]
+
+    line_from, line_to, line_length = [], [], []
+    for r in range(rows):
+        for c in range(cols):
+            k = r * cols + c
+            neighbours = []
+            if c + 1 < cols:
+                neighbours.append(k + 1)
+            if r + 1 < rows:
+                neighbours.append(k + cols)
+            if c + 1 < cols and r + 1 < rows and rng.random() < chord_fraction:
+                neighbours.append(k + cols + 1)
+            for m in neighbours:
+                line_from.append(f"Bus {k}")
+                line_to.append(f"Bus {m}")
+                line_length.append(float(rng.uniform(5, 15)))
+    line_names = [f"Line {i + 1}" for i in range(len(line_from))]
+
+    load_mw, load_mvar = 20.0, 8.0
+    total_load = load_mw * (num_buses - 1 - len(gen_buses))
+    gen_mw = 0.6 * total_load / max(len(gen_buses), 1)
+    gen_at = [0] + sorted(gen_buses)
+    gen_names = [f"G {k}" for k in gen_at]
+    gen_bus_names = [f"Bus {k}" for k in gen_at]
+    gen_setpoints = [0.0] + [gen_mw] * len(gen_buses)
+    load_at = [k for k in range(1, num_buses) if k not in gen_buses]
+    load_names = [f"Load {k}" for k in load_at]
+    load_bus_names = [f"Bus {k}" for k in load_at]
+
+    return dict(bus_names=bus_names, bus_types=bus_types, line_names=line_names, line_from=line_from,
+                line_to=line_to, line_length=line_length, bundle=bundle1, geometry=geometry1,
+                gen_names=gen_names, gen_bus_names=gen_bus_names, gen_setpoints=gen_setpoints,
+                load_names=load_names, load_bus_names=load_bus_names, load_mw=load_mw, load_mvar=load_mvar)
+
+
+def populate_mesh_circuit(circuit, columns, bulk: bool = True):
+    """
+    Add the elements described by mesh_columns() to a circuit, in bulk or one add_* call at a time.
+    """
+    bus_names, bus_types = columns['bus_names'], columns['bus_types']
+    line_names, line_from, line_to = columns['line_names'], columns['line_from'], columns['line_to']
+    line_length, bundle1, geometry1 = columns['line_length'], columns['bundle'], columns['geometry']
+    gen_names, gen_bus_names, gen_setpoints = columns['gen_names'], columns['gen_bus_names'], columns['gen_setpoints']
+    load_names, load_bus_names = columns['load_names'], columns['load_bus_names']
+    load_mw, load_mvar = columns['load_mw'], columns['load_mvar']
+
+    if bulk:
+        circuit.add_buses(bus_names, 230, bus_types)
+        circuit.add_transmission_lines(line_names, line_from, line_to, bundle1, geometry1, line_length)
+        circuit.add_generators(gen_names, gen_bus_names, 1.0, gen_setpoints, 0.12, 0.14, 0.05, 100,
+                               grounded=True, ground_r_pu=0)
+        circuit.add_loads(load_names, load_bus_names, load_mw, load_mvar)
+        return circuit
+
+    for bus_name, bus_type in zip(bus_names, bus_types):
+        circuit.add_bus(bus_name, 230, bus_type)
+    for line_name, bus1, bus2, length in zip(line_names, line_from, line_to, line_length):
+        circuit.add_transmission_line(line_name, bus1, bus2, bundle1, geometry1, length)
+    for gen_name, bus_name, mw in zip(gen_names, gen_bus_names, gen_setpoints):
+        circuit.add_generator(gen_name, bus_name, 1.0, mw, 0.12, 0.14, 0.05, 100, grounded=True, ground_r_pu=0)
+    for load_name, bus_name in zip(load_names, load_bus_names):
+        circuit.add_load(load_name, bus_name, load_mw, load_mvar)
+    return circuit
+
+
+if __name__ == '__main__':
+    mesh = build_mesh_circuit(10, 10)
+    print(mesh.compile())
+    print(build_seven_bus_circuit().compile())
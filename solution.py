@@ -1,5 +1,20 @@
 import numpy as np
 
+
+def calc_power_injections(ybus, vpu, delta):
+    """
+    Complex power injected at every bus, S = V * conj(Ybus V), in one matrix-vector product.
+
+    :param ybus: (N, N) dense array or scipy sparse Ybus
+    :param vpu: (N,) voltage magnitudes in pu
+    :param delta: (N,) voltage angles in degrees
+    :return: P, Q (N,) arrays in pu
+    """
+    V = np.asarray(vpu, dtype=float) * np.exp(1j * np.radians(np.asarray(delta, dtype=float)))
+    S = V * np.conj(ybus @ V)
+    return S.real, S.imag
+
+
 class Solution:
     def __init__(self, buses, ybus, voltages):
         """
@@ -11,31 +26,85 @@ class Solution:
         self.buses = buses
         self.ybus = ybus
         self.voltages = voltages
+        self.network = None  # CompiledNetwork snapshot, when the circuit can compile one
+        self.topology = None  # Islands found by the circuit's topology processor
 
-    def initialize_system(self, circuit):
+    def initialize_system(self, circuit, warm_start: bool = False):
         """
         Initializes the bus voltage settings, sets loads and generator injections,
         and generates the Ybus matrix for power flow analysis.
+        :param warm_start: keep the voltages and angles already on the buses (e.g. the previous
+                           converged solution) instead of resetting them to a flat start
         """
-        for bus in circuit.buses.values():
-            bus.vpu = 1.0
-            bus.delta = 0.0
-
-        for load in circuit.loads.values():
-            load.bus.P_spec -= load.real_power / 100
-            load.bus.Q_spec -= load.reactive_power / 100
-
-        for gen in circuit.generators.values():
-            gen.bus.P_spec += gen.mw_setpoint / 100
+        if not warm_start:
+            for bus in circuit.buses.values():
+                bus.vpu = 1.0
+                bus.delta = 0.0
+
+        if hasattr(circuit, 'compile'):
+            # Injections are assigned from the compiled snapshot, so initializing the same circuit
+            # (or a fork of a solved one) again does not accumulate them
+            self.network = circuit.compile()
+            for bus, s_bus in zip(circuit.buses.values(), self.network.sbus):
+                bus.P_spec = s_bus.real
+                bus.Q_spec = s_bus.imag
+        else:
+            self.network = None
+            for load in circuit.loads.values():
+                load.bus.P_spec -= load.real_power / 100
+                load.bus.Q_spec -= load.reactive_power / 100
+
+            for gen in circuit.generators.values():
+                gen.bus.P_spec += gen.mw_setpoint / 100
+
+        # Islands are found before any matrix is built or solved
+        self.topology = circuit.find_islands() if hasattr(circuit, 'find_islands') else None
 
         circuit.calc_ybus_powerflow()
         self.buses = list(circuit.buses.values())
         self.ybus = circuit.get_ybus_powerflow()
         self.voltages = [bus.vpu for bus in self.buses]
 
+    def get_state(self):
+        """
+        :return: vpu, delta arrays of the current bus voltages (pu) and angles (degrees)
+        """
+        count = len(self.buses)
+        vpu = np.fromiter((bus.vpu for bus in self.buses), dtype=float, count=count)
+        delta = np.fromiter((bus.delta for bus in self.buses), dtype=float, count=count)
+        return vpu, delta
+
+    def set_state(self, vpu, delta):
+        """
+        Write voltages (pu) and angles (degrees) onto every bus.
+        """
+        for bus, v, d in zip(self.buses, np.asarray(vpu, dtype=float).tolist(), np.asarray(delta, dtype=float).tolist()):
+            bus.vpu, bus.delta = v, d
+        self.voltages = [bus.vpu for bus in self.buses]
+
+    def get_injections(self):
+        """
+        :return: P_spec, Q_spec arrays of the specified net injections (pu)
+        """
+        count = len(self.buses)
+        p_spec = np.fromiter((bus.P_spec for bus in self.buses), dtype=float, count=count)
+        q_spec = np.fromiter((bus.Q_spec for bus in self.buses), dtype=float, count=count)
+        return p_spec, q_spec
+
+    def compute_power_injections(self, angles=None):
+        """
+        Calculates the real and reactive power injected at every bus.
+        :param angles: voltage angles in degrees, taken from the buses if None
+        :return: P, Q arrays (pu)
+        """
+        if angles is None:
+            angles = [bus.delta for bus in self.buses]
+        return calc_power_injections(self.ybus, self.voltages, angles)
+
     def compute_power_injection(self, bus_k_index, angles):
         """
-        Calculates the real and reactive power injected at a given bus index.
+        Calculates the real and reactive power injected at a given bus index, term by term.
+        Reference for compute_power_injections; solvers use the vectorized version.
         :param bus_k_index: index of the bus to calculate power injection for
         :param angles: list of voltage angles in degrees
         :return: P_k, Q_k real and reactive power at the bus (pu)
@@ -59,18 +128,36 @@ class Solution:
     def compute_power_mismatch_vector(self):
         """
         Computes mismatch vector ΔP and ΔQ for non-slack buses.
+        ΔP is zero at the slack bus and ΔQ is zero at slack and PV buses.
+        :return: numpy arrays delta_P, delta_Q
+        """
+        P_calc, Q_calc = self.compute_power_injections()
+        count = len(self.buses)
+        P_spec = np.fromiter((bus.P_spec for bus in self.buses), dtype=float, count=count)
+        Q_spec = np.fromiter((bus.Q_spec for bus in self.buses), dtype=float, count=count)
+        is_pv_pq = np.fromiter((bus.bus_type != "Slack Bus" for bus in self.buses), dtype=bool, count=count)
+        is_pq = np.fromiter((bus.bus_type == "PQ Bus" for bus in self.buses), dtype=bool, count=count)
+
+        delta_P = np.where(is_pv_pq, P_spec - P_calc, 0.0)
+        delta_Q = np.where(is_pv_pq & is_pq, Q_spec - Q_calc, 0.0)
+        return delta_P, delta_Q
+
+    def compute_power_mismatch_vector_reference(self):
+        """
+        Per-bus loop version of compute_power_mismatch_vector, the reference in tests/test_numerics.py.
         :return: numpy arrays delta_P, delta_Q
         """
         delta_P, delta_Q = [], []
         angles = [bus.delta for bus in self.buses]
 
-        for bus in self.buses:
+        # Position in the bus list is the Ybus row; Bus.index counts buses across every circuit created
+        for i, bus in enumerate(self.buses):
             if bus.bus_type == "Slack Bus":
                 delta_P.append(0)
                 delta_Q.append(0)
                 continue
 
-            P_calc, Q_calc = self.compute_power_injection(bus.index, angles)
+            P_calc, Q_calc = self.compute_power_injection(i, angles)
             dP = bus.P_spec - P_calc
             dQ = bus.Q_spec - Q_calc if bus.bus_type == "PQ Bus" else 0
             delta_P.append(dP)
@@ -124,49 +211,9 @@ class Solution:
 
 if __name__ == "__main__":
 
-    from circuit import Circuit
-    from conductor import Conductor
-    from bundle import Bundle
-    from geometry import Geometry
-
-    # Create circuit
-    circuit1 = Circuit("Circuit")
-
-    # Add Buses
-    circuit1.add_bus("Bus 1", 20, "Slack Bus")
-    circuit1.add_bus("Bus 2", 230, "PQ Bus")
-    circuit1.add_bus("Bus 3", 230, "PQ Bus")
-    circuit1.add_bus("Bus 4", 230, "PQ Bus")
-    circuit1.add_bus("Bus 5", 230, "PQ Bus")
-    circuit1.add_bus("Bus 6", 230, "PQ Bus")
-    circuit1.add_bus("Bus 7", 18, "PV Bus")
-
-    # Add Transformers
-    circuit1.add_transformer("T1", "Bus 1", "Bus 2", 125, 8.5, 10, 100)
-    circuit1.add_transformer("T2", "Bus 6", "Bus 7", 200, 10.5, 12, 100)
-
-    # Add Transmission Line Parameters
-    conductor1 = Conductor("Partridge", 0.642, 0.0217, 0.385, 460)
-    bundle1 = Bundle("Bundle A", 2, 1.5, conductor1)
-    geometry1 = Geometry("Geometry 1", 0, 0, 19.5, 0, 39, 0)
-
-    # Add Transmission Lines
-    circuit1.add_transmission_line("Line 1", "Bus 2", "Bus 4", bundle1, geometry1, 10)
-    circuit1.add_transmission_line("Line 2", "Bus 2", "Bus 3", bundle1, geometry1, 25)
-    circuit1.add_transmission_line("Line 3", "Bus 3", "Bus 5", bundle1, geometry1, 20)
-    circuit1.add_transmission_line("Line 4", "Bus 4", "Bus 6", bundle1, geometry1, 20)
-    circuit1.add_transmission_line("Line 5", "Bus 5", "Bus 6", bundle1, geometry1, 10)
-    circuit1.add_transmission_line("Line 6", "Bus 4", "Bus 5", bundle1, geometry1, 35)
-
-    # Add Load
-    circuit1.add_load("Load 3", "Bus 3", 110, 50)
-    circuit1.add_load("Load 4", "Bus 4", 100, 70)
-    circuit1.add_load("Load 5", "Bus 5", 100, 65)
-
-    # Add Generator
-    circuit1.add_generator("G1", "Bus 1", 1.0, 113.56)
-    circuit1.add_generator("G2", "Bus 7", 1.0, 200)
-    ### Add rated voltage to generator class
+    from sample_networks import build_seven_bus_circuit
+
+    circuit1 = build_seven_bus_circuit()
 
     # Run validation
     solution = Solution(buses=[], ybus=None, voltages=[])
@@ -174,6 +221,8 @@ if __name__ == "__main__":
 
     # Power Mismatch
     delta_P, delta_Q = solution.compute_power_mismatch_vector()
+    reference_P, reference_Q = solution.compute_power_mismatch_vector_reference()
+    assert np.allclose(delta_P, reference_P) and np.allclose(delta_Q, reference_Q)
 
     print("\n--- Power Mismatch ---")
     for i, bus in enumerate(solution.buses):
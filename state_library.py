@@ -0,0 +1,115 @@
+from collections import OrderedDict
+import numpy as np
+
+
+class SolvedState:
+    """
+    One converged power flow state and the injections it was solved for.
+    """
+
+    __slots__ = ('injections', 'vpu', 'delta', 'flat_iterations')
+
+    def __init__(self, injections, vpu, delta, flat_iterations: int = None):
+        """
+        :param injections: (2N,) specified P then Q injections in pu
+        :param vpu: (N,) converged voltage magnitudes in pu
+        :param delta: (N,) converged voltage angles in degrees
+        :param flat_iterations: Newton iterations of a flat-start solve of these same injections, None if unknown
+        """
+        self.injections = injections
+        self.vpu = vpu
+        self.delta = delta
+        self.flat_iterations = flat_iterations
+
+
+class SolvedStateLibrary:
+    """
+    Bounded library of converged power flow states of one network, keyed by the injection vector
+    they were solved for. nearest() returns the stored state whose injections are closest
+    (Euclidean distance over P and Q) to a new case, to be used as its Newton-Raphson initial guess.
+    The least recently used state is evicted beyond maxsize.
+    """
+
+    def __init__(self, maxsize: int = 64, max_distance: float = np.inf):
+        """
+        :param maxsize: number of states kept
+        :param max_distance: states farther than this from the requested injections (pu) are not used
+        """
+        self.maxsize = maxsize
+        self.max_distance = max_distance
+        self._entries = OrderedDict() # insertion counter -> SolvedState
+        self._counter = 0
+        self._stacked = None # (keys, (M, 2N) injections) rebuilt after every change
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.history = [] # (distance or None, iterations, iterations saved or None) per solve
+
+    @staticmethod
+    def injection_key(p_spec, q_spec):
+        return np.concatenate((np.asarray(p_spec, dtype=float), np.asarray(q_spec, dtype=float)))
+
+    def _stack(self):
+        if self._stacked is None:
+            keys = list(self._entries)
+            injections = np.array([self._entries[key].injections for key in keys]) if keys else None
+            self._stacked = (keys, injections)
+        return self._stacked
+
+    def nearest(self, injections):
+        """
+        Return the stored state closest to the injection vector, or None if the library is empty
+        or the closest state is farther than max_distance.
+
+        :param injections: (2N,) P then Q injections, see injection_key
+        :return: (SolvedState, distance) or None
+        """
+        keys, stacked = self._stack()
+        if stacked is None:
+            self.misses += 1
+            return None
+        injections = np.asarray(injections, dtype=float)
+        if stacked.shape[1] != len(injections):
+            raise ValueError(f"Injection vector has {len(injections)} entries, the library holds {stacked.shape[1]}.")
+
+        distances = np.linalg.norm(stacked - injections, axis=1)
+        best = int(np.argmin(distances))
+        if distances[best] > self.max_distance:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(keys[best])
+        return self._entries[keys[best]], float(distances[best])
+
+    def add(self, injections, vpu, delta, flat_iterations: int = None):
+        """
+        Store a converged state, evicting the least recently used one if the library is full.
+        """
+        self._entries[self._counter] = SolvedState(np.array(injections, dtype=float), np.array(vpu, dtype=float),
+                                                   np.array(delta, dtype=float), flat_iterations)
+        self._counter += 1
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        self._stacked = None
+
+    def record(self, distance, iterations, saved):
+        self.history.append((distance, iterations, saved))
+
+    def clear(self):
+        self._entries.clear()
+        self._stacked = None
+        self.hits = self.misses = self.evictions = 0
+        self.history = []
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def iterations_saved(self):
+        # Total iterations saved by warm starts, over the solves whose flat-start count for the same injections was known
+        return sum(saved for _, _, saved in self.history if saved is not None)
+
+    def stats(self):
+        return {'size': len(self._entries), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'iterations_saved': self.iterations_saved}
@@ -0,0 +1,105 @@
+import numpy as np
+
+STEP_CONTROLS = ('none', 'iwamoto', 'line_search')
+
+
+def optimal_multiplier(mismatch, full_step_mismatch):
+    """
+    Iwamoto optimal multiplier for a Newton-Raphson step.
+
+    Along the Newton step the mismatch is F(μ) = (1 - μ) F0 + μ² F2, exactly so in rectangular
+    coordinates; the second order term F2 is taken as the mismatch after the full step, F(1).
+    μ minimizes ||F(μ)||², a real root of a cubic. Near 1 on well conditioned cases, it shrinks
+    towards zero as the case approaches the point where no solution exists.
+
+    :param mismatch: (M,) mismatch vector F0 the Newton step was solved for
+    :param full_step_mismatch: (M,) mismatch vector after the full step, F(1)
+    :return: step length μ, None if the cubic has no positive real root
+    """
+    a = np.asarray(mismatch, dtype=float)
+    b = -a
+    c = np.asarray(full_step_mismatch, dtype=float)
+
+    # d/dμ ||a + μb + μ²c||² / 2 = g3 μ³ + g2 μ² + g1 μ + g0
+    g3 = 2 * c @ c
+    g2 = 3 * b @ c
+    g1 = b @ b + 2 * a @ c
+    g0 = a @ b
+    roots = np.roots([g3, g2, g1, g0]) if g3 > 0 else np.array([-g0 / g1])
+    roots = roots[(np.abs(roots.imag) < 1e-9) & (roots.real > 0)].real
+    if len(roots) == 0:
+        return None
+
+    # Of several stationary points keep the one with the smallest norm
+    norms = [np.linalg.norm(a + mu * b + mu ** 2 * c) for mu in roots]
+    return float(roots[int(np.argmin(norms))])
+
+
+class StepControl:
+    """
+    Step length control for Newton-Raphson. 'none' takes the full Newton step, 'iwamoto' scales it
+    by the optimal multiplier when the full step would not reduce the mismatch, 'line_search' halves it until the 2-norm of the mismatch drops
+    enough (Armijo condition). On heavily loaded cases both damp the overshoot that makes the full
+    step diverge. The optimal multiplier assumes the exact Newton step, so 'iwamoto' needs a fresh
+    Jacobian every iteration; 'line_search' also works with a reused (chord) factorization. A step stuck at min_step indicates that no solution may exist, and Newton-Raphson
+    gives up after stall_iterations such steps instead of running to max_iter.
+    """
+
+    def __init__(self, method: str = 'none', min_step: float = 0.05, max_step: float = 1.0,
+                 max_backtracks: int = 10, armijo: float = 1e-4, stall_iterations: int = 3):
+        """
+        :param method: 'none', 'iwamoto' or 'line_search'
+        :param min_step: smallest step length taken
+        :param max_step: largest step length taken by the optimal multiplier
+        :param max_backtracks: line search halvings before min_step is accepted
+        :param armijo: required fraction of the predicted mismatch reduction
+        :param stall_iterations: consecutive min_step steps after which the solve is abandoned (None to never)
+        """
+        if method not in STEP_CONTROLS:
+            raise ValueError(f"Unknown step control {method}. Choose from {', '.join(STEP_CONTROLS)}.")
+        self.method = method
+        self.min_step = min_step
+        self.max_step = max_step
+        self.max_backtracks = max_backtracks
+        self.armijo = armijo
+        self.stall_iterations = stall_iterations
+
+    @property
+    def enabled(self):
+        return self.method != 'none'
+
+    def step_length(self, vpu, delta, delta_v, delta_theta, mismatch, evaluate):
+        """
+        :param vpu: (N,) voltage magnitudes in pu
+        :param delta: (N,) voltage angles in radians
+        :param delta_v: (N,) Newton magnitude update in pu, zero at slack and PV buses
+        :param delta_theta: (N,) Newton angle update in radians, zero at the slack bus
+        :param mismatch: (M,) mismatch vector [ΔP(pv_pq) | ΔQ(pq)] the step was solved for
+        :param evaluate: function (vpu, delta) -> mismatch vector
+        :return: step length μ to apply to the Newton update
+        """
+        if self.method == 'iwamoto':
+            full_step_mismatch = evaluate(vpu + delta_v, delta + delta_theta)
+            # A full step that already reduces the mismatch is taken as is, keeping Newton's quadratic convergence
+            if np.linalg.norm(full_step_mismatch) < np.linalg.norm(mismatch):
+                return 1.0
+            mu = optimal_multiplier(mismatch, full_step_mismatch)
+            return self.min_step if mu is None else float(np.clip(mu, self.min_step, self.max_step))
+
+        if self.method == 'line_search':
+            norm = np.linalg.norm(mismatch)
+            mu = 1.0
+            for _ in range(self.max_backtracks):
+                trial = evaluate(vpu + mu * delta_v, delta + mu * delta_theta)
+                if np.linalg.norm(trial) <= (1 - self.armijo * mu) * norm or mu <= self.min_step:
+                    break
+                mu = max(mu / 2, self.min_step)
+            return mu
+
+        return 1.0
+
+    def stalled(self, step_lengths):
+        # True once the last stall_iterations steps were all cut to min_step
+        k = self.stall_iterations
+        return (self.enabled and k is not None and len(step_lengths) >= k
+                and all(step <= self.min_step for step in step_lengths[-k:]))
@@ -0,0 +1,258 @@
+import contextlib
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from powerflow import PowerFlow
+from solution import Solution
+
+# Thread-count variables read by OpenBLAS, MKL, Accelerate and OpenMP when NumPy/SciPy load
+BLAS_THREAD_VARIABLES = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS',
+                         'VECLIB_MAXIMUM_THREADS', 'NUMEXPR_NUM_THREADS')
+
+
+class Scenario:
+    """
+    Changes to a base circuit for one power flow of a sweep. Anything left at its default keeps
+    the base circuit's value.
+    """
+
+    __slots__ = ('name', 'load_scale', 'loads', 'generators', 'solar', 'outages')
+
+    def __init__(self, name: str = None, load_scale: float = 1.0, loads: dict = None, generators: dict = None,
+                 solar: dict = None, outages=()):
+        """
+        :param name: label of the scenario
+        :param load_scale: factor applied to every load's P and Q
+        :param loads: load name -> factor applied to that load on top of load_scale
+        :param generators: generator name -> MW setpoint
+        :param solar: bus name -> solar PV output in MW, injected at a PV or PQ bus (a slack bus
+                      takes up the power balance, so solar there is rejected with a ValueError)
+        :param outages: names of transformers and transmission lines taken out of service
+        """
+        self.name = name
+        self.load_scale = load_scale
+        self.loads = loads or {}
+        self.generators = generators or {}
+        self.solar = solar or {}
+        self.outages = tuple(outages)
+
+    def apply(self, circuit):
+        """
+        Write the load, generator and outage changes onto a circuit (a fork of the base circuit).
+        Solar output is injected after the power flow is initialized, see solve_scenario.
+        """
+        for load_name, load in circuit.loads.items():
+            scale = self.load_scale * self.loads.get(load_name, 1.0)
+            if scale != 1.0:
+                circuit.set_load(load_name, load.real_power * scale, load.reactive_power * scale)
+        for gen_name, mw_setpoint in self.generators.items():
+            circuit.set_generator_setpoint(gen_name, mw_setpoint=mw_setpoint)
+        for branch_name in self.outages:
+            if branch_name in circuit.transmission_lines:
+                circuit.switch_transmission_line(branch_name, False)
+            elif branch_name in circuit.transformer:
+                circuit.switch_transformer(branch_name, False)
+            else:
+                raise ValueError(f"Branch {branch_name} does not exist in the circuit.")
+
+    def __repr__(self):
+        return f"Scenario({self.name!r})"
+
+
+class SweepResult:
+    """
+    Power flow results of a sweep, one row per scenario in the order the scenarios were given.
+    """
+
+    __slots__ = ('bus_names', 'vpu', 'delta', 'iterations', 'converged', 'solve_time', 'errors')
+
+    def __init__(self, bus_names, count: int):
+        self.bus_names = list(bus_names)
+        self.vpu = np.full((count, len(self.bus_names)), np.nan) # pu, NaN where not converged
+        self.delta = np.full((count, len(self.bus_names)), np.nan) # degrees
+        self.iterations = np.zeros(count, dtype=np.int32) # 0 where not converged
+        self.converged = np.zeros(count, dtype=bool)
+        self.solve_time = np.zeros(count) # seconds per scenario, in its worker
+        self.errors = [None] * count # why a scenario could not be solved (e.g. an unknown bus), None if it was
+
+    @property
+    def failed(self):
+        # Indices of the scenarios that raised instead of being solved
+        return [k for k, error in enumerate(self.errors) if error is not None]
+
+    def __str__(self):
+        return (f"SweepResult(scenarios={len(self.converged)}, converged={int(self.converged.sum())}, "
+                f"failed={len(self.failed)}, buses={len(self.bus_names)})")
+
+
+def solve_scenario(base, scenario: Scenario, tol: float = 1e-6, max_iter: int = 30):
+    """
+    Newton-Raphson power flow of one scenario on a fork of the base circuit, which shares the
+    base's cached Ybus and factorizations until the scenario changes them.
+
+    :return: vpu, delta, iterations (None if not converged), solve time in seconds
+    """
+    start = time.perf_counter()
+    circuit = base.fork(scenario.name)
+    scenario.apply(circuit)
+    solution = Solution(buses=[], ybus=None, voltages=[])
+    solution.initialize_system(circuit)
+    islands = solution.topology.islands if solution.topology is not None else []
+    slack_buses = {solution.buses[island.slack].name for island in islands if island.energized}
+    for bus_name, mw in scenario.solar.items():
+        if bus_name not in circuit.buses:
+            raise ValueError(f"Bus {bus_name} does not exist in the circuit.")
+        if bus_name in slack_buses or circuit.buses[bus_name].bus_type == "Slack Bus":
+            raise ValueError(f"Bus {bus_name} is a slack bus; solar output there would be ignored.")
+        circuit.buses[bus_name].P_spec += mw / solution.network.s_base
+
+    powerflow = PowerFlow(solution, tol, max_iter, verbose=False)
+    powerflow.calc_newton_raphson()
+    vpu, delta = solution.get_state()
+    return vpu, delta, powerflow.iterations, time.perf_counter() - start
+
+
+# Per-process state of a sweep worker: the base circuit and solver settings, set once by _init_worker
+_worker = {}
+
+
+def _init_worker(base, build_args, tol, max_iter):
+    # Build (or unpickle) the base circuit once per worker and warm its Ybus cache
+    circuit = base(*build_args) if callable(base) else base
+    Solution(buses=[], ybus=None, voltages=[]).initialize_system(circuit)
+    _worker.update(circuit=circuit, tol=tol, max_iter=max_iter)
+
+
+def _worker_bus_names():
+    return list(_worker['circuit'].buses)
+
+
+def _solve_chunk(start, scenarios):
+    # Solve consecutive scenarios and return them as stacked arrays. A scenario that raises is
+    # recorded with its error and left unconverged, so one bad scenario does not lose the chunk.
+    count, num_buses = len(scenarios), len(_worker['circuit'].buses)
+    vpu, delta = np.full((count, num_buses), np.nan), np.full((count, num_buses), np.nan)
+    iterations, solve_time = np.zeros(count, dtype=np.int32), np.zeros(count)
+    errors = [None] * count
+    for k, scenario in enumerate(scenarios):
+        try:
+            v, d, its, elapsed = solve_scenario(_worker['circuit'], scenario, _worker['tol'], _worker['max_iter'])
+        except Exception as error:
+            errors[k] = f"{type(error).__name__}: {error}"
+            continue
+        solve_time[k] = elapsed
+        if its is not None:
+            vpu[k], delta[k], iterations[k] = v, d, its
+    return start, vpu, delta, iterations, solve_time, errors
+
+
+@contextlib.contextmanager
+def pinned_blas_threads(threads: int):
+    """
+    Set the BLAS/OpenMP thread-count variables for processes started inside the block, then
+    restore them. Workers are spawned, so their NumPy and SciPy load with these limits.
+    """
+    saved = {name: os.environ.get(name) for name in BLAS_THREAD_VARIABLES}
+    os.environ.update({name: str(threads) for name in BLAS_THREAD_VARIABLES})
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+class SweepRunner:
+    """
+    The SweepRunner class solves a list of Scenarios of one base circuit on a process pool.
+
+    Each worker process receives the base circuit (or builds it) once, when it starts, and solves
+    every scenario on a fork of it, so Ybus and its factorizations are shared by all scenarios
+    that keep the base topology. Scenarios are sent in chunks and come back as stacked arrays,
+    assembled in scenario order. A scenario that raises (an unknown bus or branch, solar at a
+    slack bus) is reported in SweepResult.errors instead of aborting the sweep. BLAS threads are pinned per worker so that the workers do not
+    oversubscribe the cores.
+    """
+
+    def __init__(self, base, build_args=(), max_workers: int = None, blas_threads: int = 1,
+                 tol: float = 1e-6, max_iter: int = 30, chunksize: int = None, bus_names=None):
+        """
+        :param base: Circuit, or a picklable function returning one (e.g. a module-level builder)
+        :param build_args: positional arguments for base when it is a function
+        :param max_workers: worker processes, os.cpu_count() if None
+        :param blas_threads: BLAS/OpenMP threads per worker
+        :param tol: power flow mismatch tolerance in pu
+        :param max_iter: maximum Newton-Raphson iterations per scenario
+        :param chunksize: scenarios per task, about four tasks per worker if None
+        :param bus_names: bus names of the base circuit in Ybus order; read from the circuit, or from
+                          a worker when base is a function, if None
+        """
+        self.base = base
+        self.build_args = tuple(build_args)
+        self.max_workers = max_workers if max_workers is not None else os.cpu_count()
+        self.blas_threads = blas_threads
+        self.tol = tol
+        self.max_iter = max_iter
+        self.chunksize = chunksize
+        if bus_names is None and not callable(base):
+            bus_names = list(base.buses)
+        self.bus_names = None if bus_names is None else list(bus_names)
+
+    def run(self, scenarios) -> SweepResult:
+        """
+        Solve every scenario.
+
+        :param scenarios: sequence of Scenario
+        :return: SweepResult with rows in the order of scenarios
+        """
+        scenarios = list(scenarios)
+        if not scenarios and self.bus_names is not None:
+            return SweepResult(self.bus_names, 0)
+
+        chunksize = self.chunksize or max(1, -(-len(scenarios) // (4 * self.max_workers)))
+        chunks = [(start, scenarios[start:start + chunksize]) for start in range(0, len(scenarios), chunksize)]
+        with pinned_blas_threads(self.blas_threads):
+            with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_init_worker,
+                                     initargs=(self.base, self.build_args, self.tol, self.max_iter)) as pool:
+                # A built base circuit only exists in the workers, so one of them reports its bus names
+                names = pool.submit(_worker_bus_names) if self.bus_names is None else None
+                futures = [pool.submit(_solve_chunk, start, chunk) for start, chunk in chunks]
+                if names is not None:
+                    self.bus_names = names.result()
+                result = SweepResult(self.bus_names, len(scenarios))
+                for future in futures:
+                    start, vpu, delta, iterations, solve_time, errors = future.result()
+                    rows = slice(start, start + len(vpu))
+                    result.vpu[rows], result.delta[rows] = vpu, delta
+                    result.iterations[rows], result.solve_time[rows] = iterations, solve_time
+                    result.errors[rows] = errors
+        result.converged = result.iterations > 0
+        return result
+
+
+if __name__ == '__main__':
+    from sample_networks import build_seven_bus_circuit
+
+    # Load levels, a generator redispatch, solar at Bus 4, a line outage and an outage of a line the
+    # seven bus case does not have, which is reported without stopping the sweep
+    sweep_scenarios = [Scenario(f"load x{scale:.2f}", load_scale=scale) for scale in np.linspace(0.8, 1.2, 5)]
+    sweep_scenarios += [Scenario("G2 at 150 MW", generators={"G2": 150}),
+                        Scenario("50 MW solar at Bus 4", solar={"Bus 4": 50}),
+                        Scenario("Line 6 out", outages=["Line 6"]),
+                        Scenario("Line 9 out", outages=["Line 9"])]
+
+    runner = SweepRunner(build_seven_bus_circuit, max_workers=2)
+    sweep = runner.run(sweep_scenarios)
+    print(sweep)
+    for scenario, vpu, iterations, error in zip(sweep_scenarios, sweep.vpu, sweep.iterations, sweep.errors):
+        if error is not None:
+            print(f"{scenario.name:22s} | {error}")
+        else:
+            print(f"{scenario.name:22s} | {iterations} iterations | min V = {np.nanmin(vpu):.5f} pu")
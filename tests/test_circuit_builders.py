@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from circuit import Circuit
+from sample_networks import mesh_columns, populate_mesh_circuit
+
+
+def test_single_bus_name_is_broadcast():
+    circuit = Circuit("Test")
+    circuit.add_buses(["Bus 1", "Bus 2", "Bus 3"], 230, ["Slack Bus", "PQ Bus", "PQ Bus"])
+    circuit.add_loads(["L1", "L2"], "Bus 3", 10, 5)
+    circuit.add_generators(["G1", "G2"], "Bus 1", 1.0, [50, 60], 0.12, 0.14, 0.05, 100)
+    assert [load.bus.name for load in circuit.loads.values()] == ["Bus 3", "Bus 3"]
+    assert [gen.bus.name for gen in circuit.generators.values()] == ["Bus 1", "Bus 1"]
+
+
+def test_unknown_bus_is_reported_by_name():
+    circuit = Circuit("Test")
+    circuit.add_buses(["Bus 1"], 230, "Slack Bus")
+    with pytest.raises(ValueError, match="Bus 9"):
+        circuit.add_loads(["L1"], "Bus 9", 10, 5)
+
+
+def test_bulk_and_per_element_builds_match():
+    columns = mesh_columns(6, 6)
+    bulk = populate_mesh_circuit(Circuit("Bulk"), columns, True)
+    single = populate_mesh_circuit(Circuit("Single"), columns, False)
+    assert list(bulk.buses) == list(single.buses)
+    assert list(bulk.transmission_lines) == list(single.transmission_lines)
+    assert np.allclose(bulk.get_ybus_sparse('positive').toarray(), single.get_ybus_sparse('positive').toarray())
+    assert np.allclose(bulk.compile().sbus, single.compile().sbus)
@@ -0,0 +1,46 @@
+import contextlib
+import io
+
+import numpy as np
+
+from dc_powerflow import DCPowerFlow
+from fast_decoupled import decoupled_b_matrices
+from powerflow import PowerFlow
+from sample_networks import build_seven_bus_circuit
+from solution import Solution
+
+
+def initialized(circuit):
+    solution = Solution(buses=[], ybus=None, voltages=[])
+    solution.initialize_system(circuit)
+    return solution
+
+
+def test_dc_bbus_matches_fast_decoupled_b_prime():
+    circuit = build_seven_bus_circuit()
+    dc = DCPowerFlow.from_circuit(circuit)
+    b_prime, _ = decoupled_b_matrices(circuit.get_ybus_sparse('positive'), 'XB')
+    assert np.allclose(dc.bbus.toarray(), b_prime.toarray())
+
+
+def test_dc_start_uses_dc_powerflow_angles():
+    circuit = build_seven_bus_circuit()
+    solution = initialized(circuit)
+    PowerFlow(solution, 1e-6, 30).set_dc_angles()
+    expected = DCPowerFlow.from_circuit(circuit).solve()
+    assert np.allclose([bus.delta for bus in solution.buses], expected)
+
+
+def test_dc_start_on_islands_converges_to_flat_start_solution():
+    def solve(dc_start):
+        circuit = build_seven_bus_circuit()
+        circuit.switch_transmission_line("Line 4", False)
+        circuit.switch_transmission_line("Line 5", False)
+        solution = initialized(circuit)
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert PowerFlow(solution, 1e-8, 30).calc_newton_raphson(dc_start=dc_start)
+        return solution.get_state()
+
+    (vpu_flat, delta_flat), (vpu_dc, delta_dc) = solve(False), solve(True)
+    assert np.allclose(vpu_flat, vpu_dc, atol=1e-6)
+    assert np.allclose(delta_flat, delta_dc, atol=1e-4)
@@ -0,0 +1,36 @@
+from powerflow import PowerFlow
+from sample_networks import build_seven_bus_circuit
+from solution import Solution
+
+
+def split_circuit():
+    # Opening both lines into Bus 6 separates Bus 6 and Bus 7 (with G2) from the rest
+    circuit = build_seven_bus_circuit()
+    circuit.switch_transmission_line("Line 4", False)
+    circuit.switch_transmission_line("Line 5", False)
+    return circuit
+
+
+def test_islands_solve_independently():
+    solution = Solution(buses=[], ybus=None, voltages=[])
+    solution.initialize_system(split_circuit())
+    powerflow = PowerFlow(solution, 1e-6, 30)
+    assert powerflow.calc_newton_raphson()
+    assert set(powerflow.island_iterations) == {0, 1}
+    assert all(iterations is not None for iterations in powerflow.island_iterations.values())
+
+
+def test_fault_skips_other_islands(capsys):
+    split_circuit().run_sym_fault(3)
+    output = capsys.readouterr().out
+    assert "Bus 6: island 1, not connected to the faulted bus" in output
+    assert "Bus 7: island 1, not connected to the faulted bus" in output
+
+
+def test_fault_prints_dead_buses_at_zero(capsys):
+    # Opening both lines into Bus 3 leaves it without a source
+    circuit = build_seven_bus_circuit()
+    circuit.switch_transmission_line("Line 2", False)
+    circuit.switch_transmission_line("Line 3", False)
+    circuit.run_sym_fault(4)
+    assert "Bus 3: de-energized, Va = Vb = Vc = 0 pu" in capsys.readouterr().out
@@ -0,0 +1,75 @@
+import numpy as np
+
+from bus import Bus
+from bundle import Bundle
+from conductor import Conductor
+from geometry import Geometry
+from line_constants import LineConstantCache, PerMileConstants, LineConstants
+from line_design import BUNDLE_SIZES, LineDesignSweep
+from transmissionline import TransmissionLine
+
+
+def partridge_line():
+    conductor = Conductor("Partridge", 0.642, 0.0217, 0.385, 460)
+    return Bundle("Bundle A", 2, 1.5, conductor), Geometry("Geometry 1", 0, 0, 19.5, 0, 39, 0)
+
+
+def test_per_mile_constants_match_bundle_and_geometry():
+    bundle, geometry = partridge_line()
+    constants = PerMileConstants(bundle, geometry)
+    expected = LineConstants.from_parameters(0.385 / 2, bundle.DSL, bundle.DSC, geometry.Deq, 1.0, 230)
+    assert np.isclose(constants.z1, expected.z_per_mile)
+    assert np.isclose(constants.y_shunt, expected.y_per_mile)
+
+
+def test_cache_hits_for_equal_parameters():
+    cache = LineConstantCache()
+    first = cache.get(*partridge_line())
+    second = cache.get(*partridge_line())
+    assert second is first
+    assert cache.stats()['hits'] == 1
+
+
+def test_edited_bundle_gives_new_constants():
+    cache = LineConstantCache()
+    bundle, geometry = partridge_line()
+    before = cache.get(bundle, geometry)
+
+    bundle.spacing = 3.0
+    after = cache.get(bundle, geometry)
+    assert after.x < before.x
+    assert np.isclose(after.z1, PerMileConstants(Bundle("Bundle B", 2, 3.0, bundle.conductor), geometry).z1)
+
+    # The original parameters still map to the original constants
+    bundle.spacing = 1.5
+    assert cache.get(bundle, geometry) is before
+
+
+def test_edited_geometry_gives_new_constants():
+    cache = LineConstantCache()
+    bundle, geometry = partridge_line()
+    before = cache.get(bundle, geometry)
+
+    geometry.xc = 60
+    after = cache.get(bundle, geometry)
+    assert after.x > before.x
+    assert np.isclose(after.y_shunt, PerMileConstants(bundle, Geometry("Geometry 2", 0, 0, 19.5, 0, 60, 0)).y_shunt)
+
+
+def test_batched_line_constants_match_each_line():
+    bundle, geometry = partridge_line()
+    bus_a, bus_b = Bus("Bus A", 230, "PQ Bus"), Bus("Bus B", 230, "PQ Bus")
+    tlines = [TransmissionLine(f"Line {i}", bus_a, bus_b, bundle, geometry, length)
+              for i, length in enumerate((5.0, 12.5, 40.0))]
+    batch = LineConstants.from_lines(tlines)
+    assert np.allclose(batch.sequence_admittances_pu.T, [tline.calc_sequence_admittances() for tline in tlines])
+
+
+def test_design_sweep_matches_per_mile_constants():
+    conductor = Conductor("Partridge", 0.642, 0.0217, 0.385, 460)
+    geometry = Geometry("Geometry 1", 0, 0, 19.5, 0, 39, 0)
+    sweep = LineDesignSweep([conductor], [geometry], base_kv=230, spacings=(1.5,))
+    for k, n in enumerate(BUNDLE_SIZES):
+        reference = PerMileConstants(Bundle("Bundle", n, 1.5, conductor), geometry)
+        assert np.isclose(sweep.z_per_mile[0, k, 0, 0], reference.z1)
+        assert np.isclose(sweep.y_per_mile[0, k, 0, 0], reference.y_shunt)
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from batch_powerflow import BatchPowerFlow
+from jacobian import Jacobian
+from powerflow import PowerFlow
+from sample_networks import build_seven_bus_circuit, build_mesh_circuit
+from solution import Solution
+
+CASES = [pytest.param(build_seven_bus_circuit, id="7 bus"),
+         pytest.param(lambda: build_mesh_circuit(6, 6), id="6x6 mesh")]
+
+
+def initialized(circuit):
+    solution = Solution(buses=[], ybus=None, voltages=[])
+    solution.initialize_system(circuit)
+    return solution
+
+
+def perturbed(circuit):
+    # A non-flat state so every off-diagonal term of the mismatch and the Jacobian contributes
+    solution = initialized(circuit)
+    rng = np.random.default_rng(1)
+    vpu, delta = solution.get_state()
+    unknown = np.array([bus.bus_type != "Slack Bus" for bus in solution.buses])
+    pq = np.array([bus.bus_type == "PQ Bus" for bus in solution.buses])
+    solution.set_state(np.where(pq, vpu + rng.uniform(-0.05, 0.05, len(vpu)), vpu),
+                       np.where(unknown, delta + rng.uniform(-10, 10, len(delta)), delta))
+    return solution
+
+
+def solved_state(circuit, method, **options):
+    solution = initialized(circuit)
+    assert getattr(PowerFlow(solution, 1e-8, 50, verbose=False), method)(**options)
+    return solution.get_state()
+
+
+@pytest.mark.parametrize("build", CASES)
+def test_vectorized_mismatch_matches_reference(build):
+    solution = perturbed(build())
+    delta_p, delta_q = solution.compute_power_mismatch_vector()
+    reference_p, reference_q = solution.compute_power_mismatch_vector_reference()
+    assert np.allclose(delta_p, reference_p, atol=1e-12)
+    assert np.allclose(delta_q, reference_q, atol=1e-12)
+
+
+@pytest.mark.parametrize("build", CASES)
+def test_sparse_jacobian_matches_reference(build):
+    solution = perturbed(build())
+    vpu, delta = solution.get_state()
+    jacobian = Jacobian(solution.buses, solution.ybus, delta, vpu)
+    dense_ybus = solution.ybus.toarray() if sparse.issparse(solution.ybus) else solution.ybus
+    reference = Jacobian(solution.buses, dense_ybus, delta, vpu).calc_jacobian_reference()
+    assert np.allclose(jacobian.calc_jacobian_sparse().toarray(), reference, atol=1e-10)
+
+
+@pytest.mark.parametrize("variant", ['XB', 'BX'])
+@pytest.mark.parametrize("build", CASES)
+def test_fast_decoupled_matches_newton_raphson(build, variant):
+    vpu, delta = solved_state(build(), 'calc_newton_raphson')
+    fd_vpu, fd_delta = solved_state(build(), 'calc_fast_decoupled', variant=variant)
+    assert np.allclose(fd_vpu, vpu, atol=1e-6)
+    assert np.allclose(fd_delta, delta, atol=1e-5)
+
+
+@pytest.mark.parametrize("build", CASES)
+def test_batch_matches_sequential_newton_raphson(build):
+    circuit = build()
+    batch = BatchPowerFlow.from_circuit(circuit, tol=1e-8)
+    network = batch.network
+    scales = np.random.default_rng(0).uniform(0.8, 1.2, (4, network.num_buses))
+    load = network.sbus.real < 0
+    p = np.where(load, network.sbus.real * scales, network.sbus.real)
+    q = np.where(load, network.sbus.imag * scales, network.sbus.imag)
+    result = batch.solve(p, q)
+    assert result.converged.all()
+
+    solution = initialized(circuit)
+    powerflow = PowerFlow(solution, 1e-8, 30, verbose=False)
+    for k, (p_row, q_row) in enumerate(zip(p, q)):
+        for bus, p_bus, q_bus in zip(solution.buses, p_row, q_row):
+            bus.vpu, bus.delta = 1.0, 0.0
+            bus.P_spec, bus.Q_spec = p_bus, q_bus
+        solution.voltages = [bus.vpu for bus in solution.buses]
+        assert powerflow.calc_newton_raphson()
+        vpu, delta = solution.get_state()
+        assert result.iterations[k] == powerflow.iterations
+        assert np.allclose(result.vpu[k], vpu, atol=1e-8)
+        assert np.allclose(result.delta[k], delta, atol=1e-6)
+
+
+def test_switched_line_zbus_matches_rebuilt_circuit():
+    circuit = build_seven_bus_circuit()
+    circuit.get_zbus('positive')
+    circuit.switch_transmission_line("Line 2", False)
+    rebuilt = build_seven_bus_circuit()
+    rebuilt.transmission_lines["Line 2"].in_service = False
+    assert np.allclose(circuit.get_zbus('positive'), rebuilt.get_zbus('positive'))
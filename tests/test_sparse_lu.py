@@ -0,0 +1,49 @@
+import contextlib
+import io
+
+import numpy as np
+from scipy import sparse
+
+from ordering import SparseLUSolver
+from powerflow import PowerFlow
+from sample_networks import build_seven_bus_circuit
+from solution import Solution
+
+
+def test_first_factorization_of_a_pattern_is_kept():
+    rng = np.random.default_rng(0)
+    matrix = (sparse.random(40, 40, density=0.1, random_state=0) + 10 * sparse.eye(40)).tocsc()
+    rhs = rng.standard_normal(40)
+    solver = SparseLUSolver()
+    solver.factor(matrix)
+    assert (solver.analyses, solver.factorizations) == (1, 1)
+    assert np.allclose(matrix @ solver.solve(rhs), rhs)
+
+    scaled = (matrix * 2.0).tocsc()
+    solver.factor(scaled)
+    assert (solver.analyses, solver.factorizations) == (1, 2)
+    assert np.allclose(scaled @ solver.solve(rhs), rhs)
+
+
+def test_island_solvers_are_reused_across_solves():
+    circuit = build_seven_bus_circuit()
+    circuit.switch_transmission_line("Line 4", False)
+    circuit.switch_transmission_line("Line 5", False)
+    solution = Solution(buses=[], ybus=None, voltages=[])
+    solution.initialize_system(circuit)
+    powerflow = PowerFlow(solution, 1e-6, 30)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert powerflow.calc_newton_raphson()
+        solvers = dict(powerflow.island_solvers)
+        factorizations = {number: solver.factorizations for number, solver in solvers.items()}
+
+        # Flat start again, so that the second solve refactorizes
+        for bus in solution.buses:
+            if bus.bus_type == "PQ Bus":
+                bus.vpu = 1.0
+            if bus.bus_type != "Slack Bus":
+                bus.delta = 0.0
+        assert powerflow.calc_newton_raphson()
+    assert powerflow.island_solvers == solvers
+    assert solvers[0].analyses == 1
+    assert solvers[0].factorizations > factorizations[0]
@@ -0,0 +1,52 @@
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from jacobian import JacobianReusePolicy
+from powerflow import PowerFlow
+from sample_networks import build_mesh_circuit
+from solution import Solution
+from step_control import StepControl, optimal_multiplier
+
+
+def solve(circuit, **options):
+    solution = Solution(buses=[], ybus=None, voltages=[])
+    solution.initialize_system(circuit)
+    powerflow = PowerFlow(solution, tol=1e-6, max_iter=30, **options)
+    with contextlib.redirect_stdout(io.StringIO()):
+        powerflow.calc_newton_raphson()
+    return powerflow
+
+
+def test_optimal_multiplier_minimizes_the_quadratic_mismatch():
+    rng = np.random.default_rng(0)
+    f0, f2 = rng.standard_normal(8), 3 * rng.standard_normal(8)
+    mu = optimal_multiplier(f0, f2)  # F(1) = F2 when F(μ) = (1 - μ) F0 + μ² F2
+    grid = np.linspace(0.01, 2, 2000)
+    norms = [np.linalg.norm((1 - m) * f0 + m ** 2 * f2) for m in grid]
+    assert abs(mu - grid[int(np.argmin(norms))]) < 2e-3
+
+
+def test_iwamoto_takes_full_steps_on_a_well_conditioned_case():
+    circuit = build_mesh_circuit(20, 20)
+    full = solve(circuit)
+    iwamoto = solve(circuit, step_control=StepControl('iwamoto'))
+    assert iwamoto.iterations == full.iterations
+    assert all(step == 1.0 for step in iwamoto.step_lengths)
+
+
+def test_iwamoto_rejects_a_reused_jacobian():
+    solution = Solution(buses=[], ybus=None, voltages=[])
+    solution.initialize_system(build_mesh_circuit(3, 3))
+    with pytest.raises(ValueError, match="Iwamoto"):
+        PowerFlow(solution, 1e-6, 30, reuse_policy=JacobianReusePolicy(refactor_every=3),
+                  step_control=StepControl('iwamoto'))
+
+
+def test_line_search_works_with_a_reused_jacobian():
+    powerflow = solve(build_mesh_circuit(10, 10), reuse_policy=JacobianReusePolicy(refactor_every=3),
+                      step_control=StepControl('line_search'))
+    assert powerflow.iterations is not None
+    assert powerflow.factorizations < powerflow.iterations
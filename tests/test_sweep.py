@@ -0,0 +1,26 @@
+import numpy as np
+
+from sample_networks import build_seven_bus_circuit
+from sweep import Scenario, SweepRunner, solve_scenario
+
+
+def test_invalid_scenarios_are_reported_without_losing_the_sweep():
+    scenarios = [Scenario("load x0.9", load_scale=0.9),
+                 Scenario("solar at slack", solar={"Bus 1": 50}),
+                 Scenario("unknown bus", solar={"Bus 99": 10}),
+                 Scenario("unknown line", outages=["Line 99"]),
+                 Scenario("G2 at 150 MW", generators={"G2": 150})]
+    result = SweepRunner(build_seven_bus_circuit, max_workers=2, chunksize=2).run(scenarios)
+
+    assert result.bus_names == list(build_seven_bus_circuit().buses)
+    assert result.failed == [1, 2, 3]
+    assert "slack bus" in result.errors[1]
+    assert "Bus 99" in result.errors[2]
+    assert "Line 99" in result.errors[3]
+    assert not result.converged[result.failed].any()
+
+    base = build_seven_bus_circuit()
+    for k in (0, 4):
+        vpu, delta, iterations, _ = solve_scenario(base, scenarios[k])
+        assert result.iterations[k] == iterations
+        assert np.allclose(result.vpu[k], vpu) and np.allclose(result.delta[k], delta)
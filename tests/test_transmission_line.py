@@ -0,0 +1,40 @@
+import numpy as np
+
+from bus import Bus
+from bundle import Bundle
+from conductor import Conductor
+from geometry import Geometry
+from transmissionline import TransmissionLine
+
+
+def partridge_line(length=10):
+    conductor = Conductor("Partridge", 0.642, 0.0217, 0.385, 460)
+    bundle = Bundle("Bundle A", 2, 1.5, conductor)
+    geometry = Geometry("Geometry 1", 0, 0, 19.5, 0, 39, 0)
+    return TransmissionLine("Line 1", Bus("Bus 1", 230, "PQ Bus"), Bus("Bus 2", 230, "PQ Bus"), bundle, geometry, length)
+
+
+def test_derived_values_are_cached():
+    line = partridge_line()
+    assert line.zseries == line.z1
+    assert line._derived_values() is line._derived_values()
+
+
+def test_setting_length_clears_cached_values():
+    line = partridge_line()
+    z1, yprim = line.z1_pu, line.yprim_positive
+    line.length = 20
+    assert np.isclose(line.z1_pu, 2 * z1)
+    assert np.allclose(line.yprim_positive, yprim / 2)
+    assert np.isclose(line.yshunt, 2 * partridge_line().yshunt)
+
+
+def test_setting_bundle_or_geometry_clears_cached_values():
+    line = partridge_line()
+    z1, y_shunt = line.z1, line.yshunt
+    line.geometry = Geometry("Geometry 2", 0, 0, 30, 0, 60, 0)
+    assert not np.isclose(line.z1, z1)
+    z1 = line.z1
+    line.bundle = Bundle("Bundle B", 3, 1.5, line.bundle.conductor)
+    assert not np.isclose(line.z1, z1)
+    assert not np.isclose(line.yshunt, y_shunt)
@@ -0,0 +1,52 @@
+import numpy as np
+
+from powerflow import PowerFlow
+from sample_networks import build_mesh_circuit
+from solution import Solution
+from state_library import SolvedStateLibrary
+
+
+def scaled_solution(circuit, scale):
+    solution = Solution(buses=[], ybus=None, voltages=[])
+    solution.initialize_system(circuit)
+    for bus in solution.buses:
+        if bus.P_spec < 0:
+            bus.P_spec *= scale
+        bus.Q_spec *= scale
+    return solution
+
+
+def test_saving_is_counted_only_against_the_same_injections():
+    circuit = build_mesh_circuit(10, 10)
+    library = SolvedStateLibrary()
+    flat = PowerFlow(scaled_solution(circuit, 1.0), 1e-6, 30, state_library=library, verbose=False)
+    flat.calc_newton_raphson()
+    assert flat.iterations_saved is None
+
+    # Same injections: the library state carries their flat-start count
+    same = PowerFlow(scaled_solution(circuit, 1.0), 1e-6, 30, state_library=library, verbose=False)
+    same.calc_newton_raphson()
+    assert same.iterations_saved == flat.iterations - same.iterations
+
+    # Other injections: a warm start, but no flat-start count to compare with
+    other = PowerFlow(scaled_solution(circuit, 1.1), 1e-6, 30, state_library=library, verbose=False)
+    other.calc_newton_raphson()
+    assert other.iterations is not None and other.iterations_saved is None
+    assert library.iterations_saved == same.iterations_saved
+
+
+def test_quiet_solve_prints_nothing(capsys):
+    circuit = build_mesh_circuit(5, 5)
+    powerflow = PowerFlow(scaled_solution(circuit, 1.0), 1e-6, 30, verbose=False)
+    assert powerflow.calc_newton_raphson()
+    assert powerflow.calc_newton_raphson(initial_state='previous')
+    assert capsys.readouterr().out == ""
+
+
+def test_previous_state_restarts_in_one_iteration():
+    powerflow = PowerFlow(scaled_solution(build_mesh_circuit(5, 5), 1.0), 1e-6, 30, verbose=False)
+    powerflow.calc_newton_raphson()
+    vpu, delta = powerflow.last_state
+    powerflow.calc_newton_raphson(initial_state='previous')
+    assert powerflow.iterations == 1
+    assert np.allclose(powerflow.last_state[0], vpu)
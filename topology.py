@@ -0,0 +1,157 @@
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+
+def find_islands(num_buses: int, from_idx, to_idx, in_service=None):
+    """
+    Label every bus with the electrical island it belongs to.
+
+    Buses are graph vertices and in-service branches are edges; islands are the connected
+    components of that graph, numbered in order of their lowest bus index.
+
+    :param num_buses: Number of buses N
+    :param from_idx: (B,) from-bus index of each branch
+    :param to_idx: (B,) to-bus index of each branch
+    :param in_service: (B,) branch switching status, all branches in service if None
+    :return: num_islands, labels (N,) island number of each bus
+    """
+    from_idx = np.asarray(from_idx, dtype=np.int64)
+    to_idx = np.asarray(to_idx, dtype=np.int64)
+    if in_service is not None:
+        in_service = np.asarray(in_service, dtype=bool)
+        from_idx, to_idx = from_idx[in_service], to_idx[in_service]
+
+    graph = sparse.coo_matrix((np.ones(len(from_idx)), (from_idx, to_idx)), shape=(num_buses, num_buses))
+    num_islands, labels = connected_components(graph, directed=False)
+    return num_islands, labels.astype(np.int64)
+
+
+class Island:
+    """
+    The Island class holds the buses of one electrical island and the bus that serves as its slack.
+    An island without a slack bus takes the PV bus with the largest generation as its slack;
+    an island with no generation at all is de-energized and is not solved.
+    """
+
+    def __init__(self, number: int, buses, bus_names, slack, slack_assigned: bool):
+        """
+        :param number: island number
+        :param buses: (n,) Ybus indices of the buses in the island, ascending
+        :param bus_names: names of those buses
+        :param slack: Ybus index of the island's slack bus, None if de-energized
+        :param slack_assigned: True if the slack was promoted from a PV bus
+        """
+        self.number = number
+        self.buses = buses
+        self.bus_names = bus_names
+        self.slack = slack
+        self.slack_assigned = slack_assigned
+        self.energized = slack is not None
+
+    def local_index(self, bus_idx: int):
+        # Position of a Ybus index inside the island's bus list
+        return int(np.searchsorted(self.buses, bus_idx))
+
+    def __str__(self):
+        if not self.energized:
+            return f"Island {self.number}: {len(self.buses)} buses, de-energized"
+        origin = " (assigned)" if self.slack_assigned else ""
+        return f"Island {self.number}: {len(self.buses)} buses, slack {self.bus_names[self.local_index(self.slack)]}{origin}"
+
+
+class Topology:
+    """
+    The Topology class is the result of processing a circuit's transformer and transmission line
+    connectivity: the island label of every bus and one Island per connected component.
+    """
+
+    def __init__(self, bus_names, bus_types, branch_from, branch_to, branch_in_service, gen_bus, gen_mw):
+        """
+        :param bus_names: bus names in Ybus order
+        :param bus_types: bus type strings in Ybus order
+        :param branch_from: (B,) from-bus index of each branch
+        :param branch_to: (B,) to-bus index of each branch
+        :param branch_in_service: (B,) branch switching status
+        :param gen_bus: (G,) bus index of each generator
+        :param gen_mw: (G,) generator MW setpoints, used to pick a slack for islands without one
+        """
+        self.bus_names = list(bus_names)
+        num_buses = len(self.bus_names)
+        self.num_islands, self.labels = find_islands(num_buses, branch_from, branch_to, branch_in_service)
+
+        bus_types = np.asarray(bus_types)
+        is_slack = bus_types == "Slack Bus"
+        generation = np.zeros(num_buses)
+        np.add.at(generation, np.asarray(gen_bus, dtype=np.int64), np.asarray(gen_mw, dtype=float))
+        has_generator = np.zeros(num_buses, dtype=bool)
+        has_generator[np.asarray(gen_bus, dtype=np.int64)] = True
+
+        # Buses grouped by island with one stable sort
+        order = np.argsort(self.labels, kind='stable')
+        bounds = np.searchsorted(self.labels[order], np.arange(self.num_islands + 1))
+
+        self.islands = []
+        for number in range(self.num_islands):
+            buses = order[bounds[number]:bounds[number + 1]]
+            slacks = buses[is_slack[buses]]
+            if len(slacks) > 1:
+                names = ", ".join(self.bus_names[i] for i in slacks)
+                raise ValueError(f"Island {number} has more than one slack bus ({names}).")
+
+            if len(slacks) == 1:
+                slack, assigned = int(slacks[0]), False
+            else:
+                candidates = buses[(bus_types[buses] == "PV Bus") & has_generator[buses]]
+                if len(candidates) > 0:
+                    slack, assigned = int(candidates[np.argmax(generation[candidates])]), True
+                else:
+                    slack, assigned = None, False
+            self.islands.append(Island(number, buses, [self.bus_names[i] for i in buses], slack, assigned))
+
+    @classmethod
+    def from_circuit(cls, circuit):
+        """
+        Process the transformer and transmission line dictionaries of a Circuit.
+        """
+        bus_indices = circuit.bus_indices
+        branches = list(circuit.transformer.values()) + list(circuit.transmission_lines.values())
+        generators = list(circuit.generators.values())
+        return cls(
+            bus_names=list(circuit.buses),
+            bus_types=[bus.bus_type for bus in circuit.buses.values()],
+            branch_from=[bus_indices[branch.bus1.name] for branch in branches],
+            branch_to=[bus_indices[branch.bus2.name] for branch in branches],
+            branch_in_service=[branch.in_service for branch in branches],
+            gen_bus=[bus_indices[gen.bus.name] for gen in generators],
+            gen_mw=[gen.mw_setpoint for gen in generators],
+        )
+
+    @property
+    def is_trivial(self):
+        # One island that already has its own slack bus: the whole network solves as before
+        return self.num_islands == 1 and self.islands[0].energized and not self.islands[0].slack_assigned
+
+    @property
+    def energized_buses(self):
+        # Ybus indices of every bus in an island that has a slack
+        buses = [island.buses for island in self.islands if island.energized]
+        return np.sort(np.concatenate(buses)) if buses else np.zeros(0, dtype=np.int64)
+
+    def island_of(self, bus_idx: int):
+        return self.islands[self.labels[bus_idx]]
+
+    def __str__(self):
+        return "\n".join(str(island) for island in self.islands)
+
+
+if __name__ == '__main__':
+    from sample_networks import build_seven_bus_circuit
+
+    circuit1 = build_seven_bus_circuit()
+    print(Topology.from_circuit(circuit1))
+
+    # Opening both lines into Bus 6 separates Bus 6 and Bus 7 (with G2) from the rest
+    circuit1.switch_transmission_line("Line 4", False)
+    circuit1.switch_transmission_line("Line 5", False)
+    print(Topology.from_circuit(circuit1))
@@ -7,6 +7,10 @@ class Transformer:
     including grounding and connection types for sequence network modeling.
     """
 
+    __slots__ = ('name', 'bus1', 'bus2', 'power_rating', 'impedance_percent', 'x_over_r_ratio', 'base_mva',
+                 'connection_type', 'zg1', 'zg1_given', 'zg2', 'in_service', 's_base', 'reactance', 'resistance',
+                 'zt', 'yt', '_yprim')
+
     def __init__(self, name: str, bus1: Bus, bus2: Bus, power_rating: float, impedance_percent: float,
                  x_over_r_ratio: float, base_mva: float, connection_type: str = "Y-Y",
                  zg1: float = None, zg2: float = None):
@@ -19,18 +23,17 @@ class Transformer:
         self.base_mva = base_mva
         self.connection_type = connection_type.upper()
         self.zg1 = zg1  # Grounding impedance on bus1 side (None = ungrounded, 0 = solid)
+        self.zg1_given = zg1  # zg1 as given, before the base conversion below; used by the zero sequence Yprim
         self.zg2 = zg2
+        self.in_service = True  # Switching status, out-of-service branches carry no admittance
 
         self.s_base = 100  # System base MVA
 
         self.calc_impedance()
         self.calc_admittance()
 
-        self.yprim_sequences = {
-            'positive': self.calc_yprim('positive'),
-            'negative': self.calc_yprim('negative'),
-            'zero': self.calc_yprim('zero'),
-        }
+        # Per-sequence Yprim, computed on first request
+        self._yprim = None
 
         if self.zg1 is not None:
             self.zg1 *= self.s_base / self.base_mva
@@ -60,12 +63,12 @@ class Transformer:
             side1, side2 = self.connection_type.split('-')
 
             if side1 == 'Y':
-                if self.zg1 is None:
+                if self.zg1_given is None:
                     y11 = 0
-                elif self.zg1 == 0:
+                elif self.zg1_given == 0:
                     y11 += complex(0, 1e6)  # solid ground = high admittance
                 else:
-                    y11 += 1 / (3 * 1 * self.zg1)
+                    y11 += 1 / (3 * 1 * self.zg1_given)
 
             if side2 == 'Y':
                 if self.zg2 is None:
@@ -93,7 +96,17 @@ class Transformer:
             raise ValueError(f"Unknown sequence type: {sequence}")
 
     def get_yprim(self, sequence='positive'):
-        return self.yprim_sequences.get(sequence, self.yprim_sequences[sequence])
+        # Returns the cached Yprim for the given sequence, computing it on first use
+        if self._yprim is None:
+            self._yprim = {}
+        if sequence not in self._yprim:
+            self._yprim[sequence] = self.calc_yprim(sequence)
+        return self._yprim[sequence]
+
+    @property
+    def yprim_sequences(self):
+        # Yprim for all three sequence networks
+        return {sequence: self.get_yprim(sequence) for sequence in ('positive', 'negative', 'zero')}
 
     def __str__(self):
         return (f"Transformer(name={self.name}, bus1={self.bus1}, bus2={self.bus2}, "
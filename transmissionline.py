@@ -2,13 +2,19 @@ import numpy as np
 from bus import Bus
 from bundle import Bundle
 from geometry import Geometry
+from line_constants import LINE_CONSTANT_CACHE
 
 class TransmissionLine:
     """
     The TransmissionLine class models a transmission line connecting two buses in a power system.
     This class uses the Conductor and Geometry subclasses to determine its electrical characteristics.
+    Only the defining parameters are stored; the ohmic quantities and the per-sequence Yprim matrices
+    are computed on first request and cached until the length, bundle, geometry or frequency is set.
     """
 
+    __slots__ = ('name', 'bus1', 'bus2', '_bundle', '_geometry', '_length', 'in_service', '_f', 'S_Base',
+                 '_derived', '_yprim')
+
     def __init__(self, name: str, bus1: Bus, bus2: Bus, bundle: Bundle, geometry: Geometry, length: float):
         """
         Initialize the TransmissionLine object with the given parameters.
@@ -21,38 +27,60 @@ class TransmissionLine:
         :param length: Length of the transmission line (in miles)
         """
 
+        # Derived quantities and per-sequence Yprim, computed on first request
+        self._derived = None
+        self._yprim = None
+
         self.name = name  # Name of the transmission line
         self.bus1 = bus1  # The first bus connected by the transmission line
         self.bus2 = bus2  # The second bus connected by the transmission line
         self.bundle = bundle  # The bundle of conductors used in the transmission line
         self.geometry = geometry  # The physical arrangement of conductors in the transmission line
         self.length = length  # Length of the transmission line in miles
+        self.in_service = True  # Switching status, out-of-service branches carry no admittance
         self.f = 60
         self.S_Base = 100
 
-        self.zbase = self.calc_base_values()
-        self.ybase = 1 / self.zbase  # Replace with actual calculation
-
-        self.zseries = None
-        self.zseries_pu = None
-        self.rseries = None
-        self.rseries_pu = None
-        self.xseries = None
-        self.xseries_pu = None
-        self.yseries = None
-        self.yseries_pu = None
-        self.yshunt = None
-        self.yshunt_pu = None
-        self.yprim_pu = None
-
-        self.calc_base_values()  # calculate base values
-        self.calc_admittances()  # calculate admittances
-        self.calc_yprim()  # calculate yprim
-
-        # Calculate sequence impedances and admittances
-        self.calc_sequence_impedances()
-        self.calc_sequence_admittances()
-        self.calc_all_yprim_sequences()
+    def _invalidate(self):
+        # Drop the cached quantities after a defining parameter changed
+        self._derived = None
+        self._yprim = None
+
+    @property
+    def length(self):
+        return self._length
+
+    @length.setter
+    def length(self, value):
+        self._length = value
+        self._invalidate()
+
+    @property
+    def bundle(self):
+        return self._bundle
+
+    @bundle.setter
+    def bundle(self, value):
+        self._bundle = value
+        self._invalidate()
+
+    @property
+    def geometry(self):
+        return self._geometry
+
+    @geometry.setter
+    def geometry(self, value):
+        self._geometry = value
+        self._invalidate()
+
+    @property
+    def f(self):
+        return self._f
+
+    @f.setter
+    def f(self, value):
+        self._f = value
+        self._invalidate()
 
     def calc_base_values(self):
         """
@@ -62,73 +90,152 @@ class TransmissionLine:
         # Base impedance calculation (zbase)
         return self.bus1.base_kv**2/self.S_Base  # Replace with actual calculation
 
+    @property
+    def zbase(self):
+        return self.calc_base_values()
+
+    @property
+    def ybase(self):
+        return 1 / self.zbase
+
     def calc_admittances(self):
         """
         Calculate series impedance, shunt admittance, and series admittance for the transmission line.
+
+        :return: zseries (ohm), yshunt (S), yseries (S)
         """
+        return self._derived_values()[:3]
+
+    def _derived_values(self):
+        """
+        Return zseries, yshunt, yseries, z1, z2 and z0, computed once from the per-mile constants.
+        """
+        if self._derived is None:
+            # Series impedance (zseries) and shunt admittance (yshunt) scaled from the cached per-mile constants
+            per_mile = self.per_mile_constants()
+            zseries = per_mile.z1 * self._length
+            yshunt = per_mile.y_shunt * self._length
+
+            # Calculate series admittance
+            yseries = 1 / zseries if zseries != 0 else complex(0, 0)
+
+            # Positive and negative sequence impedance (identical for transposed),
+            # zero-sequence impedance estimated as 2.5R + jX
+            self._derived = (zseries, yshunt, yseries, zseries, per_mile.z2 * self._length,
+                             per_mile.z0 * self._length)
+        return self._derived
 
-        # Placeholder for series reactance calculation (xseries)
-        self.xseries = (2 * np.pi * self.f) * (2 * 10 ** (-7)) * np.log(self.geometry.Deq / self.bundle.DSL) * 1609.32 * self.length # Replace with actual calculation
+    def per_mile_constants(self):
+        # Per-mile R, X, B and sequence impedances shared by every line with this conductor, bundle and geometry
+        return LINE_CONSTANT_CACHE.get(self.bundle, self.geometry, self.f)
 
-        #calculate per unit xseries
-        self.xseries_pu = self.xseries/self.zbase
+    @property
+    def zseries(self):
+        return self.calc_admittances()[0]
 
-        # Series resistance calculation (rseries)
-        self.rseries = self.bundle.conductor.resistance / self.bundle.num_conductors * self.length
+    @property
+    def zseries_pu(self):
+        return self.zseries / self.zbase
 
-        #calculate per unit rseries
-        self.rseries_pu = self.rseries/self.zbase
+    @property
+    def rseries(self):
+        return self.zseries.real
 
-        #Series impedance calculation (zseries)
-        self.zseries = complex(self.rseries, self.xseries)
+    @property
+    def rseries_pu(self):
+        return self.rseries / self.zbase
 
-        #Calculate per unit zseries
-        self.zseries_pu = self.zseries/self.zbase
+    @property
+    def xseries(self):
+        return self.zseries.imag
 
-        # Shunt admittance calculation (yshunt)
-        self.yshunt = (1j * 2 * np.pi * self.f) * ((2 * np.pi * 8.854 * 10 ** -12) / (np.log(self.geometry.Deq / self.bundle.DSC))) * 1609.34 * self.length
+    @property
+    def xseries_pu(self):
+        return self.xseries / self.zbase
 
-        # Calculate per unit yshunt
-        self.yshunt_pu = self.yshunt / self.ybase
+    @property
+    def yshunt(self):
+        return self.calc_admittances()[1]
 
-        # Calculate series admittance
-        self.yseries = 1 / self.zseries if self.zseries != 0 else complex(0, 0)
+    @property
+    def yshunt_pu(self):
+        return self.yshunt / self.ybase
 
-        # calculate per unit yshunt
-        self.yseries_pu = self.yseries / self.ybase
+    @property
+    def yseries(self):
+        return self.calc_admittances()[2]
+
+    @property
+    def yseries_pu(self):
+        return self.yseries / self.ybase
 
     def calc_yprim(self):
         """
-        Calculate and populate the admittance matrix (yprim) for the transmission line.
+        Calculate the admittance matrix (yprim) for the transmission line.
         """
+        zseries, yshunt, yseries = self.calc_admittances()
+        yseries_pu = yseries / self.ybase
+        yshunt_pu = yshunt / self.ybase
+
         # Admittance matrix calculation (yprim)
-        self.yprim_pu = np.array([[self.yseries_pu + (self.yshunt_pu/2), -self.yseries_pu],[-self.yseries_pu, self.yseries_pu + (self.yshunt_pu/2)]])
+        return np.array([[yseries_pu + (yshunt_pu/2), -yseries_pu],[-yseries_pu, yseries_pu + (yshunt_pu/2)]])
+
+    @property
+    def yprim_pu(self):
+        return self.calc_yprim()
 
     def calc_sequence_impedances(self):
-        """Calculate sequence impedances in p.u."""
-        # Series X from geometry (same for all sequences)
-        x_series = (2 * np.pi * self.f) * (2e-7) * np.log(self.geometry.Deq / self.bundle.DSL)
-        x_total = x_series * 1609.34 * self.length
+        """
+        Calculate sequence impedances.
 
-        # Series R from bundle
-        r_total = (self.bundle.conductor.resistance / self.bundle.num_conductors) * self.length
+        :return: z1, z2, z0 in ohms
+        """
+        return self._derived_values()[3:]
 
-        # Positive and negative sequence impedance (identical for transposed)
-        self.z1 = self.z2 = complex(r_total, x_total)
+    @property
+    def z1(self):
+        return self.calc_sequence_impedances()[0]
 
-        # Zero-sequence impedance (estimated as 2.5R + jX)
-        self.z0 = 2.5 * complex(r_total, x_total)
+    @property
+    def z2(self):
+        return self.calc_sequence_impedances()[1]
 
-        # Convert to per-unit
-        self.z1_pu = self.z1 / self.zbase
-        self.z2_pu = self.z2 / self.zbase
-        self.z0_pu = self.z0 / self.zbase
+    @property
+    def z0(self):
+        return self.calc_sequence_impedances()[2]
+
+    @property
+    def z1_pu(self):
+        return self.z1 / self.zbase
+
+    @property
+    def z2_pu(self):
+        return self.z2 / self.zbase
+
+    @property
+    def z0_pu(self):
+        return self.z0 / self.zbase
 
     def calc_sequence_admittances(self):
-        """Compute series admittance for each sequence (Y = 1/Z)."""
-        self.y1_pu = 1 / self.z1_pu if self.z1_pu != 0 else 0
-        self.y2_pu = 1 / self.z2_pu if self.z2_pu != 0 else 0
-        self.y0_pu = 1 / self.z0_pu if self.z0_pu != 0 else 0
+        """
+        Compute series admittance for each sequence (Y = 1/Z) in p.u.
+
+        :return: y1_pu, y2_pu, y0_pu
+        """
+        zbase = self.zbase
+        return tuple(1 / (z / zbase) if z != 0 else 0 for z in self.calc_sequence_impedances())
+
+    @property
+    def y1_pu(self):
+        return self.calc_sequence_admittances()[0]
+
+    @property
+    def y2_pu(self):
+        return self.calc_sequence_admittances()[1]
+
+    @property
+    def y0_pu(self):
+        return self.calc_sequence_admittances()[2]
 
     def calc_yprim_sequence(self, yseq):
         """Build a 2x2 Yprim matrix for a given sequence admittance."""
@@ -136,20 +243,32 @@ class TransmissionLine:
 
     def calc_all_yprim_sequences(self):
         """Generate Yprim matrices for all three sequence networks."""
-        self.yprim_positive = self.calc_yprim_sequence(self.y1_pu)
-        self.yprim_negative = self.calc_yprim_sequence(self.y2_pu)
-        self.yprim_zero = self.calc_yprim_sequence(self.y0_pu)
+        y1_pu, y2_pu, y0_pu = self.calc_sequence_admittances()
+        self._yprim = {
+            'positive': self.calc_yprim_sequence(y1_pu),
+            'negative': self.calc_yprim_sequence(y2_pu),
+            'zero': self.calc_yprim_sequence(y0_pu),
+        }
 
     def get_yprim(self, sequence: str = 'positive'):
-        """Return the Yprim matrix for the requested sequence."""
-        if sequence == 'positive':
-            return self.yprim_positive
-        elif sequence == 'negative':
-            return self.yprim_negative
-        elif sequence == 'zero':
-            return self.yprim_zero
-        else:
+        """Return the Yprim matrix for the requested sequence, computed on first request."""
+        if sequence not in ('positive', 'negative', 'zero'):
             raise ValueError("Unknown sequence. Choose from 'positive', 'negative', 'zero'.")
+        if self._yprim is None:
+            self.calc_all_yprim_sequences()
+        return self._yprim[sequence]
+
+    @property
+    def yprim_positive(self):
+        return self.get_yprim('positive')
+
+    @property
+    def yprim_negative(self):
+        return self.get_yprim('negative')
+
+    @property
+    def yprim_zero(self):
+        return self.get_yprim('zero')
 
     def __str__(self):
         """
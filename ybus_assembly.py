@@ -0,0 +1,173 @@
+import numpy as np
+from scipy import sparse
+
+# Sequence networks in the order they are stacked along the first axis
+SEQUENCES = ('positive', 'negative', 'zero')
+
+
+def series_reactance(y_series):
+    """
+    Series reactance x = Im(1/y) of branch series admittances, zero where the admittance is zero
+    (out-of-service or zero-impedance branches). DC power flow and fast-decoupled B' use it.
+    """
+    y_series = np.asarray(y_series, dtype=complex)
+    x = np.zeros(len(y_series))
+    nonzero = y_series != 0
+    x[nonzero] = (1 / y_series[nonzero]).imag
+    return x
+
+
+def assemble_sequence_ybus(num_buses: int, from_idx, to_idx, branch_yprim, shunt_idx=None, shunt_y=None):
+    """
+    Assemble sparse Ybus matrices for several sequence networks in a single vectorized pass.
+
+    All sequences share the same branch topology, so the COO triplets are built once with the
+    sequence networks stacked on top of each other (S*N x N) and converted to CSR in one call.
+    Duplicate entries (parallel branches, shared buses) are summed during the conversion.
+
+    :param num_buses: Number of buses N in the network
+    :param from_idx: (B,) integer array of from-bus indices
+    :param to_idx: (B,) integer array of to-bus indices
+    :param branch_yprim: (S, B, 2, 2) complex array of stacked branch Yprim matrices per sequence
+    :param shunt_idx: (G,) integer array of bus indices with a shunt admittance (e.g. generators)
+    :param shunt_y: (S, G) complex array of shunt admittances per sequence
+    :return: list of S scipy.sparse CSR matrices of shape (N, N)
+    """
+    from_idx = np.asarray(from_idx, dtype=np.int64)
+    to_idx = np.asarray(to_idx, dtype=np.int64)
+    branch_yprim = np.asarray(branch_yprim, dtype=complex)
+    num_seq = branch_yprim.shape[0]
+
+    # 2x2 Yprim entries scattered to (f,f), (f,t), (t,f), (t,t)
+    rows = np.concatenate((from_idx, from_idx, to_idx, to_idx))
+    cols = np.concatenate((from_idx, to_idx, from_idx, to_idx))
+    data = np.concatenate((branch_yprim[:, :, 0, 0], branch_yprim[:, :, 0, 1],
+                           branch_yprim[:, :, 1, 0], branch_yprim[:, :, 1, 1]), axis=1)
+
+    # Shunt admittances land on the diagonal
+    if shunt_idx is not None and len(shunt_idx) > 0:
+        shunt_idx = np.asarray(shunt_idx, dtype=np.int64)
+        rows = np.concatenate((rows, shunt_idx))
+        cols = np.concatenate((cols, shunt_idx))
+        data = np.concatenate((data, np.asarray(shunt_y, dtype=complex).reshape(num_seq, -1)), axis=1)
+
+    # Offset each sequence into its own block of rows and convert once
+    offsets = (np.arange(num_seq, dtype=np.int64) * num_buses)[:, None]
+    stacked = sparse.coo_matrix(
+        (data.ravel(), ((rows[None, :] + offsets).ravel(), np.tile(cols, num_seq))),
+        shape=(num_seq * num_buses, num_buses)
+    ).tocsr()
+
+    return [stacked[s * num_buses:(s + 1) * num_buses] for s in range(num_seq)]
+
+
+def check_ybus_diagonal(ybus, buses=None):
+    """
+    Raise if any bus has no self-admittance (works for dense and sparse Ybus).
+    Pass buses to restrict the check, e.g. to the buses of energized islands.
+    """
+    diagonal = ybus.diagonal()
+    if buses is not None:
+        diagonal = diagonal[buses]
+    if np.any(diagonal == 0):
+        raise ValueError("Singular Ybus detected. Ensure all buses have self-admittance.")
+
+
+def patch_ybus(ybus, rows, cols, values):
+    """
+    Add values to the given Ybus entries, in place where the sparsity pattern already holds them.
+
+    Dense arrays are always patched in place. A CSR matrix is patched in place when every entry is
+    already stored (explicit zeros count); otherwise a new matrix with the extended pattern is returned.
+
+    :param ybus: dense ndarray or scipy.sparse CSR matrix
+    :param rows: row indices of the entries to patch
+    :param cols: column indices of the entries to patch
+    :param values: complex values to add
+    :return: the patched Ybus (same object unless the sparsity pattern had to grow)
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    values = np.asarray(values, dtype=complex)
+
+    if not sparse.issparse(ybus):
+        np.add.at(ybus, (rows, cols), values)
+        return ybus
+
+    positions = []
+    for r, c in zip(rows, cols):
+        start, stop = ybus.indptr[r], ybus.indptr[r + 1]
+        hits = np.flatnonzero(ybus.indices[start:stop] == c)
+        if hits.size == 0:
+            # Pattern has to grow, fall back to a sparse sum
+            delta = sparse.coo_matrix((values, (rows, cols)), shape=ybus.shape)
+            return (ybus + delta).tocsr()
+        positions.append(start + hits[0])
+
+    np.add.at(ybus.data, np.array(positions), values)
+    return ybus
+
+
+def update_zbus(zbus, bus_idx, delta_yprim):
+    """
+    Apply a rank-2 branch change to Zbus with the Sherman-Morrison-Woodbury identity.
+
+    For Ynew = Y + A dY A^T with A selecting the two branch buses,
+    Znew = Z - Z A (I + dY A^T Z A)^-1 dY A^T Z.
+
+    :param zbus: dense Zbus matrix (inverse of Ybus)
+    :param bus_idx: (2,) bus indices of the branch terminals
+    :param delta_yprim: (2, 2) change of the branch Yprim
+    :return: updated Zbus, or None if the change makes Ybus singular (e.g. it islands the network)
+    """
+    bus_idx = np.asarray(bus_idx, dtype=np.int64)
+    z_cols = zbus[:, bus_idx]
+    small = np.eye(2) + delta_yprim @ z_cols[bus_idx, :]
+    if np.linalg.cond(small) > 1e12:
+        return None
+    correction = np.linalg.solve(small, delta_yprim @ zbus[bus_idx, :])
+    return zbus - z_cols @ correction
+
+
+
+class LowRankUpdatedLU:
+    """
+    Factorization of Y + A dY A^T expressed through an existing factorization of Y.
+
+    Solves use the Woodbury identity on top of the base factorization, so switching a branch keeps a
+    sparse LU usable without refactorizing. Updates can be chained; depth counts how many are stacked.
+    """
+
+    def __init__(self, base, bus_idx, delta_yprim):
+        """
+        :param base: object with solve(rhs) and shape, e.g. scipy SuperLU or another LowRankUpdatedLU
+        :param bus_idx: (2,) bus indices of the branch terminals
+        :param delta_yprim: (2, 2) change of the branch Yprim
+        """
+        self.base = base
+        self.shape = base.shape
+        self.depth = getattr(base, 'depth', 0) + 1
+        self.bus_idx = np.asarray(bus_idx, dtype=np.int64)
+        self.delta_yprim = np.asarray(delta_yprim, dtype=complex)
+
+        # Z A, the two Zbus columns of the branch terminals
+        selector = np.zeros((self.shape[0], 2), dtype=complex)
+        selector[self.bus_idx, [0, 1]] = 1
+        self.z_cols = base.solve(selector)
+        self.small = np.eye(2) + self.delta_yprim @ self.z_cols[self.bus_idx, :]
+        if np.linalg.cond(self.small) > 1e12:
+            raise np.linalg.LinAlgError("Branch change makes Ybus singular.")
+
+    def solve(self, rhs):
+        x = self.base.solve(rhs)
+        correction = np.linalg.solve(self.small, self.delta_yprim @ x[self.bus_idx])
+        return x - self.z_cols @ correction
+
+
+if __name__ == '__main__':
+    # Two buses joined by one branch with a shunt on bus 0
+    y = 1 / complex(0.01, 0.1)
+    yprim = np.array([[[[y, -y], [-y, y]]]] * 3)
+    ybus_list = assemble_sequence_ybus(2, [0], [1], yprim, shunt_idx=[0], shunt_y=[[-10j], [-10j], [-5j]])
+    for seq, ybus in zip(SEQUENCES, ybus_list):
+        print(f"{seq}:\n{ybus.toarray()}")